@@ -34,9 +34,18 @@ from .io import SqliteWriter, SqliteReader
 from .util import set_logging_level
 
 from .message import Message
+from .messagebatch import MessageBatch
+from .messagepool import MessagePool, PooledMessage
+from .filters import FilterMatcher
+from .metrics import MetricsRegistry
 from.exomessage import ExoMessage
-from .bus import BusABC, BusState
+from .exorouter import ExoRouter, ObjectSlot
+from .exotransaction import ExoTransactions, TransactionTimeout
+from .exoblock import ExoBlockTransfer, ExoBlockServer, BlockTransferError
+from .bus import BusABC, BusState, BatchSendError
 from .thread_safe_bus import ThreadSafeBus
+from .multibus import MultiBus
+from .shaping import TransmitShaper, TokenBucket, ShapingStats
 from .notifier import Notifier
 from .interfaces import VALID_INTERFACES
 from . import interface
@@ -2,7 +2,7 @@
 Contains the ABC bus implementation and its documentation.
 """
 
-from typing import cast, Any, Iterator, List, Optional, Sequence, Tuple, Union
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Union
 
 import can.typechecking
 
@@ -14,7 +14,10 @@ from time import time
 from enum import Enum, auto
 
 from can.broadcastmanager import ThreadBasedCyclicSendTask
+from can.filters import FilterMatcher
 from can.message import Message
+from can.messagepool import MessagePool
+from can.metrics import BusMetrics
 
 LOG = logging.getLogger(__name__)
 
@@ -27,6 +30,19 @@ class BusState(Enum):
     ERROR = auto()
 
 
+class BatchSendError(can.CanError):
+    """Raised by :meth:`can.BusABC.send_batch` if not all messages were sent.
+
+    :attr int sent:
+        the number of messages at the start of the batch that were sent
+        before the error occurred
+    """
+
+    def __init__(self, message: str, sent: int):
+        super().__init__(message)
+        self.sent = sent
+
+
 class BusABC(metaclass=ABCMeta):
     """The CAN Bus Abstract Base Class that serves as the basis
     for all concrete interfaces.
@@ -40,11 +56,26 @@ class BusABC(metaclass=ABCMeta):
     #: Log level for received messages
     RECV_LOGGING_LEVEL = 9
 
+    #: A :class:`~can.MessagePool` to take received messages from, if the
+    #: backend supports it. Assign a pool to opt in, the receiver then has to
+    #: :meth:`~can.Message.release` every message once it is done with it.
+    message_pool: Optional[MessagePool] = None
+
+    #: Leave the data of received messages as the immutable :class:`bytes` or
+    #: :class:`memoryview` the frame was decoded from instead of copying it,
+    #: if the backend supports it, see :meth:`can.Message.writable_data`
+    zero_copy: bool = False
+
+    #: The :class:`~can.metrics.BusMetrics` counting for this bus, set by
+    #: :meth:`can.MetricsRegistry.instrument`
+    metrics: Optional[BusMetrics] = None
+
     @abstractmethod
     def __init__(
         self,
         channel: Any,
         can_filters: Optional[can.typechecking.CanFilters] = None,
+        zero_copy: bool = False,
         **kwargs: object
     ):
         """Construct and open a CAN bus instance of the specified type.
@@ -58,10 +89,14 @@ class BusABC(metaclass=ABCMeta):
         :param can_filters:
             See :meth:`~can.BusABC.set_filters` for details.
 
+        :param zero_copy:
+            See :attr:`~can.BusABC.zero_copy`.
+
         :param dict kwargs:
             Any backend dependent configurations are passed in this dictionary
         """
         self._periodic_tasks: List[can.broadcastmanager.CyclicSendTaskABC] = []
+        self.zero_copy = zero_copy
         self.set_filters(can_filters)
 
     def __str__(self) -> str:
@@ -80,6 +115,7 @@ class BusABC(metaclass=ABCMeta):
         """
         start = time()
         time_left = timeout
+        metrics = self.metrics
 
         while True:
 
@@ -89,10 +125,18 @@ class BusABC(metaclass=ABCMeta):
             # return it, if it matches
             if msg and (already_filtered or self._matches_filters(msg)):
                 LOG.log(self.RECV_LOGGING_LEVEL, "Received: %s", msg)
+                if metrics is not None:
+                    metrics.add(BusMetrics.FRAMES_RECEIVED)
                 return msg
 
+            if msg:
+                # hand the filtered message back to its pool, if any
+                msg.release()
+                if metrics is not None:
+                    metrics.add(BusMetrics.FRAMES_FILTERED)
+
             # if not, and timeout is None, try indefinitely
-            elif timeout is None:
+            if timeout is None:
                 continue
 
             # try next one only if there still is time, and with
@@ -104,6 +148,8 @@ class BusABC(metaclass=ABCMeta):
                 if time_left > 0:
                     continue
                 else:
+                    if metrics is not None:
+                        metrics.add(BusMetrics.RECV_TIMEOUTS)
                     return None
 
     def _recv_internal(
@@ -150,6 +196,113 @@ class BusABC(metaclass=ABCMeta):
         """
         raise NotImplementedError("Trying to read from a write only bus?")
 
+    def recv_batch(
+        self, max_messages: int = 256, timeout: Optional[float] = None
+    ) -> List[Message]:
+        """Block waiting for messages from the Bus and return all that are
+        already waiting, up to `max_messages`.
+
+        Under load this is a lot cheaper per message than calling
+        :meth:`~can.BusABC.recv` repeatedly.
+
+        :param max_messages:
+            the largest number of messages to return
+        :param timeout:
+            seconds to wait for the first message or None to wait indefinitely
+
+        :return:
+            the messages in the order they were received, an empty list on
+            timeout
+        :raises can.CanError:
+            if an error occurred while reading
+        """
+        start = time()
+        time_left = timeout
+        metrics = self.metrics
+
+        while True:
+
+            msgs, already_filtered = self._recv_batch_internal(
+                max_messages, timeout=time_left
+            )
+
+            if msgs and not already_filtered and self._filter_matcher is not None:
+                received = len(msgs)
+                matches = self._filter_matcher.matches
+                matched = []
+                for msg in msgs:
+                    if matches(msg):
+                        matched.append(msg)
+                    else:
+                        msg.release()
+                msgs = matched
+                if metrics is not None:
+                    metrics.add(BusMetrics.FRAMES_FILTERED, received - len(msgs))
+
+            if msgs:
+                if LOG.isEnabledFor(self.RECV_LOGGING_LEVEL):
+                    for msg in msgs:
+                        LOG.log(self.RECV_LOGGING_LEVEL, "Received: %s", msg)
+                if metrics is not None:
+                    metrics.add(BusMetrics.FRAMES_RECEIVED, len(msgs))
+                return msgs
+
+            elif timeout is None:
+                continue
+
+            else:
+
+                time_left = timeout - (time() - start)
+
+                if time_left > 0:
+                    continue
+                else:
+                    if metrics is not None:
+                        metrics.add(BusMetrics.RECV_TIMEOUTS)
+                    return []
+
+    def _recv_batch_internal(
+        self, max_messages: int, timeout: Optional[float]
+    ) -> Tuple[List[Message], bool]:
+        """
+        Read up to `max_messages` messages that are available, waiting up to
+        `timeout` for the first one, and tell whether they were filtered.
+
+        Interfaces that can take several messages out of their driver or
+        buffer at once should override this method. The default calls
+        :meth:`~can.BusABC._recv_internal` (or a legacy
+        :meth:`~can.BusABC.recv`) until nothing is waiting anymore.
+
+        :return:
+            1.  the messages read, empty on timeout
+            2.  a bool that is True if message filtering has already
+                been done and else False
+        """
+        msgs: List[Message] = []
+        if type(self).recv is not BusABC.recv:
+            # legacy implementation, which filters on its own
+            msg = self.recv(timeout)
+            while msg is not None:
+                msgs.append(msg)
+                if len(msgs) >= max_messages:
+                    break
+                msg = self.recv(0)
+            return msgs, True
+
+        metrics = self.metrics
+        msg, already_filtered = self._recv_internal(timeout=timeout)
+        while msg is not None:
+            if already_filtered or self._matches_filters(msg):
+                msgs.append(msg)
+                if len(msgs) >= max_messages:
+                    break
+            else:
+                msg.release()
+                if metrics is not None:
+                    metrics.add(BusMetrics.FRAMES_FILTERED)
+            msg, already_filtered = self._recv_internal(timeout=0)
+        return msgs, True
+
     @abstractmethod
     def send(self, msg: Message, timeout: Optional[float] = None):
         """Transmit a message to the CAN bus.
@@ -170,6 +323,44 @@ class BusABC(metaclass=ABCMeta):
         """
         raise NotImplementedError("Trying to write to a readonly bus?")
 
+    def send_batch(
+        self, msgs: Sequence[Message], timeout: Optional[float] = None
+    ) -> None:
+        """Transmit several messages to the CAN bus, in order.
+
+        This is meant for replaying logs and bridging buses, where many
+        messages are due at the same time. Interfaces that can hand several
+        frames to their driver at once override it, the default calls
+        :meth:`~can.BusABC.send` for every message.
+
+        :param msgs: the messages to send
+        :param timeout:
+            seconds to wait for the whole batch to be sent or None to block
+            indefinitely, see :meth:`~can.BusABC.send`
+
+        :raises can.BatchSendError:
+            if not all messages could be sent, its ``sent`` attribute tells
+            how many of them were
+        """
+        if timeout is None:
+            deadline = None
+        else:
+            deadline = time() + timeout
+        sent = 0
+        try:
+            for msg in msgs:
+                if deadline is None:
+                    self.send(msg)
+                else:
+                    self.send(msg, max(deadline - time(), 0.0))
+                sent += 1
+        except can.CanError as error:
+            if isinstance(error, BatchSendError):
+                raise
+            raise BatchSendError(
+                "Sent {} of {} messages: {}".format(sent, len(msgs), error), sent
+            ) from error
+
     def send_periodic(
         self,
         msgs: Union[Sequence[Message], Message],
@@ -338,8 +529,14 @@ class BusABC(metaclass=ABCMeta):
             If ``extended`` is set as well, it only matches messages where
             ``<received_is_extended> == extended``. Else it matches every
             messages based only on the arbitration ID and mask.
+
+        The filters are compiled into a :class:`~can.FilterMatcher` once, so
+        software filtering costs about the same for any number of filters.
         """
         self._filters = filters or None
+        self._filter_matcher = (
+            FilterMatcher(self._filters) if self._filters is not None else None
+        )
         self._apply_filters(self._filters)
 
     def _apply_filters(self, filters: Optional[can.typechecking.CanFilters]):
@@ -364,28 +561,9 @@ class BusABC(metaclass=ABCMeta):
         """
 
         # if no filters are set, all messages are matched
-        if self._filters is None:
+        if self._filter_matcher is None:
             return True
-
-        for _filter in self._filters:
-            # check if this filter even applies to the message
-            if "extended" in _filter:
-                _filter = cast(can.typechecking.CanFilterExtended, _filter)
-                if _filter["extended"] != msg.is_extended_id:
-                    continue
-
-            # then check for the mask and id
-            can_id = _filter["can_id"]
-            can_mask = _filter["can_mask"]
-
-            # basically, we compute
-            # `msg.arbitration_id & can_mask == can_id & can_mask`
-            # by using the shorter, but equivalent from below:
-            if (can_id ^ msg.arbitration_id) & can_mask == 0:
-                return True
-
-        # nothing matched
-        return False
+        return self._filter_matcher.matches(msg)
 
     def flush_tx_buffer(self):
         """Discard every message that may be queued in the output buffer(s).
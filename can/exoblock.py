@@ -0,0 +1,383 @@
+"""
+This module contains windowed block transfers of large objects over ExoTerra
+buses.
+
+A download writes `size` bytes to the object ``(index, subindex)`` of a node.
+Requests go to the request cob-id (0x600 + node), answers come back on the
+response cob-id (0x580 + node). The payload is cut into segments of 7 bytes
+that are sent in blocks of up to `window` segments, and the node acknowledges
+every block with a bitmap of the segments it received, so only lost segments
+are sent again.
+
+Client to node::
+
+    initiate  0x3F  index (2)  subindex  size (4)
+    segment   ack request (bit 7), block parity (bit 6), sequence 1-48 (bits 0-5),
+              7 bytes of payload
+    end       0x7F  CRC16 of the whole payload (2)
+    abort     0xBF  index (2)  subindex  reason (4)
+
+Node to client::
+
+    initiate  0xA4  index (2)  subindex  window
+    ack       0xA2  block parity  bitmap of received segments (6, little endian)
+    end       0xA1  index (2)  subindex
+    abort     0x80  index (2)  subindex  reason (4)
+
+The last segment of every transmission has the ack request bit set. The
+block parity toggles with every block, which tells the node that the client
+got the acknowledgement of the previous block and moved on.
+"""
+
+import queue
+import struct
+import time
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from can import CanError
+from .bus import BusABC
+from .exomessage import ExoFrame
+from .interfaces import exocrc
+from .listener import Listener
+from .message import Message
+
+#: Payload bytes per segment
+SEGMENT_SIZE = 7
+#: Largest number of segments per block
+MAX_WINDOW = 48
+
+INITIATE = 0x3F
+END = 0x7F
+CLIENT_ABORT = 0xBF
+INITIATE_RESPONSE = 0xA4
+ACK = 0xA2
+END_RESPONSE = 0xA1
+ABORT = 0x80
+
+ACK_REQUEST = 0x80
+PARITY = 0x40
+SEQUENCE_MASK = 0x3F
+
+#: Abort reasons
+ABORT_TIMEOUT = 0x05040000
+ABORT_CRC = 0x05040004
+ABORT_PROTOCOL = 0x05040001
+
+_OBJECT = struct.Struct("<BHBI")
+_ACK = struct.Struct("<BB6s")
+_END = struct.Struct("<BH")
+
+Progress = Callable[[int, int, float], None]
+
+
+class BlockTransferError(CanError):
+    """The transfer was aborted or the node did not answer."""
+
+
+class ExoBlockTransfer(Listener):
+    """
+    Downloads large objects to one node in acknowledged blocks.
+
+    The instance has to receive the traffic of the bus, usually by adding it
+    to a :class:`can.Notifier`. Every block is handed to
+    :meth:`can.BusABC.send_batch` in a single call::
+
+        transfer = ExoBlockTransfer(bus, node_id=1, window=32)
+        notifier = can.Notifier(bus, [transfer])
+        transfer.download(0x1F50, 1, image, progress=print)
+
+    :attr int retransmits: segments sent again during the last download
+    """
+
+    def __init__(
+        self,
+        bus: BusABC,
+        node_id: int,
+        window: int = MAX_WINDOW,
+        timeout: float = 0.5,
+        retries: int = 5,
+    ):
+        """
+        :param bus: the bus to transfer on
+        :param node_id: the node to transfer to
+        :param window: the number of segments per block, at most 48, the
+                       node may ask for less
+        :param timeout: seconds to wait for every answer of the node
+        :param retries: how often a block is sent again without an answer
+        :raises ValueError: if the window is not between 1 and 48
+        """
+        if not 1 <= window <= MAX_WINDOW:
+            raise ValueError("window must be between 1 and {}".format(MAX_WINDOW))
+        self.bus = bus
+        self.request_id = 0x600 + node_id
+        self.response_id = 0x580 + node_id
+        self.window = window
+        self.timeout = timeout
+        self.retries = retries
+        self.retransmits = 0
+        self._responses: "queue.Queue[bytes]" = queue.Queue()
+        # answers are only queued while a download waits for them
+        self._active = False
+
+    def on_message_received(self, msg: Message):
+        if (
+            self._active
+            and msg.arbitration_id == self.response_id
+            and len(msg.data) == 8
+        ):
+            self._responses.put(bytes(msg.data))
+
+    def _send(self, data):
+        self.bus.send(
+            Message(arbitration_id=self.request_id, is_extended_id=False, data=data)
+        )
+
+    def _send_block(self, segments: List[bytes]):
+        msgs = [
+            Message(arbitration_id=self.request_id, is_extended_id=False, data=segment)
+            for segment in segments
+        ]
+        self.bus.send_batch(msgs)
+
+    def _abort(self, index: int, subindex: int, reason: int):
+        self._send(_OBJECT.pack(CLIENT_ABORT, index, subindex, reason))
+
+    def _wait(
+        self, command: int, index: int, subindex: int, accept=None
+    ) -> Optional[bytes]:
+        """
+        Wait for an answer with the given command.
+
+        :return: the answer or None on timeout
+        :raises BlockTransferError: if the node aborted the transfer
+        """
+        deadline = time.perf_counter() + self.timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            try:
+                data = self._responses.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if data[0] == ABORT:
+                _, _, _, reason = _OBJECT.unpack(data)
+                raise BlockTransferError(
+                    "node aborted the transfer of {:#06x}:{} with {:#010x}".format(
+                        index, subindex, reason
+                    )
+                )
+            if data[0] == command and (accept is None or accept(data)):
+                return data
+
+    def _request(self, data, command, index, subindex, accept=None) -> bytes:
+        for _ in range(self.retries + 1):
+            self._send(data)
+            answer = self._wait(command, index, subindex, accept)
+            if answer is not None:
+                return answer
+        self._abort(index, subindex, ABORT_TIMEOUT)
+        raise BlockTransferError(
+            "no answer from node {:#x} for {:#06x}:{}".format(
+                self.response_id - 0x580, index, subindex
+            )
+        )
+
+    def download(
+        self, index: int, subindex: int, data, progress: Optional[Progress] = None
+    ) -> float:
+        """
+        Write `data` to an object of the node.
+
+        :param index: the object dictionary index
+        :param subindex: the object dictionary subindex
+        :param data: the bytes to write
+        :param progress: called after every acknowledged block with the
+                         bytes transferred, the total bytes and the seconds
+                         since the start
+        :return: the duration of the transfer in seconds
+        :raises BlockTransferError: if the node aborted or stopped answering
+        """
+        data = bytes(data)
+        start = time.perf_counter()
+        self.retransmits = 0
+        # forget answers of an earlier transfer
+        while not self._responses.empty():
+            self._responses.get_nowait()
+
+        def same_object(answer):
+            return answer[1:4] == initiate[1:4]
+
+        self._active = True
+        try:
+            initiate = _OBJECT.pack(INITIATE, index, subindex, len(data))
+            answer = self._request(
+                initiate, INITIATE_RESPONSE, index, subindex, same_object
+            )
+            window = max(1, min(self.window, answer[4]))
+
+            segments = [
+                data[offset : offset + SEGMENT_SIZE].ljust(SEGMENT_SIZE, b"\x00")
+                for offset in range(0, len(data), SEGMENT_SIZE)
+            ]
+            parity = 0
+            for first in range(0, len(segments), window):
+                block = segments[first : first + window]
+                self._transfer_block(block, parity, index, subindex)
+                parity ^= PARITY
+                if progress is not None:
+                    done = min(len(data), (first + len(block)) * SEGMENT_SIZE)
+                    progress(done, len(data), time.perf_counter() - start)
+
+            end = _END.pack(END, exocrc.crc(data)).ljust(8, b"\x00")
+            self._request(end, END_RESPONSE, index, subindex, same_object)
+            return time.perf_counter() - start
+        finally:
+            self._active = False
+
+    def _transfer_block(
+        self, block: List[bytes], parity: int, index: int, subindex: int
+    ):
+        missing = list(range(len(block)))
+        attempts = 0
+        while missing:
+            frames = [bytes([parity | (i + 1)]) + block[i] for i in missing]
+            frames[-1] = bytes([frames[-1][0] | ACK_REQUEST]) + frames[-1][1:]
+            self._send_block(frames)
+            answer = self._wait(ACK, index, subindex, lambda a: a[1] == parity)
+            if answer is None:
+                attempts += 1
+                if attempts > self.retries:
+                    self._abort(index, subindex, ABORT_TIMEOUT)
+                    raise BlockTransferError(
+                        "block of {:#06x}:{} was not acknowledged".format(
+                            index, subindex
+                        )
+                    )
+                self.retransmits += len(missing)
+                continue
+            received = int.from_bytes(answer[2:8], "little")
+            missing = [i for i in range(len(block)) if not received >> i & 1]
+            self.retransmits += len(missing)
+
+
+class ExoBlockServer:
+    """
+    The node side of block downloads, e.g. for simulated devices.
+
+    :meth:`on_frame` takes every frame sent to the node and returns the
+    answers. :meth:`responder` does the same with
+    :class:`~can.exomessage.ExoFrame` objects, so it plugs into the responder of
+    :class:`~can.interfaces.exoserial.simulator.ExoSimulator`::
+
+        server = ExoBlockServer(node_id=1)
+        simulator = ExoSimulator(responder=server.responder)
+
+    :attr dict objects: completed downloads by ``(index, subindex)``
+    """
+
+    def __init__(self, node_id: int, window: int = MAX_WINDOW):
+        """
+        :param node_id: the node to answer for
+        :param window: the largest number of segments per block to accept
+        """
+        self.request_id = 0x600 + node_id
+        self.response_id = 0x580 + node_id
+        self.window = min(window, MAX_WINDOW)
+        self.objects: Dict[Tuple[int, int], bytes] = {}
+        self._object: Optional[Tuple[int, int]] = None
+        self._completed: Optional[Tuple[int, int]] = None
+
+    def _answer(self, data) -> List[Tuple[int, bytes]]:
+        return [(self.response_id, bytes(data).ljust(8, b"\x00"))]
+
+    def _abort(self, reason: int) -> List[Tuple[int, bytes]]:
+        index, subindex = self._object or (0, 0)
+        self._object = None
+        return self._answer(_OBJECT.pack(ABORT, index, subindex, reason))
+
+    def responder(self, frame: ExoFrame) -> List[ExoFrame]:
+        """
+        Process a frame sent to the node, as the responder of
+        :class:`~can.interfaces.exoserial.simulator.ExoSimulator`.
+
+        :return: the frames to answer with
+        """
+        if frame.rtr:
+            return []
+        return [
+            ExoFrame(cob_id, data)
+            for cob_id, data in self.on_frame(frame.cob_id, frame.data)
+        ]
+
+    def on_frame(self, cob_id: int, data: bytes) -> List[Tuple[int, bytes]]:
+        """
+        Process a frame sent to the node.
+
+        :return: ``(cob_id, data)`` tuples to answer with
+        """
+        if cob_id != self.request_id or len(data) != 8:
+            return []
+        command = data[0]
+        if command == INITIATE:
+            _, index, subindex, size = _OBJECT.unpack(data)
+            self._object = (index, subindex)
+            self._completed = None
+            self._buffer = bytearray(size)
+            self._segments = -(-size // SEGMENT_SIZE)
+            self._block_start = 0
+            self._block_length = 0
+            self._parity = 0
+            self._received = 0
+            return self._answer(
+                _OBJECT.pack(INITIATE_RESPONSE, index, subindex, self.window)
+            )
+        if command == CLIENT_ABORT:
+            self._object = None
+            return []
+        if self._object is None:
+            if command == END and self._completed is not None:
+                # the client missed the answer to its end request
+                return self._answer(_OBJECT.pack(END_RESPONSE, *self._completed, 0))
+            return []
+        if command == END:
+            _, crc = _END.unpack_from(data)
+            if self._block_start + self._block_length < self._segments or (
+                self._received != (1 << self._block_length) - 1
+            ):
+                return self._abort(ABORT_PROTOCOL)
+            if crc != exocrc.crc(self._buffer):
+                return self._abort(ABORT_CRC)
+            index, subindex = self._object
+            self.objects[self._object] = bytes(self._buffer)
+            self._completed = self._object
+            self._object = None
+            return self._answer(_OBJECT.pack(END_RESPONSE, index, subindex, 0))
+        return self._segment(command, data)
+
+    def _segment(self, command: int, data: bytes) -> List[Tuple[int, bytes]]:
+        parity = command & PARITY
+        sequence = command & SEQUENCE_MASK
+        if parity != self._parity:
+            # the client only moves on once the block is complete
+            self._block_start += self._block_length
+            self._block_length = 0
+            self._parity = parity
+            self._received = 0
+        if not 1 <= sequence <= self.window or (
+            self._block_start + sequence > self._segments
+        ):
+            return self._abort(ABORT_PROTOCOL)
+        offset = (self._block_start + sequence - 1) * SEGMENT_SIZE
+        length = min(SEGMENT_SIZE, len(self._buffer) - offset)
+        self._buffer[offset : offset + length] = data[1 : 1 + length]
+        self._received |= 1 << (sequence - 1)
+        if sequence > self._block_length:
+            self._block_length = sequence
+        if command & ACK_REQUEST:
+            return self._ack(parity, self._received)
+        return []
+
+    def _ack(self, parity: int, received: int) -> List[Tuple[int, bytes]]:
+        return self._answer(_ACK.pack(ACK, parity, received.to_bytes(6, "little")))
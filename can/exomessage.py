@@ -1,18 +1,329 @@
-from . import Message
+"""
+This module contains the codec of the 13 byte ExoTerra RS-485 frame format.
+
+Layout of a frame::
+
+    byte 0      5 bit start of frame (0b10101) and the top 3 bits of the cob-id
+    byte 1      low 8 bits of the cob-id
+    byte 2      rtr (bit 7), ide (bit 6), reserved (bits 4-5), data length (bits 0-3)
+    bytes 3-10  8 data bytes, for SDO traffic the command (3), index (4-5)
+                and subindex (6)
+    bytes 11-12 CRC16-IBM over bytes 0-10, little endian
+"""
+
+import struct
+import warnings
+
+from typing import Optional
+
+from . import typechecking
+from .message import Message
+from .messagepool import MessagePool
+from .interfaces import exocrc
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#: Length of one frame on the wire
+FRAME_LENGTH = exocrc.FRAME_LENGTH
+
+SOF = 0xA8
+SOF_MASK = 0xF8
+
+# header, cob-id, control byte and the data; the CRC follows little endian
+_HEADER = struct.Struct("<BBB8s")
+_FRAME = struct.Struct("<BBB8sH")
+_CRC = struct.Struct("<H")
+
+
+class ExoFrame:
+    """
+    A single ExoTerra frame.
+
+    Frames can be encoded into and decoded from any buffer at a given offset
+    without intermediate copies of the whole buffer.
+    """
+
+    __slots__ = ("cob_id", "rtr", "ide", "dlc", "data")
+
+    def __init__(
+        self,
+        cob_id: int = 0,
+        data: bytes = b"",
+        rtr: bool = False,
+        ide: bool = False,
+        dlc: int = 8,
+    ):
+        """
+        :param cob_id: the 11 bit cob-id
+        :param data: up to 8 data bytes, shorter data is zero padded on the wire
+        :param rtr: remote transmission request bit
+        :param ide: identifier extension bit
+        :param dlc: value of the data length field
+        """
+        self.cob_id = cob_id
+        self.data = bytes(data)
+        self.rtr = rtr
+        self.ide = ide
+        self.dlc = dlc
+
+    def __repr__(self) -> str:
+        return "ExoFrame(cob_id={:#x}, data={!r}, rtr={}, ide={}, dlc={})".format(
+            self.cob_id, self.data, self.rtr, self.ide, self.dlc
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ExoFrame):
+            return NotImplemented
+        return (
+            self.cob_id == other.cob_id
+            and self.data == other.data
+            and self.rtr == other.rtr
+            and self.ide == other.ide
+            and self.dlc == other.dlc
+        )
+
+    @property
+    def index(self) -> int:
+        """The object dictionary index carried in data bytes 1 and 2."""
+        return self.data[1] | self.data[2] << 8
+
+    @property
+    def subindex(self) -> int:
+        """The object dictionary subindex carried in data byte 3."""
+        return self.data[3]
+
+    def encode_into(self, buf, offset: int = 0) -> int:
+        """
+        Write the frame including its CRC into `buf`.
+
+        :param buf: a writable buffer with room for 13 bytes at `offset`
+        :param offset: position of the first byte of the frame
+        :return: the number of bytes written
+        """
+        return encode_into(
+            buf, offset, self.cob_id, self.data, self.rtr, self.ide, self.dlc
+        )
+
+    def encode(self) -> bytearray:
+        """
+        :return: the 13 bytes of the frame
+        """
+        buf = bytearray(FRAME_LENGTH)
+        self.encode_into(buf)
+        return buf
+
+    @classmethod
+    def decode_from(cls, buf, offset: int = 0, verify: bool = False) -> "ExoFrame":
+        """
+        Read the frame starting at `offset`.
+
+        :param buf: a bytes-like object, e.g. a memoryview of a receive buffer
+        :param offset: position of the first byte of the frame
+        :param verify: also check the start of frame pattern and the CRC
+        :raises ValueError: if `verify` is set and the frame is invalid
+        """
+        byte0, byte1, control, data, _ = _FRAME.unpack_from(buf, offset)
+        if verify and (byte0 & SOF_MASK != SOF or not exocrc.verify(buf, offset)):
+            raise ValueError("invalid frame at offset {}".format(offset))
+        return cls(
+            (byte0 & 0x7) << 8 | byte1,
+            data,
+            bool(control & 0x80),
+            bool(control & 0x40),
+            control & 0xF,
+        )
+
+    def to_message(
+        self, timestamp: float = 0.0, channel: Optional[typechecking.Channel] = None
+    ) -> Message:
+        """
+        :return: a :class:`can.Message` with the cob-id as arbitration id
+        """
+        data = b"" if self.rtr else self.data
+        return Message._from_fields(
+            timestamp, self.cob_id, self.ide, self.rtr, False, channel, len(data), data
+        )
+
+    @classmethod
+    def from_message(cls, msg: Message, dlc: int = 8) -> "ExoFrame":
+        """
+        :param msg: the message to convert, data beyond 8 bytes is ignored
+        :param dlc: value of the data length field, at most 8
+        """
+        return cls(
+            msg.arbitration_id,
+            bytes(msg.data[:8]),
+            msg.is_remote_frame,
+            msg.is_extended_id,
+            min(dlc, 8),
+        )
+
+
+def encode_into(buf, offset, cob_id, data, rtr=False, ide=False, dlc=8) -> int:
+    """
+    Encode a frame from its fields into `buf` at `offset`.
+
+    This is the allocation free path used by the buses, see
+    :meth:`ExoFrame.encode_into`.
+
+    :return: the number of bytes written
+    """
+    _HEADER.pack_into(
+        buf,
+        offset,
+        SOF | (cob_id & 0x700) >> 8,
+        cob_id & 0xFF,
+        (rtr & 0x1) << 7 | (ide & 0x1) << 6 | (dlc & 0xF),
+        data if isinstance(data, (bytes, bytearray)) else bytes(data),
+    )
+    # copying 11 bytes is cheaper than creating a memoryview
+    crc = exocrc.crc(buf[offset : offset + exocrc.PAYLOAD_LENGTH])
+    _CRC.pack_into(buf, offset + exocrc.PAYLOAD_LENGTH, crc)
+    return FRAME_LENGTH
+
+
+def encode_message_into(buf, offset: int, msg: Message, dlc: int = 8) -> int:
+    """
+    Encode a :class:`can.Message` into `buf` at `offset`.
+
+    :param dlc: value of the data length field, at most 8
+    :return: the number of bytes written
+    """
+    return encode_into(
+        buf,
+        offset,
+        msg.arbitration_id,
+        msg.data,
+        msg.is_remote_frame,
+        msg.is_extended_id,
+        min(dlc, 8),
+    )
+
+
+def decode_message(
+    buf,
+    offset: int = 0,
+    timestamp: float = 0.0,
+    channel: Optional[typechecking.Channel] = None,
+    pool: Optional[MessagePool] = None,
+    zero_copy: bool = False,
+) -> Message:
+    """
+    Decode the frame at `offset` straight into a :class:`can.Message`.
+
+    The CRC is not checked, frames are expected to be validated on reception.
+
+    :param pool: a pool to take the message from instead of creating one
+    :param zero_copy: keep the data as the :class:`bytes` it was unpacked to
+    """
+    byte0, byte1, control, data, _ = _FRAME.unpack_from(buf, offset)
+    from_fields = Message._from_fields if pool is None else pool.acquire
+    if control & 0x80:
+        # remote frames carry no data
+        return from_fields(
+            timestamp,
+            (byte0 & 0x7) << 8 | byte1,
+            bool(control & 0x40),
+            True,
+            False,
+            channel,
+            0,
+            b"",
+        )
+    return from_fields(
+        timestamp,
+        (byte0 & 0x7) << 8 | byte1,
+        bool(control & 0x40),
+        False,
+        False,
+        channel,
+        8,
+        data,
+        zero_copy=zero_copy,
+    )
+
+
+def describe(buf, offset: int = 0) -> str:
+    """
+    Format the frame at `offset` for raw traffic logs.
+
+    :return: the cob-id, data length and data, or an empty string if the
+             start of frame pattern does not match
+    """
+    byte0, byte1, control, data, _ = _FRAME.unpack_from(buf, offset)
+    if byte0 & SOF_MASK != SOF:
+        return ""
+    return " id:{}: dl:{}: d:{}".format(
+        hex((byte0 & 0x7) << 8 | byte1), control & 0xF, data.hex()
+    )
+
+
+def decode_array(buf) -> dict:
+    """
+    Decode many back to back frames at once with NumPy.
+
+    :param buf: a bytes-like object whose length is a multiple of 13
+    :return: a dict of arrays with one entry per frame: ``cob_id``, ``rtr``,
+             ``ide``, ``dlc``, ``data`` (shape ``(n, 8)``), ``index``,
+             ``subindex`` and ``crc``
+    :raises ImportError: if NumPy is not installed
+    :raises ValueError: if the buffer does not contain whole frames only
+    """
+    if numpy is None:
+        raise ImportError("decode_array() requires NumPy")
+    if len(buf) % FRAME_LENGTH:
+        raise ValueError(
+            "buffer length {} is not a multiple of {}".format(len(buf), FRAME_LENGTH)
+        )
+    frames = numpy.frombuffer(buf, dtype=numpy.uint8).reshape(-1, FRAME_LENGTH)
+    byte0 = frames[:, 0].astype(numpy.uint16)
+    control = frames[:, 2]
+    data = frames[:, 3:11]
+    crc = frames[:, 11].astype(numpy.uint16) | frames[:, 12].astype(numpy.uint16) << 8
+    return {
+        "cob_id": (byte0 & 0x7) << 8 | frames[:, 1],
+        "rtr": (control & 0x80) != 0,
+        "ide": (control & 0x40) != 0,
+        "dlc": control & 0xF,
+        "data": data,
+        "index": data[:, 1].astype(numpy.uint16) | data[:, 2].astype(numpy.uint16) << 8,
+        "subindex": data[:, 3],
+        "crc": crc,
+    }
+
 
 class ExoMessage(Message):
-    def __init__(self,
-                 node_cob_id,
-                 data,
-                 remote_transmission_request=0,
-                 identifier_extension_bit=0,
-                ):
-
-        self.start_of_frame = (0xa8) #b10101
-        self.node_cob_id:int = node_cob_id #default should be cob-id
-        self.remote_transmission_request = remote_transmission_request #1bit
-        self.identifier_extension_bit = identifier_extension_bit #1bit
-        self.reserved_bits = 0 #2bits
-        self.data_length = 8 #4bits
-        self.data:float = data #8bytes of data
-        self.crc:int = 0 #2bytes
\ No newline at end of file
+    """
+    A :class:`can.Message` built from ExoTerra frame fields.
+
+    Deprecated, use :class:`ExoFrame` and :meth:`ExoFrame.to_message` instead.
+    """
+
+    def __init__(
+        self,
+        node_cob_id,
+        data,
+        remote_transmission_request=0,
+        identifier_extension_bit=0,
+    ):
+        warnings.warn(
+            "ExoMessage is deprecated, use ExoFrame instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        super().__init__(
+            arbitration_id=node_cob_id,
+            data=data,
+            is_remote_frame=bool(remote_transmission_request),
+            is_extended_id=bool(identifier_extension_bit),
+        )
+        self.start_of_frame = 0xA8  # b10101
+        self.node_cob_id: int = node_cob_id  # default should be cob-id
+        self.remote_transmission_request = remote_transmission_request  # 1bit
+        self.identifier_extension_bit = identifier_extension_bit  # 1bit
+        self.reserved_bits = 0  # 2bits
+        self.data_length = 8  # 4bits
+        self.crc: int = 0  # 2bytes
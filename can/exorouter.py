@@ -0,0 +1,154 @@
+"""
+This module contains a listener that routes ExoTerra traffic by object.
+
+SDO style frames carry the object dictionary index in data bytes 1 and 2
+(little endian) and the subindex in data byte 3, see :mod:`can.exomessage`.
+The router looks the ``(cob_id, index, subindex)`` of every message up in a
+dict, so dispatching costs the same no matter how many objects are
+subscribed.
+"""
+
+import threading
+
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from .listener import Listener
+from .message import Message
+
+Handler = Callable[[Message], None]
+
+
+class ObjectSlot:
+    """
+    Keeps the last message received for one object.
+
+    :attr message: the last message or None
+    :attr int count: the number of messages received
+    """
+
+    __slots__ = ("message", "count")
+
+    def __init__(self):
+        self.message: Optional[Message] = None
+        self.count = 0
+
+    def __call__(self, msg: Message):
+        self.message = msg
+        self.count += 1
+
+    @property
+    def data(self) -> Optional[bytearray]:
+        """The data of the last message or None."""
+        return None if self.message is None else self.message.data
+
+    @property
+    def timestamp(self) -> Optional[float]:
+        """The timestamp of the last message or None."""
+        return None if self.message is None else self.message.timestamp
+
+
+class ExoRouter(Listener):
+    """
+    Dispatches received messages to the handlers of their object.
+
+    Handlers are registered for a ``(cob_id, index, subindex)`` triple or for
+    all messages of a cob-id, which suits traffic without an index like PDOs.
+    Every message is passed to the handlers of its triple first and then to
+    those of its cob-id. Messages nobody subscribed to go to `default`.
+
+    Subscribing is thread safe and may happen while messages are dispatched::
+
+        router = ExoRouter()
+        router.subscribe(0x581, 0x6041, 0, on_statusword)
+        position = router.track(0x581, 0x6064, 0)
+        notifier = can.Notifier(bus, [router])
+        ...
+        print(position.data)
+
+    :attr int unmatched: the number of messages without any handler
+    """
+
+    def __init__(self, default: Optional[Handler] = None):
+        """
+        :param default: called with every message that has no handler
+        """
+        self.default = default
+        self.unmatched = 0
+        self._objects: Dict[Tuple[int, int, int], Tuple[Handler, ...]] = {}
+        self._cob_ids: Dict[int, Tuple[Handler, ...]] = {}
+        self._lock = threading.Lock()
+
+    def _routes(self, index: Optional[int]) -> Dict[Hashable, Tuple[Handler, ...]]:
+        return self._cob_ids if index is None else self._objects
+
+    @staticmethod
+    def _key(cob_id: int, index: Optional[int], subindex: int) -> Hashable:
+        return cob_id if index is None else (cob_id, index, subindex)
+
+    def subscribe(
+        self, cob_id: int, index: Optional[int], subindex: int, handler: Handler
+    ) -> Handler:
+        """
+        Register a handler for an object.
+
+        :param cob_id: the cob-id the object is received with
+        :param index: the object dictionary index, or None for all messages
+                      of the cob-id
+        :param subindex: the object dictionary subindex, ignored if `index`
+                         is None
+        :param handler: called with every matching message
+        :return: the handler
+        """
+        routes = self._routes(index)
+        key = self._key(cob_id, index, subindex)
+        with self._lock:
+            # handler tuples are replaced, never changed, so dispatching
+            # needs no lock
+            routes[key] = routes.get(key, ()) + (handler,)
+        return handler
+
+    def unsubscribe(
+        self, cob_id: int, index: Optional[int], subindex: int, handler: Handler
+    ):
+        """
+        Remove a handler registered with :meth:`subscribe`.
+
+        :raises ValueError: if the handler is not registered for the object
+        """
+        routes = self._routes(index)
+        key = self._key(cob_id, index, subindex)
+        with self._lock:
+            handlers = list(routes.get(key, ()))
+            handlers.remove(handler)
+            if handlers:
+                routes[key] = tuple(handlers)
+            else:
+                del routes[key]
+
+    def track(self, cob_id: int, index: Optional[int], subindex: int = 0) -> ObjectSlot:
+        """
+        Keep the last value of an object.
+
+        :return: an :class:`ObjectSlot` that is updated with every message
+        """
+        return self.subscribe(cob_id, index, subindex, ObjectSlot())
+
+    def on_message_received(self, msg: Message):
+        data = msg.data
+        cob_id = msg.arbitration_id
+        handled = False
+        if len(data) >= 4:
+            handlers = self._objects.get((cob_id, data[1] | data[2] << 8, data[3]))
+            if handlers is not None:
+                handled = True
+                for handler in handlers:
+                    handler(msg)
+        handlers = self._cob_ids.get(cob_id)
+        if handlers is not None:
+            handled = True
+            for handler in handlers:
+                handler(msg)
+        if not handled:
+            self.unmatched += 1
+            if self.default is not None:
+                self.default(msg)
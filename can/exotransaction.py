@@ -0,0 +1,233 @@
+"""
+This module contains pipelined request/response transactions for ExoTerra
+buses.
+
+A request is answered by a frame with the same index and subindex (data
+bytes 1 to 3, see :mod:`can.exomessage`) on the response cob-id, which is
+the request cob-id minus 0x80 by default (0x601 -> 0x581). Up to
+`max_outstanding` requests are on the wire at once, so bulk transfers are
+limited by the bandwidth of the bus instead of the round trip time::
+
+    transactions = ExoTransactions(bus, max_outstanding=16)
+    notifier = can.Notifier(bus, [transactions])
+    futures = [transactions.request(msg) for msg in requests]
+    responses = [future.result() for future in futures]
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from can import CanError
+from .bus import BusABC
+from .listener import Listener
+from .message import Message
+
+Key = Tuple[int, int, int]
+
+
+class TransactionTimeout(CanError):
+    """No response arrived before the deadline of a request."""
+
+
+class ExoTransactions(Listener):
+    """
+    Correlates requests with their responses.
+
+    The instance has to receive the traffic of the bus, usually by adding it
+    to a :class:`can.Notifier`. Only one request per object can be
+    outstanding, a second request for the same object waits for the first.
+
+    :attr int timeouts: the number of requests that timed out
+    """
+
+    def __init__(
+        self,
+        bus: BusABC,
+        max_outstanding: int = 8,
+        timeout: float = 1.0,
+        response_offset: int = -0x80,
+    ):
+        """
+        :param bus: the bus requests are sent on
+        :param max_outstanding: the number of requests awaiting a response at once
+        :param timeout: default seconds to wait for a response
+        :param response_offset: added to the request cob-id to get the
+                                response cob-id
+        :raises ValueError: if `max_outstanding` is less than 1
+        """
+        if max_outstanding < 1:
+            raise ValueError("max_outstanding must be at least 1")
+        self.bus = bus
+        self.max_outstanding = max_outstanding
+        self.timeout = timeout
+        self.response_offset = response_offset
+        self.timeouts = 0
+
+        self._pending: Dict[Key, Future] = {}
+        self._deadlines: List[Tuple[float, int, Key, Future]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._running = True
+        self._reaper = threading.Thread(
+            target=self._expire, name="can.exotransactions", daemon=True
+        )
+        self._reaper.start()
+
+    def _key(self, msg: Message) -> Key:
+        data = msg.data
+        return (
+            msg.arbitration_id + self.response_offset,
+            data[1] | data[2] << 8,
+            data[3],
+        )
+
+    def _has_room(self, key: Key) -> bool:
+        return len(self._pending) < self.max_outstanding and key not in self._pending
+
+    def request(
+        self, msg: Message, timeout: Optional[float] = None, block: bool = True
+    ) -> Optional[Future]:
+        """
+        Send a request without waiting for the response.
+
+        :param msg: the request, with index and subindex in data bytes 1 to 3
+        :param timeout: seconds to wait for the response, defaults to the
+                        timeout of the instance
+        :param block: wait for room in the pending table, else return None
+                      if it is full
+        :return: a :class:`concurrent.futures.Future` that resolves to the
+                 response message or fails with :class:`TransactionTimeout`
+        :raises can.CanError: if the transactions were stopped
+        """
+        key = self._key(msg)
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        with self._changed:
+            if not self._has_room(key):
+                if not block:
+                    return None
+                self._changed.wait_for(lambda: self._has_room(key) or not self._running)
+            if not self._running:
+                raise CanError("transactions were stopped")
+            self._pending[key] = future
+            deadline = time.perf_counter() + (
+                self.timeout if timeout is None else timeout
+            )
+            heapq.heappush(
+                self._deadlines, (deadline, next(self._sequence), key, future)
+            )
+            self._changed.notify_all()
+        try:
+            self.bus.send(msg)
+        except Exception as error:
+            self._complete(key, future, exception=error)
+        return future
+
+    async def request_async(
+        self, msg: Message, timeout: Optional[float] = None
+    ) -> Message:
+        """
+        Send a request and await the response.
+
+        Waiting for room in the pending table happens in the default executor
+        of the loop, so the loop is never blocked.
+
+        :return: the response message
+        :raises TransactionTimeout: if no response arrived in time
+        """
+        loop = asyncio.get_event_loop()
+        future = self.request(msg, timeout, block=False)
+        if future is None:
+            future = await loop.run_in_executor(None, self.request, msg, timeout)
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def request_many(self, msgs, timeout: Optional[float] = None) -> List[Message]:
+        """
+        Pipeline many requests and wait for all responses.
+
+        :return: the responses in the order of the requests
+        :raises TransactionTimeout: if any response did not arrive in time
+        """
+        futures = [self.request(msg, timeout) for msg in msgs]
+        return [future.result() for future in futures]
+
+    def _complete(self, key: Key, future: Future, result=None, exception=None) -> bool:
+        with self._changed:
+            if self._pending.get(key) is not future:
+                return False
+            del self._pending[key]
+            self._changed.notify_all()
+        if exception is None:
+            future.set_result(result)
+        else:
+            future.set_exception(exception)
+        return True
+
+    def on_message_received(self, msg: Message):
+        data = msg.data
+        if len(data) < 4:
+            return
+        key = (msg.arbitration_id, data[1] | data[2] << 8, data[3])
+        future = self._pending.get(key)
+        if future is not None:
+            self._complete(key, future, result=msg)
+
+    def _expire(self):
+        deadlines = self._deadlines
+        while True:
+            expired = []
+            with self._changed:
+                if not self._running:
+                    return
+                now = time.perf_counter()
+                while deadlines:
+                    deadline, _, key, future = deadlines[0]
+                    if self._pending.get(key) is not future:
+                        # answered in the meantime
+                        heapq.heappop(deadlines)
+                    elif deadline <= now:
+                        heapq.heappop(deadlines)
+                        del self._pending[key]
+                        expired.append((key, future))
+                    else:
+                        break
+                if expired:
+                    self.timeouts += len(expired)
+                    self._changed.notify_all()
+                elif deadlines:
+                    self._changed.wait(deadlines[0][0] - now)
+                else:
+                    self._changed.wait()
+            # resolve outside of the lock, callbacks may send new requests
+            for key, future in expired:
+                future.set_exception(
+                    TransactionTimeout(
+                        "no response from {:#x} for {:#06x}:{}".format(*key)
+                    )
+                )
+
+    @property
+    def outstanding(self) -> int:
+        """The number of requests awaiting a response."""
+        return len(self._pending)
+
+    def stop(self):
+        """
+        Fail all outstanding requests and stop the deadline thread.
+        """
+        with self._changed:
+            self._running = False
+            pending = list(self._pending.values())
+            self._pending.clear()
+            self._deadlines.clear()
+            self._changed.notify_all()
+        for future in pending:
+            future.set_exception(CanError("transactions were stopped"))
+        self._reaper.join(1.0)
@@ -0,0 +1,144 @@
+"""
+This module contains :class:`can.FilterMatcher`, which compiles a list of
+filters as described in :meth:`can.BusABC.set_filters` into lookup tables.
+
+Filters with a full mask become a set of exact identifiers, the other ones
+are grouped by mask into one set of masked identifiers per distinct mask, and
+for standard identifiers the outcome of all filters is precomputed for every
+one of the 2048 possible values. Matching a message then takes a single
+table lookup for standard frames and one set lookup per distinct mask for
+extended frames, no matter how many filters there are.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from . import typechecking
+from .message import Message
+
+#: The number of standard (11 bit) identifiers
+STANDARD_IDS = 0x800
+EXTENDED_MASK = 0x1FFFFFFF
+
+
+class _IdMatcher:
+    """
+    The filters that apply to one kind of identifier.
+    """
+
+    __slots__ = ("match_all", "exact", "groups")
+
+    def __init__(self, filters: List[Tuple[int, int]]):
+        self.match_all = False
+        self.exact: Set[int] = set()
+        groups: Dict[int, Set[int]] = {}
+        for can_id, can_mask in filters:
+            if can_id & can_mask & ~EXTENDED_MASK:
+                # needs identifier bits that can not be set
+                continue
+            can_mask &= EXTENDED_MASK
+            if can_mask == 0:
+                self.match_all = True
+            elif can_mask == EXTENDED_MASK:
+                self.exact.add(can_id & can_mask)
+            else:
+                groups.setdefault(can_mask, set()).add(can_id & can_mask)
+        self.groups = tuple(groups.items())
+
+    def table(self) -> Tuple[bool, ...]:
+        """
+        :return: the result for every standard identifier
+        """
+        if self.match_all:
+            return (True,) * STANDARD_IDS
+        table = [False] * STANDARD_IDS
+        for arbitration_id in self.exact:
+            if arbitration_id < STANDARD_IDS:
+                table[arbitration_id] = True
+        for can_mask, can_ids in self.groups:
+            for arbitration_id in range(STANDARD_IDS):
+                if arbitration_id & can_mask in can_ids:
+                    table[arbitration_id] = True
+        return tuple(table)
+
+
+class FilterMatcher:
+    """
+    Matches messages against a list of filters, the same way as the software
+    filtering of :meth:`can.BusABC.recv` does, but compiled once.
+
+    The matcher is a callable, so it can also be used by listeners and to
+    filter log files::
+
+        matcher = can.FilterMatcher([{"can_id": 0x100, "can_mask": 0x700}])
+        for msg in matcher.filter(can.LogReader("trace.blf")):
+            print(msg)
+
+    :attr list filters: the filters the matcher was compiled from
+    """
+
+    def __init__(self, filters: Optional[typechecking.CanFilters] = None):
+        """
+        :param filters:
+            See :meth:`can.BusABC.set_filters`, `None` or an empty sequence
+            match all messages.
+        :raises KeyError: if a filter lacks the "can_id" or "can_mask" key
+        """
+        self.filters = list(filters or ())
+        standard = []
+        extended = []
+        for _filter in self.filters:
+            can_filter = (_filter["can_id"], _filter["can_mask"])
+            only_extended = _filter.get("extended")  # type: ignore
+            if only_extended is None or not only_extended:
+                standard.append(can_filter)
+            if only_extended is None or only_extended:
+                extended.append(can_filter)
+        if not self.filters:
+            standard = extended = [(0, 0)]
+        self._standard = _IdMatcher(standard)
+        self._extended = _IdMatcher(extended)
+        self._table = self._standard.table()
+
+    def __repr__(self) -> str:
+        return "FilterMatcher({!r})".format(self.filters)
+
+    def matches(self, msg: Message) -> bool:
+        """
+        :return: whether the message matches at least one of the filters
+        """
+        arbitration_id = msg.arbitration_id
+        if not msg.is_extended_id:
+            if 0 <= arbitration_id < STANDARD_IDS:
+                return self._table[arbitration_id]
+            matcher = self._standard
+        else:
+            matcher = self._extended
+        if not 0 <= arbitration_id <= EXTENDED_MASK:
+            return self._matches_slowly(msg)
+        if matcher.match_all or arbitration_id in matcher.exact:
+            return True
+        for can_mask, can_ids in matcher.groups:
+            if arbitration_id & can_mask in can_ids:
+                return True
+        return False
+
+    __call__ = matches
+
+    def _matches_slowly(self, msg: Message) -> bool:
+        # identifiers out of range are not covered by the tables
+        if not self.filters:
+            return True
+        for _filter in self.filters:
+            if "extended" in _filter and (
+                _filter["extended"] != msg.is_extended_id  # type: ignore
+            ):
+                continue
+            if (_filter["can_id"] ^ msg.arbitration_id) & _filter["can_mask"] == 0:
+                return True
+        return False
+
+    def filter(self, msgs: Iterable[Message]) -> Iterator[Message]:
+        """
+        :return: the messages that match, e.g. out of a :class:`can.LogReader`
+        """
+        return filter(self.matches, msgs)
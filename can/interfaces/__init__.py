@@ -9,6 +9,7 @@ from pkg_resources import iter_entry_points
 # interface_name => (module, classname)
 BACKENDS = {
     "exoserial":("can.interfaces.exoserial.exoserial_can", "ExoSerialBus"),
+    "exomultiserial":("can.interfaces.exoserial.exomultiserial_can", "ExoMultiSerialBus"),
     "exosocket":("can.interfaces.exosocket.exosocket_can", "ExoSocketBus"),
     "kvaser": ("can.interfaces.kvaser", "KvaserBus"),
     "socketcan": ("can.interfaces.socketcan", "SocketcanBus"),
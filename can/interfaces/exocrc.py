@@ -0,0 +1,113 @@
+"""
+Table driven CRC16-IBM (also known as CRC-16/ARC) codec for the ExoTerra
+RS-485 framing, shared by the Exo buses and the :class:`Receiver`.
+
+The checksum covers the first 11 bytes of a 13 byte frame and is stored
+little endian in the last two bytes.
+
+If the optional :mod:`crcmod` package with its C extension is installed it is
+used to compute checksums, otherwise a precomputed 256 entry table is used.
+"""
+
+import logging
+
+logger = logging.getLogger("can.exoserial")
+
+#: Reflected representation of the polynomial x^16 + x^15 + x^2 + 1 (0x8005)
+POLYNOMIAL = 0xA001
+
+#: Length of one frame including the checksum
+FRAME_LENGTH = 13
+
+#: Number of leading bytes of a frame covered by the checksum
+PAYLOAD_LENGTH = FRAME_LENGTH - 2
+
+
+def _build_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ POLYNOMIAL if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+#: Precomputed checksums of all single byte values
+TABLE = _build_table()
+
+
+def _crc_table(buf, crc=0):
+    table = TABLE
+    for byte in buf:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+try:
+    import crcmod
+    import crcmod._crcfunext  # only use crcmod when the C extension is available
+except ImportError:
+    _crc_fast = None
+else:
+    _crc_fast = crcmod.mkCrcFun(0x18005, initCrc=0, rev=True, xorOut=0)
+
+
+def crc(buf, value=0):
+    """
+    Calculate the checksum of a bytes-like object.
+
+    :param buf: bytes, bytearray or memoryview to calculate the checksum over
+    :param int value: a previous checksum to continue from
+    :returns: the 16 bit checksum as int
+    """
+    if _crc_fast is not None:
+        return _crc_fast(buf, value)
+    return _crc_table(buf, value)
+
+
+def verify(frame, offset=0):
+    """
+    Check the checksum of the frame starting at `offset`.
+
+    :param frame: a bytes-like object containing at least one whole frame
+    :param int offset: position of the first byte of the frame
+    :returns: True if the stored checksum matches the calculated one
+    """
+    # copying 11 bytes is cheaper than creating a memoryview
+    calc_crc = crc(frame[offset : offset + PAYLOAD_LENGTH])
+    return (
+        calc_crc
+        == frame[offset + PAYLOAD_LENGTH] | frame[offset + PAYLOAD_LENGTH + 1] << 8
+    )
+
+
+def append(frame):
+    """
+    Write the checksum over the first 11 bytes into bytes 11 and 12 of `frame`.
+
+    :param bytearray frame: a writable buffer of at least 13 bytes
+    """
+    value = crc(frame[0:PAYLOAD_LENGTH])
+    frame[PAYLOAD_LENGTH] = value & 0xFF
+    frame[PAYLOAD_LENGTH + 1] = value >> 8
+
+
+def verify_many(buf):
+    """
+    Check many back to back frames stored in one contiguous buffer.
+
+    :param buf: a bytes-like object whose length is a multiple of 13
+    :returns: a list of booleans, one per frame
+    :raises ValueError: if the buffer does not contain whole frames only
+    """
+    if len(buf) % FRAME_LENGTH:
+        raise ValueError(
+            "buffer length {} is not a multiple of {}".format(len(buf), FRAME_LENGTH)
+        )
+    with memoryview(buf) as view:
+        return [
+            crc(view[offset : offset + PAYLOAD_LENGTH])
+            == view[offset + PAYLOAD_LENGTH] | view[offset + PAYLOAD_LENGTH + 1] << 8
+            for offset in range(0, len(buf), FRAME_LENGTH)
+        ]
@@ -0,0 +1,279 @@
+"""
+Bounded receive ring buffer for the ExoTerra interfaces.
+
+Frames are stored in preallocated fixed size slots together with the time
+they were enqueued, so the reader thread never allocates and a slow consumer
+never blocks it unless the :data:`BLOCK` policy was selected.
+
+The buffer can also expose a file descriptor that is readable while frames
+may be waiting on POSIX systems, see :meth:`FrameRing.fileno`.
+"""
+
+import os
+import platform
+import threading
+import time
+
+from typing import List, Optional, Tuple
+
+from .exocrc import FRAME_LENGTH
+
+#: Overwrite the oldest frame when the buffer is full
+DROP_OLDEST = "drop_oldest"
+#: Discard the incoming frame when the buffer is full
+DROP_NEWEST = "drop_newest"
+#: Block the producer until there is room again
+BLOCK = "block"
+
+POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class FrameRing:
+    """
+    A thread-safe ring buffer of fixed length frame slots.
+
+    :attr int overruns: number of frames lost because the buffer was full
+    :attr int high_water: the largest number of frames held at any time
+    :attr int total: number of frames enqueued since creation
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        policy: str = DROP_OLDEST,
+        frame_length: int = FRAME_LENGTH,
+    ):
+        """
+        :param capacity:
+            Number of frames the buffer can hold.
+        :param policy:
+            What to do with a new frame when the buffer is full, one of
+            :data:`DROP_OLDEST`, :data:`DROP_NEWEST` or :data:`BLOCK`.
+        :param frame_length:
+            Size of a single slot in bytes.
+
+        :raises ValueError: if the capacity or the policy is invalid
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if policy not in POLICIES:
+            raise ValueError(
+                "unknown policy {!r}, must be one of {}".format(policy, POLICIES)
+            )
+
+        self.capacity = capacity
+        self.policy = policy
+        self.frame_length = frame_length
+
+        self._buffer = bytearray(capacity * frame_length)
+        self._view = memoryview(self._buffer)
+        self._timestamps = [0.0] * capacity
+        self._head = 0
+        self._count = 0
+        self._closed = False
+
+        # read and write end of the readiness pipe, created on demand
+        self._ready_r: Optional[int] = None
+        self._ready_w: Optional[int] = None
+        self._signaled = False
+
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+        self.overruns = 0
+        self.high_water = 0
+        self.total = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def fileno(self) -> int:
+        """
+        Return a file descriptor that becomes readable when frames are enqueued.
+
+        The descriptor stays readable until a :meth:`drain` finds the buffer
+        empty, so a consumer that keeps frames from a previous drain in a local
+        buffer will be woken up once more before it blocks.
+
+        :raises NotImplementedError: on Windows, where pipes cannot be made
+                                     non-blocking or waited on with select
+        """
+        if platform.system() == "Windows":
+            raise NotImplementedError("FrameRing.fileno is only available on POSIX")
+        with self._lock:
+            if self._ready_r is None:
+                self._ready_r, self._ready_w = os.pipe()
+                os.set_blocking(self._ready_r, False)
+                os.set_blocking(self._ready_w, False)
+                if self._count or self._closed:
+                    self._set_ready()
+            return self._ready_r
+
+    def __del__(self):
+        for fd in (getattr(self, "_ready_r", None), getattr(self, "_ready_w", None)):
+            if fd is not None:
+                os.close(fd)
+
+    def _set_ready(self):
+        # must be called with the lock held
+        if self._ready_w is not None and not self._signaled:
+            os.write(self._ready_w, b"\x00")
+            self._signaled = True
+
+    def _clear_ready(self):
+        # must be called with the lock held
+        if self._signaled:
+            try:
+                os.read(self._ready_r, 1)
+            except BlockingIOError:
+                pass
+            self._signaled = False
+
+    def _make_room(self, timeout: Optional[float]) -> bool:
+        # must be called with the lock held
+        if self._count < self.capacity:
+            return True
+        if self.policy == DROP_OLDEST:
+            self._head = (self._head + 1) % self.capacity
+            self._count -= 1
+            self.overruns += 1
+            return True
+        if self.policy == BLOCK:
+            # make sure the consumer knows about the frames stored so far
+            self._set_ready()
+            self._not_empty.notify_all()
+            self._not_full.wait_for(
+                lambda: self._count < self.capacity or self._closed, timeout
+            )
+            if self._count < self.capacity and not self._closed:
+                return True
+        self.overruns += 1
+        return False
+
+    def _store(self, frame, timestamp: float):
+        # must be called with the lock held and room in the buffer
+        slot = (self._head + self._count) % self.capacity
+        offset = slot * self.frame_length
+        self._view[offset : offset + self.frame_length] = frame
+        self._timestamps[slot] = timestamp
+        self._count += 1
+        self.total += 1
+        if self._count > self.high_water:
+            self.high_water = self._count
+
+    def put(
+        self, frame, timestamp: Optional[float] = None, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Enqueue a single frame.
+
+        :param frame: a bytes-like object of exactly `frame_length` bytes
+        :param timestamp: the receive time, defaults to now
+        :param timeout: maximum time to block with the :data:`BLOCK` policy
+        :return: False if the frame was discarded
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            if not self._make_room(timeout):
+                return False
+            self._store(frame, timestamp)
+            self._set_ready()
+            self._not_empty.notify()
+        return True
+
+    def put_many(
+        self, frames, timestamp: Optional[float] = None, timeout: Optional[float] = None
+    ) -> int:
+        """
+        Enqueue several frames while holding the lock only once.
+
+        :param frames: an iterable of frames
+        :param timestamp: the receive time of all frames, defaults to now
+        :param timeout: maximum time to block per frame with the :data:`BLOCK` policy
+        :return: the number of frames that were stored
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        stored = 0
+        with self._lock:
+            for frame in frames:
+                if self._make_room(timeout):
+                    self._store(frame, timestamp)
+                    stored += 1
+            if stored:
+                self._set_ready()
+                self._not_empty.notify_all()
+        return stored
+
+    def drain(
+        self, max_frames: Optional[int] = None, timeout: Optional[float] = 0
+    ) -> List[Tuple[bytes, float]]:
+        """
+        Remove and return the oldest frames.
+
+        :param max_frames: the maximum number of frames to return, all if None
+        :param timeout:
+            seconds to wait for the first frame, None to wait indefinitely
+            or 0 to return immediately
+        :return: a list of ``(frame, timestamp)`` tuples, oldest first; empty on
+                 timeout or after :meth:`close`
+        """
+        with self._lock:
+            if not self._count and timeout != 0:
+                self._not_empty.wait_for(lambda: self._count or self._closed, timeout)
+            count = self._count
+            if max_frames is not None and max_frames < count:
+                count = max_frames
+            frames = []
+            length = self.frame_length
+            view = self._view
+            timestamps = self._timestamps
+            slot = self._head
+            for _ in range(count):
+                offset = slot * length
+                frames.append((bytes(view[offset : offset + length]), timestamps[slot]))
+                slot += 1
+                if slot == self.capacity:
+                    slot = 0
+            self._head = slot
+            self._count -= count
+            if count:
+                self._not_full.notify_all()
+            elif not self._closed:
+                self._clear_ready()
+        return frames
+
+    def get(self, timeout: Optional[float] = 0) -> Optional[Tuple[bytes, float]]:
+        """
+        Remove and return the oldest frame.
+
+        :param timeout: see :meth:`drain`
+        :return: a ``(frame, timestamp)`` tuple or None on timeout
+        """
+        frames = self.drain(1, timeout)
+        return frames[0] if frames else None
+
+    def clear(self):
+        """
+        Discard all buffered frames without counting them as overruns.
+        """
+        with self._lock:
+            self._head = 0
+            self._count = 0
+            self._clear_ready()
+            self._not_full.notify_all()
+
+    def close(self):
+        """
+        Wake up all waiting threads; pending frames can still be drained.
+
+        The readiness descriptor is left readable so that event loops
+        watching it notice the buffer was closed.
+        """
+        with self._lock:
+            self._closed = True
+            self._set_ready()
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
@@ -0,0 +1,203 @@
+"""
+Transmit scheduling for half-duplex ExoTerra RS-485 lines.
+
+Frames are queued by arbitration id and written from a single thread, the
+lowest id first like CAN arbitration would decide, frames with the same id
+in the order they were queued. Between two frames the scheduler keeps an
+inter-frame gap, and after the line carried received data it waits for the
+bus turnaround gap before driving the line again.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from can import CanError
+from .exocrc import FRAME_LENGTH
+
+logger = logging.getLogger("can.exoserial")
+
+#: Upper bounds (exclusive) of the default priority classes, by cob-id
+DEFAULT_PRIORITY_CLASSES = (
+    ("nmt/sync/emcy", 0x100),
+    ("pdo", 0x580),
+    ("sdo", 0x680),
+    ("other", 0x800),
+)
+
+#: Bits on the wire per byte with 8N1 framing
+BITS_PER_BYTE = 10
+
+
+class DelayStats:
+    """
+    Queueing delay of one priority class.
+
+    :attr int count: frames sent
+    :attr float total: sum of the delays in seconds
+    :attr float max: longest delay in seconds
+    """
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, delay: float):
+        self.count += 1
+        self.total += delay
+        if delay > self.max:
+            self.max = delay
+
+    @property
+    def mean(self) -> float:
+        """The mean delay in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def __repr__(self) -> str:
+        return "DelayStats(count={}, mean={:.6f}, max={:.6f})".format(
+            self.count, self.mean, self.max
+        )
+
+
+class TxScheduler:
+    """
+    Orders frames by arbitration id and paces them onto the line.
+
+    :attr dict stats: :class:`DelayStats` by priority class name
+    """
+
+    def __init__(
+        self,
+        write: Callable[[bytes], None],
+        baudrate: Optional[int] = None,
+        inter_frame_gap: float = 0.0,
+        turnaround_gap: float = 0.0,
+        max_pending: int = 1024,
+        priority_classes: Sequence[Tuple[str, int]] = DEFAULT_PRIORITY_CLASSES,
+    ):
+        """
+        :param write: called from the scheduler thread with every frame
+        :param baudrate: used to compute how long a frame occupies the line,
+                         None if writing returns when the frame is on the line
+        :param inter_frame_gap: seconds of silence between two frames
+        :param turnaround_gap: seconds to wait after the last received data
+                               before transmitting, see :meth:`note_rx`
+        :param max_pending: the number of frames that can be queued
+        :param priority_classes: ``(name, upper bound)`` tuples sorted by the
+                                 exclusive upper bound of their arbitration ids
+        """
+        self.write = write
+        self.frame_time = FRAME_LENGTH * BITS_PER_BYTE / baudrate if baudrate else 0.0
+        self.inter_frame_gap = inter_frame_gap
+        self.turnaround_gap = turnaround_gap
+        self.max_pending = max_pending
+        self.priority_classes = tuple(priority_classes)
+        self.stats: Dict[str, DelayStats] = {
+            name: DelayStats() for name, _ in self.priority_classes
+        }
+
+        self._queue: List[Tuple[int, int, float, bytes]] = []
+        self._sequence = itertools.count()
+        self._changed = threading.Condition()
+        self._next_start = 0.0
+        self._last_rx = 0.0
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="can.exoscheduler", daemon=True
+        )
+        self._thread.start()
+
+    def __len__(self) -> int:
+        """The number of queued frames."""
+        return len(self._queue)
+
+    def put(self, arbitration_id: int, frame: bytes, timeout: Optional[float] = None):
+        """
+        Queue a frame for transmission.
+
+        :param arbitration_id: the priority of the frame, lower goes first
+        :param frame: the encoded frame
+        :param timeout: seconds to wait while the queue is full, None to wait
+                        indefinitely
+        :raises can.CanError: if the queue stayed full or the scheduler was stopped
+        """
+        self.put_many([(arbitration_id, frame)], timeout)
+
+    def put_many(self, frames, timeout: Optional[float] = None):
+        """
+        Queue several ``(arbitration_id, frame)`` tuples at once.
+
+        :raises can.CanError: if the queue stayed full or the scheduler was stopped
+        """
+        now = time.perf_counter()
+        with self._changed:
+            for arbitration_id, frame in frames:
+                if len(self._queue) >= self.max_pending:
+                    if not self._changed.wait_for(
+                        lambda: len(self._queue) < self.max_pending
+                        or not self._running,
+                        timeout,
+                    ):
+                        raise CanError("transmit queue is full")
+                if not self._running:
+                    raise CanError("transmit scheduler was stopped")
+                heapq.heappush(
+                    self._queue, (arbitration_id, next(self._sequence), now, frame)
+                )
+            self._changed.notify_all()
+
+    def note_rx(self):
+        """
+        Tell the scheduler that data was just received, so it keeps the
+        turnaround gap before the next transmission.
+        """
+        self._last_rx = time.perf_counter()
+
+    def _priority_class(self, arbitration_id: int) -> str:
+        for name, upper in self.priority_classes:
+            if arbitration_id < upper:
+                return name
+        return self.priority_classes[-1][0]
+
+    def _run(self):
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: self._queue or not self._running)
+                if not self._queue:
+                    return
+            self._wait_for_line()
+            with self._changed:
+                # a more urgent frame may have arrived while waiting
+                arbitration_id, _, queued, frame = heapq.heappop(self._queue)
+                self._changed.notify_all()
+            start = time.perf_counter()
+            self.stats[self._priority_class(arbitration_id)].add(start - queued)
+            try:
+                self.write(frame)
+            except Exception as error:
+                logger.error("could not send frame: %s", error)
+            self._next_start = start + self.frame_time + self.inter_frame_gap
+
+    def _wait_for_line(self):
+        while True:
+            start = max(self._next_start, self._last_rx + self.turnaround_gap)
+            delay = start - time.perf_counter()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def stop(self, timeout: float = 1.0):
+        """
+        Send the queued frames and stop the scheduler thread.
+        """
+        with self._changed:
+            self._running = False
+            self._changed.notify_all()
+        self._thread.join(timeout)
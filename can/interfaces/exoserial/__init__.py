@@ -2,4 +2,5 @@
 """
 
 from can.interfaces.exoserial.exoserial_can import ExoSerialBus as Bus
+from can.interfaces.exoserial.exomultiserial_can import ExoMultiSerialBus
 from ..receiver import *
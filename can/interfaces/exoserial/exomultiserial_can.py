@@ -0,0 +1,328 @@
+"""
+Several ExoTerra RS-485 segments behind one bus.
+
+All serial ports are read by a single I/O thread that waits on them with
+:mod:`selectors`, so N ports cost one thread instead of a receiver and a
+notifier thread each. Received messages carry the port they came from in
+:attr:`can.Message.channel` and sent messages are routed by it.
+
+Only POSIX serial ports can be multiplexed, they need a file descriptor.
+"""
+
+import logging
+import os
+import platform
+import selectors
+import threading
+
+from collections import deque
+from queue import Queue
+
+from can import BusABC, CanError, Message, exomessage
+from ..exocrc import FRAME_LENGTH
+from ..exoring import FrameRing, DROP_OLDEST
+from ..exotap import ExoTap
+from ..exotrace import create_trace
+from ..receiver import FrameDecoder
+from .exoserial_can import UDP_HOST, UDP_PORT
+
+logger = logging.getLogger("can.exoserial")
+
+try:
+    import serial
+except ImportError:
+    logger.warning(
+        "You won't be able to use the serial can backend without "
+        "the serial module installed!"
+    )
+    serial = None
+
+
+class ExoMultiSerialBus(BusABC):
+    """
+    Multiplexes many ExoTerra serial ports in one I/O thread.
+
+    Frames of all ports share one receive buffer, each slot is prefixed with
+    the index of the port the frame arrived on.
+
+    :attr dict decoders: the :class:`~can.interfaces.receiver.FrameDecoder`
+                         of every port, by channel
+    """
+
+    def __init__(
+        self,
+        channel,
+        baudrate=115200,
+        rtscts=False,
+        rx_buffer_size=4096,
+        rx_overflow=DROP_OLDEST,
+        udp_tap=False,
+        int_q_size=1024,
+        raw_journal=None,
+        *args,
+        **kwargs
+    ):
+        """
+        :param channel:
+            The serial devices to open, either a list or a comma separated
+            string like "/dev/ttyUSB0,/dev/ttyUSB1". The first one is used
+            to send messages without a channel.
+
+        :param int baudrate:
+            Baud rate of all serial devices in bit/s (default 115200).
+
+        :param bool rtscts:
+            turn hardware handshake (RTS/CTS) on and off
+
+        :param int rx_buffer_size:
+            Number of received frames of all ports buffered between the I/O
+            thread and :meth:`recv` (default 4096).
+
+        :param str rx_overflow:
+            What to do when the receive buffer is full, see
+            :class:`~can.interfaces.exoring.FrameRing`.
+
+        :param udp_tap:
+            Mirror all frames to ``UDP_HOST:UDP_PORT`` (default False), see
+            :class:`~can.interfaces.exoserial.ExoSerialBus`.
+
+        :param int int_q_size:
+            Number of mirrored frames kept for :meth:`get_int_q`.
+
+        :param str raw_journal:
+            Path of a binary journal every raw frame is appended to, see
+            :mod:`can.interfaces.exotrace`.
+
+        :raises ValueError: if no port is given
+        :raises can.CanError: if a port has no file descriptor to wait on
+        """
+        if isinstance(channel, str):
+            channel = [port.strip() for port in channel.split(",") if port.strip()]
+        if not channel:
+            raise ValueError("Must specify at least one serial port.")
+        if len(channel) > 256:
+            raise ValueError("At most 256 serial ports are supported.")
+
+        self.channels = list(channel)
+        self.channel_info = "ExoMultiSerial interface: " + ",".join(self.channels)
+        self.ports = {}
+        self.decoders = {}
+        self.ring = FrameRing(rx_buffer_size, rx_overflow, FRAME_LENGTH + 1)
+        self._rx_pending = deque()
+        self._selector = selectors.DefaultSelector()
+        # written to on shutdown to wake up the I/O thread
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+
+        try:
+            for index, port in enumerate(self.channels):
+                ser = serial.serial_for_url(
+                    port, baudrate=baudrate, timeout=0, rtscts=rtscts
+                )
+                self.ports[port] = ser
+                try:
+                    fd = ser.fileno()
+                except (AttributeError, OSError):
+                    raise CanError(
+                        "{} has no file descriptor and cannot be multiplexed".format(
+                            port
+                        )
+                    )
+                ser.reset_input_buffer()
+                decoder = FrameDecoder()
+                self.decoders[port] = decoder
+                self._selector.register(
+                    fd, selectors.EVENT_READ, (bytes([index]), decoder)
+                )
+        except Exception:
+            self._close_ports()
+            raise
+
+        self.int_q = Queue(int_q_size)
+        if udp_tap is True:
+            udp_tap = ExoTap(UDP_HOST, UDP_PORT, int_q=self.int_q)
+        self.tap = udp_tap or None
+        self.trace = create_trace(raw_journal)
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="can.exomultiserial", daemon=True
+        )
+        self._thread.start()
+
+        super().__init__(channel=self.channels, *args, **kwargs)
+
+    def _run(self):
+        put_many = self.ring.put_many
+        while self._running:
+            for key, _ in self._selector.select():
+                if key.data is None:
+                    continue
+                try:
+                    data = os.read(key.fd, 65536)
+                except BlockingIOError:
+                    continue
+                except OSError as error:
+                    logger.error("reading port failed, closing it: %s", error)
+                    data = b""
+                if not data:
+                    self._selector.unregister(key.fd)
+                    continue
+                prefix, decoder = key.data
+                frames = decoder.feed(data)
+                if frames:
+                    put_many([prefix + frame for frame in frames])
+
+    def _close_ports(self):
+        for ser in self.ports.values():
+            ser.close()
+        self._selector.close()
+        os.close(self._wakeup_r)
+        os.close(self._wakeup_w)
+
+    def shutdown(self):
+        """
+        Stop the I/O thread and close all serial ports.
+        """
+        self._running = False
+        os.write(self._wakeup_w, b"\x00")
+        self._thread.join(1.0)
+        self.ring.close()
+        if self.tap is not None:
+            self.tap.stop()
+        if self.trace is not None:
+            self.trace.close()
+        for ser in self.ports.values():
+            ser.flush()
+        self._close_ports()
+
+    def get_int_q(self):
+        return self.int_q
+
+    def _port(self, channel):
+        if channel is None:
+            return self.ports[self.channels[0]]
+        try:
+            return self.ports[channel]
+        except KeyError:
+            raise ValueError("Unknown channel {!r}".format(channel)) from None
+
+    def _encode(self, buf, offset, msg, data_size):
+        exomessage.encode_message_into(buf, offset, msg, data_size)
+        if self.tap is None and self.trace is None:
+            return
+        frame = bytes(buf[offset : offset + FRAME_LENGTH])
+        if self.tap is not None:
+            self.tap.tx(frame)
+        if self.trace is not None:
+            self.trace.tx(frame)
+
+    def send(self, msg: Message, timeout=None, data_size=8):
+        """
+        Send a message on the port named by its channel, messages without a
+        channel go to the first port.
+
+        :param timeout:
+            This parameter will be ignored.
+        :raises ValueError: if the channel is not one of the ports of this bus
+        """
+        ser = self._port(msg.channel)
+        tx_bytes = bytearray(FRAME_LENGTH)
+        self._encode(tx_bytes, 0, msg, data_size)
+        ser.write(tx_bytes)
+
+    def send_many(self, msgs, timeout=None, data_size=8):
+        """
+        Send several messages with a single write per port.
+
+        :param msgs:
+            An iterable of :class:`can.Message` objects, routed like in
+            :meth:`send`.
+        :param timeout:
+            This parameter will be ignored.
+        """
+        by_port = {}
+        for msg in msgs:
+            by_port.setdefault(self._port(msg.channel), []).append(msg)
+        for ser, port_msgs in by_port.items():
+            tx_bytes = bytearray(FRAME_LENGTH * len(port_msgs))
+            for i, msg in enumerate(port_msgs):
+                self._encode(tx_bytes, i * FRAME_LENGTH, msg, data_size)
+            ser.write(tx_bytes)
+
+    def send_batch(self, msgs, timeout=None):
+        """
+        Same as :meth:`send_many` with frames of 8 data bytes.
+        """
+        self.send_many(msgs, timeout)
+
+    def _recv_internal(self, timeout):
+        """
+        Read a message of any port from the shared receive buffer.
+
+        :returns:
+            Received message with the port as channel and False (because
+            no filtering has taken place).
+        """
+        if not self._rx_pending:
+            self._rx_pending.extend(self.ring.drain(timeout=timeout))
+            if not self._rx_pending:
+                return None, False
+        record, timestamp = self._rx_pending.popleft()
+        if self.tap is not None:
+            self.tap.rx(record[1:])
+        if self.trace is not None:
+            self.trace.rx(record[1:], timestamp)
+        return (
+            exomessage.decode_message(
+                record,
+                1,
+                timestamp,
+                channel=self.channels[record[0]],
+                pool=self.message_pool,
+                zero_copy=self.zero_copy,
+            ),
+            False,
+        )
+
+    def _recv_batch_internal(self, max_messages, timeout):
+        """
+        Decode up to `max_messages` frames of any port out of the shared
+        receive buffer.
+        """
+        pending = self._rx_pending
+        if not pending:
+            pending.extend(self.ring.drain(timeout=timeout))
+        decode = exomessage.decode_message
+        channels = self.channels
+        pool = self.message_pool
+        zero_copy = self.zero_copy
+        tap = self.tap
+        trace = self.trace
+        msgs = []
+        for _ in range(min(len(pending), max_messages)):
+            record, timestamp = pending.popleft()
+            if tap is not None:
+                tap.rx(record[1:])
+            if trace is not None:
+                trace.rx(record[1:], timestamp)
+            msgs.append(
+                decode(
+                    record,
+                    1,
+                    timestamp,
+                    channel=channels[record[0]],
+                    pool=pool,
+                    zero_copy=zero_copy,
+                )
+            )
+        return msgs, False
+
+    def fileno(self):
+        """
+        A descriptor that is readable whenever received frames are buffered.
+        """
+        if not (platform.system() == "Windows"):
+            return self.ring.fileno()
+        # Return an invalid file descriptor on Windows
+        return -1
@@ -8,13 +8,19 @@ recording CAN traces.
 UDP_HOST = "127.0.0.1"
 UDP_PORT = 4000
 
-import logging, struct, crcengine, time, platform, socket
+import logging, time, platform
 from ..receiver import *
-from can import BusABC, Message
+from .. import exocrc
+from ..exocrc import FRAME_LENGTH
+from ..exoring import DROP_OLDEST
+from ..exotap import ExoTap
+from ..exotrace import create_trace
+from ..exoscheduler import TxScheduler
+from can import BusABC, Message, exomessage
 from queue import Queue
+from collections import deque
 
 logger = logging.getLogger("can.exoserial")
-from loguru import logger as loguru_logger
 
 try:
     import serial
@@ -41,7 +47,21 @@ class ExoSerialBus(BusABC):
     """
 
     def __init__(
-        self, channel, baudrate=115200, timeout=0.1, rtscts=False, *args, **kwargs
+        self,
+        channel,
+        baudrate=115200,
+        timeout=0.1,
+        rtscts=False,
+        rx_buffer_size=1024,
+        rx_overflow=DROP_OLDEST,
+        udp_tap=True,
+        int_q_size=1024,
+        raw_journal=None,
+        tx_scheduler=False,
+        tx_inter_frame_gap=0.0,
+        tx_turnaround_gap=0.0,
+        *args,
+        **kwargs
     ):
         """
         :param str channel:
@@ -60,8 +80,46 @@ class ExoSerialBus(BusABC):
         :param bool rtscts:
             turn hardware handshake (RTS/CTS) on and off
 
+        :param int rx_buffer_size:
+            Number of received frames buffered between the receive thread and
+            :meth:`recv` (default 1024).
+
+        :param str rx_overflow:
+            What to do when the receive buffer is full: "drop_oldest" (default),
+            "drop_newest" or "block". Lost frames are counted in
+            ``bus.receiver.ring.overruns``.
+
+        :param udp_tap:
+            Mirror all frames to ``UDP_HOST:UDP_PORT`` from a background thread
+            (default True). Pass False to disable mirroring or an
+            :class:`~can.interfaces.exotap.ExoTap` instance to configure
+            batching, sampling or filtering.
+
+        :param int int_q_size:
+            Number of mirrored frames kept for :meth:`get_int_q`, the oldest
+            are discarded when nobody reads them (default 1024).
+
+        :param str raw_journal:
+            Path of a binary journal every raw frame is appended to, see
+            :mod:`can.interfaces.exotrace`. Frames are also logged to loguru
+            if its "RAW" level is registered when the bus is created.
+
+        :param bool tx_scheduler:
+            Queue sent messages and write them from a scheduler thread,
+            lowest arbitration id first (default False). :meth:`send` then
+            returns as soon as the message is queued. Queueing delays are
+            reported in ``bus.scheduler.stats``, see
+            :class:`~can.interfaces.exoscheduler.TxScheduler`.
+
+        :param float tx_inter_frame_gap:
+            Seconds of silence the scheduler keeps between two frames.
+
+        :param float tx_turnaround_gap:
+            Seconds the scheduler waits after received data before it
+            transmits.
+
         """
-        
+
         if not channel:
             raise ValueError("Must specify a serial port.")
 
@@ -74,9 +132,23 @@ class ExoSerialBus(BusABC):
         time.sleep(0.1)
         self.ser.reset_input_buffer()
         self.ser.reset_output_buffer()
-        self.int_q = Queue()
-        self.receiver = Receiver(self.ser)
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)  # UDP
+        self.int_q = Queue(int_q_size)
+        self.scheduler = None
+        if tx_scheduler:
+            self.scheduler = TxScheduler(
+                self._write, baudrate, tx_inter_frame_gap, tx_turnaround_gap
+            )
+        self.receiver = Receiver(
+            self.ser,
+            rx_buffer_size,
+            rx_overflow,
+            self.scheduler.note_rx if self.scheduler is not None else None,
+        )
+        self._rx_pending = deque()
+        if udp_tap is True:
+            udp_tap = ExoTap(UDP_HOST, UDP_PORT, int_q=self.int_q)
+        self.tap = udp_tap or None
+        self.trace = create_trace(raw_journal)
 
         super().__init__(channel=channel, *args, **kwargs)
 
@@ -84,6 +156,13 @@ class ExoSerialBus(BusABC):
         """
         Close the serial interface.
         """
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        self.receiver.thread_stop()
+        if self.tap is not None:
+            self.tap.stop()
+        if self.trace is not None:
+            self.trace.close()
         self.ser.flush()
         self.ser.close()
         #ae 22 08 40 00 22 02 00 00 00 00 8a f8
@@ -97,56 +176,73 @@ class ExoSerialBus(BusABC):
         :param can.Message msg:
             Message to send.
         :param timeout:
-            This parameter will be ignored.
-        """
-        if data_size > 8:
-            data_size = 8 #the max size is 8 bytes
-        byte_msg = bytearray()
-        #generate the 5bit header
-        byte0 = (0xa8)
-        #combine with top 3 bits cob-id
-        byte0 |= (msg.arbitration_id & 0x700) >> 8
-        byte1 = (msg.arbitration_id & 0xFF) #add rest of cob id
-        #add control bits
-        byte2 = (msg.is_remote_frame & 0x1) << 7 #rtr
-        byte2 |= (msg.is_extended_id & 0x1) << 6 #ide
-        byte2 |= (0 & 0x2) << 4 # reserved bits
-        byte2 |= (data_size & 0xF) # data length
-        #append all of the data
-        byte_msg.append(byte0)
-        byte_msg.append(byte1)
-        byte_msg.append(byte2)
-        #move the msg data to the byte_msg and make sure its 8 bytes
-        msg_data = bytearray(8)
-        for i,v in enumerate(msg.data):
-            if i < 8:
-                msg_data[i] = v
-        byte_msg.extend(msg_data)
-        #calc and append the crc
-        crcobj = crcengine.new("crc16-ibm")
-        crc = crcobj.calculate(byte_msg).to_bytes(2, byteorder="little") #might need to be switched to big, not sure yet
-        byte_msg.extend(crc)
+            Seconds to wait while the transmit queue of the scheduler is
+            full, ignored without a scheduler.
+        """
+        byte_msg = bytearray(FRAME_LENGTH)
+        exomessage.encode_message_into(byte_msg, 0, msg, data_size)
+        if self.scheduler is not None:
+            self.scheduler.put(msg.arbitration_id, byte_msg, timeout)
+        else:
+            self._write(byte_msg)
+
+    def _write(self, tx_bytes):
         #sendit!
-        # print(f"sending: {str(byte_msg.hex())} len: {len(byte_msg)}")
-        sock_data = bytearray()
-        sock_data.append(0xA)
-        sock_data.extend(byte_msg)
-        self.int_q.put(sock_data)
-        self.sock.sendto(sock_data, (UDP_HOST, UDP_PORT))
-        try:
-            loguru_logger.log("RAW", self.create_send_msg(byte_msg))
-        except Exception as e:
-            None #ignore if script doesnt use loguru
-
-        self.ser.write(byte_msg)
+        if self.tap is not None:
+            self.tap.tx(tx_bytes)
+        if self.trace is not None:
+            self.trace.tx(tx_bytes)
 
-    def _recv_internal(self, timeout):
+        self.ser.write(tx_bytes)
+
+    def send_many(self, msgs, timeout=None, data_size=8):
         """
-        Read a message from the serial device.
+        Sends several messages with a single write to the serial port.
+
+        All frames are encoded back to back into one buffer. With a
+        scheduler every frame is queued on its own instead.
+
+        :param msgs:
+            An iterable of :class:`can.Message` objects.
         :param timeout:
+            Seconds to wait while the transmit queue of the scheduler is
+            full, ignored without a scheduler.
+        """
+        msgs = list(msgs)
+        if not msgs:
+            return
+        tx_bytes = bytearray(FRAME_LENGTH * len(msgs))
+        view = memoryview(tx_bytes)
+        if self.scheduler is not None:
+            frames = []
+            for i, msg in enumerate(msgs):
+                offset = i * FRAME_LENGTH
+                exomessage.encode_message_into(tx_bytes, offset, msg, data_size)
+                frames.append(
+                    (msg.arbitration_id, bytes(view[offset : offset + FRAME_LENGTH]))
+                )
+            self.scheduler.put_many(frames, timeout)
+            return
+        for i, msg in enumerate(msgs):
+            offset = i * FRAME_LENGTH
+            exomessage.encode_message_into(tx_bytes, offset, msg, data_size)
+            if self.tap is not None:
+                self.tap.tx(bytes(view[offset : offset + FRAME_LENGTH]))
+            if self.trace is not None:
+                self.trace.tx(view[offset : offset + FRAME_LENGTH])
+        self.ser.write(tx_bytes)
+
+    def send_batch(self, msgs, timeout=None):
+        """
+        Same as :meth:`send_many` with frames of 8 data bytes.
+        """
+        self.send_many(msgs, timeout)
 
-            .. warning::
-                This parameter will be ignored. The timeout value of the channel is used.
+    def _recv_internal(self, timeout):
+        """
+        Read a message from the receive buffer filled by the receiver thread.
+        :param timeout:
+            seconds to wait for a message, None to wait indefinitely.
 
         :returns:
             Received message and False (because not filtering as taken place).
@@ -159,81 +255,64 @@ class ExoSerialBus(BusABC):
         :rtype:
             Tuple[can.Message, Bool]
         """
-        try:
-            # ser.read can return an empty string
-            # or raise a SerialException
-            rx_bytes = self.receiver.q.get() 
-        except serial.SerialException:
-            return None, False
-        if len(rx_bytes)==0:
-            return None, False
-        # print("recv: ", rx_bytes.hex())
-        header = (rx_bytes[0] & 0xF8)
-        if (header) == 0xa8:
-            #get the cob id
-            cob_id = (rx_bytes[0] & 0x7) << 8 #move the 3bits up to the top
-            cob_id |= (rx_bytes[1] & 0xFF)#append the bottom 8 bits
-            remote_frame = (rx_bytes[2] & 0x80) >> 7
-            extended_id = (rx_bytes[2] & 0x40) >> 6
-            data_length = (rx_bytes[2] & 0xF)
-            data = rx_bytes[3:11]
-            #validate the crc
-            # return None, False
-            sock_data = bytearray()
-            sock_data.append(0xB)
-            sock_data.extend(rx_bytes)
-            self.int_q.put(sock_data)
-            try:
-                loguru_logger.log("RAW", self.create_send_msg(rx_bytes))
-            except Exception as e:
-                None #ignore if script doesnt use loguru
-            self.sock.sendto(sock_data, (UDP_HOST, UDP_PORT))
-            # received message data okay
-            msg = Message(
-                timestamp=time.time(),
-                arbitration_id=cob_id,
-                is_remote_frame=remote_frame,
-                is_extended_id=extended_id,
-                data=data,
-            )
-            return msg, False
-        else:
-            print("exploded - returning none")
-            return None, False
+        # take a whole batch out of the ring buffer at once and hand out
+        # the frames one by one without touching its lock again
+        if not self._rx_pending:
+            self._rx_pending.extend(self.receiver.ring.drain(timeout=timeout))
+            if not self._rx_pending:
+                return None, False
+        rx_bytes, timestamp = self._rx_pending.popleft()
+        # the receiver only queues frames with a valid SOF and CRC
+        if self.tap is not None:
+            self.tap.rx(rx_bytes)
+        if self.trace is not None:
+            self.trace.rx(rx_bytes, timestamp)
+        return (
+            exomessage.decode_message(
+                rx_bytes,
+                0,
+                timestamp,
+                pool=self.message_pool,
+                zero_copy=self.zero_copy,
+            ),
+            False,
+        )
+
+    def _recv_batch_internal(self, max_messages, timeout):
+        """
+        Decode up to `max_messages` frames out of the receive buffer.
+        """
+        pending = self._rx_pending
+        if not pending:
+            pending.extend(self.receiver.ring.drain(timeout=timeout))
+        decode = exomessage.decode_message
+        pool = self.message_pool
+        zero_copy = self.zero_copy
+        tap = self.tap
+        trace = self.trace
+        msgs = []
+        for _ in range(min(len(pending), max_messages)):
+            rx_bytes, timestamp = pending.popleft()
+            if tap is not None:
+                tap.rx(rx_bytes)
+            if trace is not None:
+                trace.rx(rx_bytes, timestamp)
+            msgs.append(decode(rx_bytes, 0, timestamp, pool=pool, zero_copy=zero_copy))
+        return msgs, False
 
     def create_send_msg(self, tx_bytes):
-        header = (tx_bytes[0] & 0xF8)
-        msg = ""
-        if (header) == 0xa8:
-            # get the cob id
-            cob_id = (tx_bytes[0] & 0x7) << 8  # move the 3bits up to the top
-            cob_id |= (tx_bytes[1] & 0xFF)  # append the bottom 8 bits
-            remote_frame = (tx_bytes[2] & 0x80) >> 7
-            extended_id = (tx_bytes[2] & 0x40) >> 6
-            data_length = (tx_bytes[2] & 0xF)
-            data = tx_bytes[3:11]
-            msg = f" id:{hex(cob_id)}: dl:{data_length}: d:{data.hex()}"
-        return msg
+        return exomessage.describe(tx_bytes)
 
     def create_recv_msg(self, rx_bytes):
-        header = (rx_bytes[0] & 0xF8)
-        msg = ""
-        if (header) == 0xa8:
-            # get the cob id
-            cob_id = (rx_bytes[0] & 0x7) << 8  # move the 3bits up to the top
-            cob_id |= (rx_bytes[1] & 0xFF)  # append the bottom 8 bits
-            data_length = (rx_bytes[2] & 0xF)
-            data = rx_bytes[3:11]
-            index = struct.unpack("<H", rx_bytes[4:6])[0]
-            subindex = rx_bytes[6]
-            # if index == 0x5001 and subindex == 0x3:
-            #     self.sock.sendto(data, (self.raw_udp_ip, 4001))
-            msg = f" id:{hex(cob_id)}: dl:{data_length}: d:{data.hex()}"
-        return msg
+        return exomessage.describe(rx_bytes)
 
     def fileno(self):
-        if hasattr(self.ser, "fileno") and not (platform.system() == "Windows"):
-            return self.ser.fileno()
+        """
+        The serial port itself is read by the receiver thread, so this returns
+        a descriptor that is readable whenever received frames are buffered.
+        """
+        if not (platform.system() == "Windows"):
+            return self.receiver.ring.fileno()
         # Return an invalid file descriptor on Windows
         return -1
 
@@ -0,0 +1,225 @@
+"""
+A simulated ExoTerra RS-485 device on a pseudo terminal.
+
+The simulator opens a pty pair; an :class:`~can.interfaces.exoserial.ExoSerialBus`
+opens the slave side given by :attr:`ExoSimulator.port` while the simulator
+reads and writes the master side. It speaks the 13 byte CRC16 framing and can
+inject noise, bursts and partial frames, optionally paced at a baud rate like
+a half-duplex line that carries one direction at a time.
+
+Only available on POSIX systems::
+
+    with ExoSimulator(baudrate=1000000) as sim:
+        with can.Bus(interface="exoserial", channel=sim.port) as bus:
+            sim.send(ExoFrame(0x181, b"\\x01\\x02"))
+            print(bus.recv(1.0))
+"""
+
+import os
+import threading
+import time
+import tty
+
+from collections import deque
+
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from can.exomessage import ExoFrame
+from ..receiver import FrameDecoder
+from ..exocrc import FRAME_LENGTH
+
+#: Bits on the wire per byte with 8N1 framing
+BITS_PER_BYTE = 10
+
+
+class ExoSimulator:
+    """
+    A device on the other end of a pty that speaks the ExoTerra framing.
+
+    :attr list received: ``(timestamp, frame)`` tuples of every valid frame
+                         the bus sent, in order
+    """
+
+    def __init__(
+        self,
+        baudrate: Optional[int] = None,
+        responder: Optional[Callable[[ExoFrame], Iterable[ExoFrame]]] = None,
+        response_delay: float = 0.0,
+    ):
+        """
+        :param baudrate:
+            Pace all traffic in both directions as if it shared one line
+            running at this baud rate, or None to not pace at all.
+        :param responder:
+            Called for every frame received from the bus; the returned
+            frames are sent back.
+        :param response_delay:
+            Seconds between receiving a frame and starting to send the
+            replies of the responder, like the turnaround time of a device.
+            Frames keep being received in the meantime.
+        """
+        self.baudrate = baudrate
+        self.responder = responder
+        self.response_delay = response_delay
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.master)
+        tty.setraw(self.slave)
+        #: The device name to open the bus on
+        self.port = os.ttyname(self.slave)
+
+        self.received: List[Tuple[float, bytes]] = []
+        self.decoder = FrameDecoder()
+        self._frame_received = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._line_lock = threading.Lock()
+        self._line_free = 0.0
+        self._replies: deque = deque()
+        self._reply_ready = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._read, name="can.exoserial simulator", daemon=True
+        )
+        self._thread.start()
+        self._reply_thread = threading.Thread(
+            target=self._reply, name="can.exoserial simulator replies", daemon=True
+        )
+        self._reply_thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _read(self):
+        while self._running:
+            try:
+                data = os.read(self.master, 65536)
+            except OSError:
+                break
+            self._occupy(len(data))
+            timestamp = time.perf_counter()
+            frames = self.decoder.feed(data)
+            if not frames:
+                continue
+            with self._frame_received:
+                self.received.extend((timestamp, frame) for frame in frames)
+                self._frame_received.notify_all()
+            if self.responder is not None:
+                for frame in frames:
+                    replies = self.responder(ExoFrame.decode_from(frame))
+                    if not replies:
+                        continue
+                    if not self.response_delay:
+                        self.send(*replies)
+                        continue
+                    with self._reply_ready:
+                        self._replies.append((timestamp + self.response_delay, replies))
+                        self._reply_ready.notify()
+
+    def _reply(self):
+        while True:
+            with self._reply_ready:
+                self._reply_ready.wait_for(lambda: self._replies or not self._running)
+                if not self._running:
+                    return
+                due, replies = self._replies.popleft()
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                self.send(*replies)
+            except OSError:
+                return
+
+    def wait_for(self, count: int, timeout: float = 5.0) -> bool:
+        """
+        Wait until at least `count` frames were received from the bus.
+
+        :return: False on timeout
+        """
+        with self._frame_received:
+            return self._frame_received.wait_for(
+                lambda: len(self.received) >= count, timeout
+            )
+
+    def write(self, data) -> float:
+        """
+        Write raw bytes to the bus, paced at the configured baud rate.
+
+        :return: the :func:`time.perf_counter` value when writing started
+        """
+        with self._write_lock:
+            start = time.perf_counter()
+            os.write(self.master, data)
+            self._occupy(len(data))
+        return start
+
+    def _occupy(self, count: int):
+        """
+        Reserve the line for `count` bytes and wait until they are through.
+        """
+        if not self.baudrate:
+            return
+        with self._line_lock:
+            self._line_free = (
+                max(time.perf_counter(), self._line_free)
+                + count * BITS_PER_BYTE / self.baudrate
+            )
+            end = self._line_free
+        remaining = end - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def send(self, *frames: ExoFrame) -> float:
+        """
+        Send frames back to back in a single write.
+
+        :return: the :func:`time.perf_counter` value when writing started
+        """
+        buf = bytearray(FRAME_LENGTH * len(frames))
+        for i, frame in enumerate(frames):
+            frame.encode_into(buf, i * FRAME_LENGTH)
+        return self.write(buf)
+
+    def burst(self, frames: Iterable[ExoFrame], chunk: int = 64):
+        """
+        Send many frames, written `chunk` frames at a time.
+        """
+        frames = list(frames)
+        for i in range(0, len(frames), chunk):
+            self.send(*frames[i : i + chunk])
+
+    def send_partial(self, frame: ExoFrame, split: int, delay: float = 0.01):
+        """
+        Send a frame in two writes with a pause after the first `split` bytes.
+        """
+        data = frame.encode()
+        self.write(data[:split])
+        time.sleep(delay)
+        self.write(data[split:])
+
+    def inject_noise(self, noise) -> float:
+        """
+        Write garbage to the line.
+
+        :param noise: the bytes to write or a number of random bytes
+        """
+        if isinstance(noise, int):
+            noise = os.urandom(noise)
+        return self.write(noise)
+
+    def close(self):
+        """
+        Stop the simulator and close the pty.
+        """
+        with self._reply_ready:
+            self._running = False
+            self._reply_ready.notify()
+        for fd in (self.slave, self.master):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._thread.join(1.0)
+        self._reply_thread.join(1.0)
@@ -8,13 +8,17 @@ recording CAN traces.
 UDP_HOST = "127.0.0.1"
 UDP_PORT = 8082 
 
-import logging, struct, crcengine, time, platform, socket
+import logging, time, platform, socket, select, threading
 from ..receiver import *
-from can import BusABC, Message
+from ..exocrc import FRAME_LENGTH
+from ..exoring import DROP_OLDEST
+from ..exotap import ExoTap
+from ..exotrace import create_trace
+from can import BusABC, Message, CanError, exomessage
 from queue import Queue
+from collections import deque
 
 logger = logging.getLogger("can.exoserial")
-from loguru import logger as loguru_logger
 
 try:
     import serial
@@ -41,7 +45,22 @@ class ExoSocketBus(BusABC):
     """
 
     def __init__(
-        self, channel, baudrate=115200, timeout=0.1, rtscts=False, *args, **kwargs
+        self,
+        channel,
+        baudrate=115200,
+        timeout=0.1,
+        rtscts=False,
+        rx_buffer_size=1024,
+        rx_overflow=DROP_OLDEST,
+        udp_tap=False,
+        int_q_size=1024,
+        raw_journal=None,
+        host=None,
+        port=None,
+        reconnect_delay=0.1,
+        reconnect_max_delay=5.0,
+        *args,
+        **kwargs
     ):
         """
         :param str channel:
@@ -60,26 +79,175 @@ class ExoSocketBus(BusABC):
         :param bool rtscts:
             turn hardware handshake (RTS/CTS) on and off
 
+        :param int rx_buffer_size:
+            Number of received frames buffered between the receive thread and
+            :meth:`recv` (default 1024).
+
+        :param str rx_overflow:
+            What to do when the receive buffer is full: "drop_oldest" (default),
+            "drop_newest" or "block". Lost frames are counted in
+            ``bus.ring.overruns``.
+
+        :param udp_tap:
+            Mirror all frames over UDP from a background thread (default False).
+            Pass True to use the defaults of :class:`~can.interfaces.exotap.ExoTap`
+            or an instance to configure it.
+
+        :param int int_q_size:
+            Number of mirrored frames kept for :meth:`get_int_q`, the oldest
+            are discarded when nobody reads them (default 1024).
+
+        :param str raw_journal:
+            Path of a binary journal every raw frame is appended to, see
+            :mod:`can.interfaces.exotrace`. Frames are also logged to loguru
+            if its "RAW" level is registered when the bus is created.
+
+        :param str host:
+            Address of the TCP bridge (default ``UDP_HOST``).
+
+        :param int port:
+            Port of the TCP bridge (default ``UDP_PORT``).
+
+        :param float reconnect_delay:
+            Seconds to wait before the first reconnection attempt after the
+            bridge closed the connection, doubled after every failed attempt.
+            The receive thread reconnects on its own, also while nobody calls
+            :meth:`recv`.
+
+        :param float reconnect_max_delay:
+            Upper limit of the delay between reconnection attempts.
+
         """
-        print("THE SOCKET HAS ARRIVED!!!")        
         if not channel:
             raise ValueError("Must specify a serial port.")
 
-        self.channel_info = "ExoSerial interface: " + channel
-
-        print("EXOINTERFACE")
-        #wait a second for the serial port to clear
-        time.sleep(0.1)
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)  # UDP
-        self.sock.connect((UDP_HOST, UDP_PORT))
+        self.channel_info = "ExoSocket interface: " + channel
+
+        self.address = (host or UDP_HOST, port or UDP_PORT)
+        self.connect_timeout = timeout
+        self.reconnect_delay = reconnect_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self._backoff = reconnect_delay
+        self._next_attempt = 0.0
+        #: Number of times the connection was reestablished
+        self.reconnects = 0
+        self.decoder = FrameDecoder()
+        self.ring = FrameRing(rx_buffer_size, rx_overflow)
+        self._rx_pending = deque()
+        self.sock = None
+        # guards replacing and closing the socket, which the receive thread
+        # and senders share
+        self._sock_lock = threading.Lock()
+        # keeps the bytes of frames from several senders from interleaving
+        # when the socket only takes part of a frame
+        self._send_lock = threading.Lock()
+        self._connected = threading.Event()
+        self._stopping = threading.Event()
+        self._connect()
+        if self.sock is None:
+            self.ring.close()
+            raise CanError("could not connect to {}:{}".format(*self.address))
+        self.int_q = Queue(int_q_size)
+        if udp_tap is True:
+            udp_tap = ExoTap(int_q=self.int_q)
+        self.tap = udp_tap or None
+        self.trace = create_trace(raw_journal)
         super().__init__(channel=channel, *args, **kwargs)
+        self._thread = threading.Thread(
+            target=self._rx_thread, name="can.exosocket", daemon=True
+        )
+        self._thread.start()
 
     def shutdown(self):
         """
-        Close the serial interface.
+        Stop the receive thread and close the connection.
         """
+        self._stopping.set()
+        self.ring.close()
+        if self._thread is not threading.current_thread():
+            self._thread.join(1.0)
+        if self.tap is not None:
+            self.tap.stop()
+        if self.trace is not None:
+            self.trace.close()
+        self._disconnect()
         #ae 22 08 40 00 22 02 00 00 00 00 8a f8
 
+    def _connect(self):
+        """
+        Try to (re)connect to the bridge once, without blocking for longer
+        than the connect timeout.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(self.connect_timeout)
+        try:
+            sock.connect(self.address)
+        except OSError as error:
+            sock.close()
+            self._next_attempt = time.monotonic() + self._backoff
+            self._backoff = min(self._backoff * 2, self.reconnect_max_delay)
+            logger.debug("connecting to %s:%d failed: %s", *self.address, error)
+            return
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setblocking(False)
+        self.decoder.reset()
+        with self._sock_lock:
+            self.sock = sock
+        self._connected.set()
+        self._backoff = self.reconnect_delay
+
+    def _disconnect(self, sock=None):
+        """
+        Close the connection, only if it still is `sock` when that is given.
+        """
+        with self._sock_lock:
+            if self.sock is None or (sock is not None and sock is not self.sock):
+                return
+            self._connected.clear()
+            self.sock.close()
+            self.sock = None
+            self._next_attempt = time.monotonic() + self._backoff
+
+    def _reconnect(self):
+        """
+        Reconnect with exponential backoff until connected or shut down.
+        """
+        while self.sock is None and not self._stopping.is_set():
+            delay = self._next_attempt - time.monotonic()
+            if delay > 0 and self._stopping.wait(delay):
+                return
+            self._connect()
+            if self.sock is not None:
+                self.reconnects += 1
+                logger.info("reconnected to %s:%d", *self.address)
+
+    def _rx_thread(self):
+        """
+        Read the stream into the receive buffer and keep the connection up.
+        """
+        while not self._stopping.is_set():
+            sock = self.sock
+            if sock is None:
+                self._reconnect()
+                continue
+            try:
+                readable, _, _ = select.select([sock], [], [], 0.1)
+                if not readable:
+                    continue
+                frames = self.decoder.recv_into(sock)
+            except BlockingIOError:
+                continue
+            except (OSError, ValueError) as error:
+                # the socket may also have been closed by a failed send
+                frames = None
+                logger.debug("receiving failed: %s", error)
+            if frames is None:
+                if not self._stopping.is_set():
+                    logger.warning("connection to %s:%d lost", *self.address)
+                self._disconnect(sock)
+            elif frames:
+                self.ring.put_many(frames)
+
     def get_int_q(self):
         return self.int_q
 
@@ -89,130 +257,131 @@ class ExoSocketBus(BusABC):
         :param can.Message msg:
             Message to send.
         :param timeout:
-            This parameter will be ignored.
-        """
-        if data_size > 8:
-            data_size = 8 #the max size is 8 bytes
-        byte_msg = bytearray()
-        #generate the 5bit header
-        byte0 = (0xa8)
-        #combine with top 3 bits cob-id
-        byte0 |= (msg.arbitration_id & 0x700) >> 8
-        byte1 = (msg.arbitration_id & 0xFF) #add rest of cob id
-        #add control bits
-        byte2 = (msg.is_remote_frame & 0x1) << 7 #rtr
-        byte2 |= (msg.is_extended_id & 0x1) << 6 #ide
-        byte2 |= (0 & 0x2) << 4 # reserved bits
-        byte2 |= (data_size & 0xF) # data length
-        #append all of the data
-        byte_msg.append(byte0)
-        byte_msg.append(byte1)
-        byte_msg.append(byte2)
-        #move the msg data to the byte_msg and make sure its 8 bytes
-        msg_data = bytearray(8)
-        for i,v in enumerate(msg.data):
-            if i < 8:
-                msg_data[i] = v
-        byte_msg.extend(msg_data)
-        #calc and append the crc
-        crcobj = crcengine.new("crc16-ibm")
-        crc = crcobj.calculate(byte_msg).to_bytes(2, byteorder="little") #might need to be switched to big, not sure yet
-        byte_msg.extend(crc)
-        #sendit!
-        # print(f"sending: {str(byte_msg.hex())} len: {len(byte_msg)}")
-        sock_data = bytearray()
-        sock_data.extend(byte_msg)
-        self.sock.sendto(sock_data, (UDP_HOST, UDP_PORT))
+            Seconds to wait for the connection to accept the frame, None to
+            wait indefinitely.
+        :raises can.CanError:
+            if the frame could not be sent within the timeout
+        """
+        byte_msg = bytearray(FRAME_LENGTH)
+        exomessage.encode_message_into(byte_msg, 0, msg, data_size)
+        if self.tap is not None:
+            self.tap.tx(byte_msg)
+        self._send_all(byte_msg, timeout)
+        if self.trace is not None:
+            self.trace.tx(byte_msg)
+
+    def _send_all(self, data, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._send_lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise CanError("timed out sending frame")
         try:
-            loguru_logger.log("RAW", self.create_send_msg(byte_msg))
-        except Exception as e:
-            None #ignore if script doesnt use logurj
-
-        #self.ser.write(byte_msg)
+            view = memoryview(data)
+            while view:
+                remaining = (
+                    None if deadline is None else max(0.0, deadline - time.monotonic())
+                )
+                # the receive thread reconnects
+                if not self._connected.wait(remaining):
+                    raise CanError("not connected to {}:{}".format(*self.address))
+                sock = self.sock
+                if sock is None:
+                    continue
+                try:
+                    sent = sock.send(view)
+                except BlockingIOError:
+                    sent = 0
+                except OSError as error:
+                    logger.warning("connection to %s:%d lost: %s", *self.address, error)
+                    self._disconnect(sock)
+                    raise CanError("failed to send frame: {}".format(error))
+                view = view[sent:]
+                if view:
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        raise CanError("timed out sending frame")
+                    select.select([], [sock], [], remaining)
+        finally:
+            self._send_lock.release()
 
     def _recv_internal(self, timeout):
         """
-        Read a message from the serial device.
-        :param timeout:
+        Read a message from the receive buffer filled by the receive thread.
 
-            .. warning::
-                This parameter will be ignored. The timeout value of the channel is used.
+        The receive thread reassembles the stream into frames and only queues
+        frames with a valid CRC. It reconnects on its own with exponential
+        backoff if the bridge closes the connection.
+
+        :param timeout:
+            seconds to wait for a message, None to wait indefinitely.
 
         :returns:
             Received message and False (because not filtering as taken place).
 
-            .. warning::
-                Flags like is_extended_id, is_remote_frame and is_error_frame
-                will not be set over this function, the flags in the return
-                message are the default values.
-
         :rtype:
             Tuple[can.Message, Bool]
         """
-        # ser.read can return an empty string
-        # or raise a SerialException
-        rx_bytes = self.sock.recv(13)
-
-        header = (rx_bytes[0] & 0xF8)
-        print("header = ", header)
-        if (header) == 0xa8:
-            #get the cob id
-            cob_id = (rx_bytes[0] & 0x7) << 8 #move the 3bits up to the top
-            cob_id |= (rx_bytes[1] & 0xFF)#append the bottom 8 bits
-            remote_frame = (rx_bytes[2] & 0x80) >> 7
-            extended_id = (rx_bytes[2] & 0x40) >> 6
-            data_length = (rx_bytes[2] & 0xF)
-            data = rx_bytes[3:11]
-            #validate the crc
-            # return None, False
-            sock_data = bytearray()
-            sock_data.append(0xB)
-            sock_data.extend(rx_bytes)
-            # received message data okay
-            print("got here before message")
-            msg = Message(
-                timestamp=time.time(),
-                arbitration_id=cob_id,
-                is_remote_frame=remote_frame,
-                is_extended_id=extended_id,
-                data=data,
-            )
-            print("got here hooyah!")
-            return msg, False
-        else:
-            print("exploded - returning none")
-            return None, False
+        # take a whole batch out of the ring buffer at once and hand out
+        # the frames one by one without touching its lock again
+        if not self._rx_pending:
+            self._rx_pending.extend(self.ring.drain(timeout=timeout))
+            if not self._rx_pending:
+                return None, False
+        rx_bytes, timestamp = self._rx_pending.popleft()
+        if self.tap is not None:
+            self.tap.rx(rx_bytes)
+        if self.trace is not None:
+            self.trace.rx(rx_bytes, timestamp)
+        return (
+            exomessage.decode_message(
+                rx_bytes,
+                0,
+                timestamp,
+                pool=self.message_pool,
+                zero_copy=self.zero_copy,
+            ),
+            False,
+        )
+
+    def _recv_batch_internal(self, max_messages, timeout):
+        """
+        Decode up to `max_messages` frames out of the receive buffer.
+        """
+        pending = self._rx_pending
+        if not pending:
+            pending.extend(self.ring.drain(timeout=timeout))
+        decode = exomessage.decode_message
+        pool = self.message_pool
+        zero_copy = self.zero_copy
+        tap = self.tap
+        trace = self.trace
+        msgs = []
+        for _ in range(min(len(pending), max_messages)):
+            rx_bytes, timestamp = pending.popleft()
+            if tap is not None:
+                tap.rx(rx_bytes)
+            if trace is not None:
+                trace.rx(rx_bytes, timestamp)
+            msgs.append(decode(rx_bytes, 0, timestamp, pool=pool, zero_copy=zero_copy))
+        return msgs, False
+
+    def fileno(self):
+        """
+        The connection is read by the receive thread, so this returns a
+        descriptor that is readable whenever received frames are buffered.
+        It stays the same across reconnects.
+        """
+        if not (platform.system() == "Windows"):
+            return self.ring.fileno()
+        # Return an invalid file descriptor on Windows
+        return -1
 
     def create_send_msg(self, tx_bytes):
-        header = (tx_bytes[0] & 0xF8)
-        msg = ""
-        if (header) == 0xa8:
-            # get the cob id
-            cob_id = (tx_bytes[0] & 0x7) << 8  # move the 3bits up to the top
-            cob_id |= (tx_bytes[1] & 0xFF)  # append the bottom 8 bits
-            remote_frame = (tx_bytes[2] & 0x80) >> 7
-            extended_id = (tx_bytes[2] & 0x40) >> 6
-            data_length = (tx_bytes[2] & 0xF)
-            data = tx_bytes[3:11]
-            msg = f" id:{hex(cob_id)}: dl:{data_length}: d:{data.hex()}"
-        return msg
+        return exomessage.describe(tx_bytes)
 
     def create_recv_msg(self, rx_bytes):
-        header = (rx_bytes[0] & 0xF8)
-        msg = ""
-        if (header) == 0xa8:
-            # get the cob id
-            cob_id = (rx_bytes[0] & 0x7) << 8  # move the 3bits up to the top
-            cob_id |= (rx_bytes[1] & 0xFF)  # append the bottom 8 bits
-            data_length = (rx_bytes[2] & 0xF)
-            data = rx_bytes[3:11]
-            index = struct.unpack("<H", rx_bytes[4:6])[0]
-            subindex = rx_bytes[6]
-            # if index == 0x5001 and subindex == 0x3:
-            #     self.sock.sendto(data, (self.raw_udp_ip, 4001))
-            msg = f" id:{hex(cob_id)}: dl:{data_length}: d:{data.hex()}"
-        return msg
-
+        return exomessage.describe(rx_bytes)
 
     @staticmethod
     def _detect_available_configs():
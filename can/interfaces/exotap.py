@@ -0,0 +1,186 @@
+"""
+Asynchronous UDP mirror ("tap") for ExoTerra bus traffic.
+
+Every mirrored frame is prefixed with a tag byte, :data:`TX` for sent and
+:data:`RX` for received frames. Many of these 14 byte records are packed into
+one datagram by a background thread, so mirroring only costs the bus a
+bounded :class:`collections.deque` append.
+"""
+
+import logging
+import socket
+import threading
+import time
+
+from collections import deque
+from queue import Full, Empty
+from typing import Iterable, Optional
+
+from .exocrc import FRAME_LENGTH
+
+logger = logging.getLogger("can.exoserial")
+
+#: Tag of transmitted frames
+TX = 0xA
+#: Tag of received frames
+RX = 0xB
+
+#: Length of a tagged frame
+RECORD_LENGTH = FRAME_LENGTH + 1
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 4000
+
+
+class ExoTap:
+    """
+    Mirrors tagged frames to a UDP endpoint from its own thread.
+
+    The queue between the bus and the tap thread is bounded; when it is full
+    the oldest frames are discarded and counted in :attr:`dropped`.
+
+    :attr int dropped: frames discarded because the queue was full
+    :attr int records: frames mirrored so far
+    :attr int datagrams: datagrams sent so far
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        queue_size: int = 4096,
+        max_latency: float = 0.005,
+        max_records: int = 100,
+        sample: int = 1,
+        can_ids: Optional[Iterable[int]] = None,
+        int_q=None,
+    ):
+        """
+        :param host: destination address of the datagrams
+        :param port: destination port of the datagrams
+        :param queue_size: maximum number of frames waiting to be mirrored
+        :param max_latency: maximum time in seconds a frame waits before it is sent
+        :param max_records: maximum number of frames per datagram
+        :param sample: only mirror every n-th frame
+        :param can_ids: only mirror frames with one of these cob-ids, all if None
+        :param int_q: an optional :class:`queue.Queue` that additionally receives
+                      every mirrored record; the oldest record is discarded
+                      when it is full
+        """
+        if sample < 1:
+            raise ValueError("sample must be at least 1")
+        if max_records < 1:
+            raise ValueError("max_records must be at least 1")
+
+        self.address = (host, port)
+        self.max_latency = max_latency
+        self.max_records = max_records
+        self.sample = sample
+        self.can_ids = None if can_ids is None else frozenset(can_ids)
+        self.int_q = int_q
+
+        self.dropped = 0
+        self.records = 0
+        self.datagrams = 0
+
+        self._queue: deque = deque(maxlen=queue_size)
+        self._counter = 0
+        # set while frames wait, so the thread sleeps while nothing flows
+        self._pending = threading.Event()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="can.exotap {}:{}".format(host, port), daemon=True
+        )
+        self._thread.start()
+
+    def put(self, tag: int, frame):
+        """
+        Queue a frame for mirroring. Never blocks.
+
+        :param tag: :data:`TX` or :data:`RX`
+        :param frame: the 13 raw bytes of the frame; must not be modified afterwards
+        """
+        if self.can_ids is not None:
+            if ((frame[0] & 0x7) << 8 | frame[1]) not in self.can_ids:
+                return
+        if self.sample > 1:
+            self._counter += 1
+            if self._counter % self.sample:
+                return
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append((tag, frame))
+        if not self._pending.is_set():
+            self._pending.set()
+
+    def tx(self, frame):
+        """
+        Queue a transmitted frame.
+        """
+        self.put(TX, frame)
+
+    def rx(self, frame):
+        """
+        Queue a received frame.
+        """
+        self.put(RX, frame)
+
+    def _run(self):
+        while self._running:
+            self._pending.wait()
+            if not self._running:
+                break
+            # gather the frames that follow the first one for a datagram
+            time.sleep(self.max_latency)
+            self._pending.clear()
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        """
+        Send everything that is queued right now.
+        """
+        popleft = self._queue.popleft
+        while self._queue:
+            datagram = bytearray()
+            for _ in range(self.max_records):
+                try:
+                    tag, frame = popleft()
+                except IndexError:
+                    break
+                record = bytearray(RECORD_LENGTH)
+                record[0] = tag
+                record[1:] = frame
+                datagram += record
+                if self.int_q is not None:
+                    self._put_int_q(record)
+            if not datagram:
+                break
+            try:
+                self._sock.sendto(datagram, self.address)
+            except OSError as error:
+                logger.debug("could not mirror frames: %s", error)
+                continue
+            self.records += len(datagram) // RECORD_LENGTH
+            self.datagrams += 1
+
+    def _put_int_q(self, record):
+        while True:
+            try:
+                self.int_q.put_nowait(record)
+                return
+            except Full:
+                try:
+                    self.int_q.get_nowait()
+                except Empty:
+                    pass
+
+    def stop(self, timeout: float = 1.0):
+        """
+        Send the remaining frames and stop the tap thread.
+        """
+        self._running = False
+        self._pending.set()
+        self._thread.join(timeout)
+        self._sock.close()
@@ -0,0 +1,125 @@
+"""
+Raw frame tracing for the ExoTerra interfaces.
+
+Frames can be traced to :mod:`loguru` at the custom "RAW" level and to a
+compact binary journal. Whether the level exists is checked once when the
+trace is created, and log lines are only formatted if a loguru handler
+actually accepts them.
+
+Every journal record is :data:`JOURNAL_RECORD` (22 bytes): the timestamp as a
+little endian double, the direction tag (:data:`~can.interfaces.exotap.TX` or
+:data:`~can.interfaces.exotap.RX`) and the 13 raw bytes of the frame. Use
+:func:`read_journal` to decode it again.
+"""
+
+import logging
+import struct
+import time
+
+from typing import Iterator, Optional, Tuple
+
+from can import exomessage
+from can.typechecking import StringPathLike
+from .exotap import TX, RX
+
+logger = logging.getLogger("can.exoserial")
+
+try:
+    from loguru import logger as loguru_logger
+except ImportError:
+    loguru_logger = None
+
+JOURNAL_RECORD = struct.Struct("<dB13s")
+
+
+class ExoTrace:
+    """
+    Traces raw frames to loguru and/or a binary journal.
+
+    Use :func:`create_trace` to only get an instance if there is anything
+    to trace.
+    """
+
+    def __init__(self, journal: Optional[StringPathLike] = None, level: str = "RAW"):
+        """
+        :param journal: path of a binary journal to append to, or None
+        :param level: name of the loguru level to log at, log lines are
+                      only produced if the level is registered
+        """
+        self.level = level
+        self._log = None
+        if loguru_logger is not None:
+            try:
+                loguru_logger.level(level)
+            except ValueError:
+                pass  # the script does not use the raw level
+            else:
+                self._log = loguru_logger.opt(lazy=True).log
+        self._journal = open(journal, "ab") if journal is not None else None
+
+    @property
+    def active(self) -> bool:
+        """
+        True if frames are traced anywhere.
+        """
+        return self._log is not None or self._journal is not None
+
+    def trace(self, tag: int, frame, timestamp: Optional[float] = None):
+        """
+        Trace a single frame.
+
+        :param tag: :data:`~can.interfaces.exotap.TX` or
+                    :data:`~can.interfaces.exotap.RX`
+        :param frame: the 13 raw bytes of the frame
+        :param timestamp: the time of the frame, defaults to now
+        """
+        if self._log is not None:
+            self._log(self.level, "{}", lambda: exomessage.describe(frame))
+        if self._journal is not None:
+            if timestamp is None:
+                timestamp = time.time()
+            self._journal.write(JOURNAL_RECORD.pack(timestamp, tag, bytes(frame)))
+
+    def tx(self, frame, timestamp: Optional[float] = None):
+        """
+        Trace a transmitted frame.
+        """
+        self.trace(TX, frame, timestamp)
+
+    def rx(self, frame, timestamp: Optional[float] = None):
+        """
+        Trace a received frame.
+        """
+        self.trace(RX, frame, timestamp)
+
+    def close(self):
+        """
+        Flush and close the journal.
+        """
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+def create_trace(
+    journal: Optional[StringPathLike] = None, level: str = "RAW"
+) -> Optional[ExoTrace]:
+    """
+    :return: an :class:`ExoTrace` or None if neither the loguru level is
+             registered nor a journal was requested
+    """
+    trace = ExoTrace(journal, level)
+    return trace if trace.active else None
+
+
+def read_journal(path: StringPathLike) -> Iterator[Tuple[float, int, bytes]]:
+    """
+    Read a binary journal written by :class:`ExoTrace`.
+
+    :return: an iterator of ``(timestamp, tag, frame)`` tuples; a truncated
+             last record is ignored
+    """
+    with open(path, "rb") as journal:
+        data = journal.read()
+    end = len(data) - len(data) % JOURNAL_RECORD.size
+    yield from JOURNAL_RECORD.iter_unpack(memoryview(data)[:end])
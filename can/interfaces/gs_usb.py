@@ -53,7 +53,7 @@ class GsUsbBus(can.BusABC):
             can_id = can_id | CAN_ERR_FLAG
 
         # Pad message data
-        msg.data.extend([0x00] * (CAN_MAX_DLC - len(msg.data)))
+        msg.writable_data().extend([0x00] * (CAN_MAX_DLC - len(msg.data)))
 
         frame = GsUsbFrame()
         frame.can_id = can_id
@@ -1,67 +1,189 @@
-import threading, queue, crcengine, binascii
+import threading, logging, re
+from . import exocrc
+from .exocrc import FRAME_LENGTH
+from .exoring import FrameRing, DROP_OLDEST
 
-class Receiver():
+logger = logging.getLogger("can.exoserial")
+
+#: The 5 bit start of frame pattern, the lower 3 bits carry the top of the cob-id
+SOF = 0xA8
+SOF_MASK = 0xF8
+
+# matches every byte that may start a frame (0xa8 - 0xaf)
+_SOF_PATTERN = re.compile(b"[\xa8-\xaf]")
+
+
+class FrameDecoder:
+    """
+    Streaming decoder for the 13 byte ExoTerra RS-485 framing.
+
+    Bytes are appended to a reusable buffer with :meth:`feed` or read straight
+    into it with :meth:`recv_into`. The buffer is scanned for the start of frame
+    pattern, every candidate frame is validated in place and all good frames
+    are returned at once. Bytes that do not start a valid frame are skipped one
+    at a time, so resynchronizing after line noise is linear in the number of
+    received bytes.
+    """
+
+    def __init__(self, size=4096):
+        """
+        :param int size: initial size of the receive buffer in bytes
+        """
+        self.buffer = bytearray(max(size, FRAME_LENGTH))
+        self._view = memoryview(self.buffer)
+        self._end = 0
+        #: Number of frames that passed the CRC check
+        self.good_frames = 0
+        #: Number of bytes discarded while searching for a valid frame
+        self.dropped_bytes = 0
+
+    def __len__(self):
+        """
+        The number of buffered bytes that are not part of a frame yet.
+        """
+        return self._end
+
+    def _reserve(self, count):
+        if self._end + count > len(self.buffer):
+            buffer = bytearray(max(self._end + count, 2 * len(self.buffer)))
+            buffer[0 : self._end] = self._view[0 : self._end]
+            self._view.release()
+            self.buffer = buffer
+            self._view = memoryview(buffer)
+
+    def feed(self, data):
+        """
+        Append received bytes and return every complete, valid frame.
+
+        :param data: the bytes read from the device
+        :returns: a list of frames as :class:`bytes` objects of 13 bytes each
+        """
+        count = len(data)
+        self._reserve(count)
+        self._view[self._end : self._end + count] = data
+        self._end += count
+        return self._decode()
+
+    def recv_into(self, sock):
+        """
+        Read whatever the socket holds directly into the buffer.
+
+        :param socket.socket sock: a connected stream socket
+        :returns: a list of frames like :meth:`feed` or None if the peer
+                  closed the connection
+        :raises BlockingIOError: if the socket is non-blocking and has no data
+        """
+        count = sock.recv_into(self._view[self._end :])
+        if not count:
+            return None
+        self._end += count
+        return self._decode()
+
+    def _decode(self):
+        buf = self.buffer
+        end = self._end
+        frames = []
+        pos = 0
+        last = end - FRAME_LENGTH
+        while pos <= last:
+            match = _SOF_PATTERN.search(buf, pos, end)
+            if match is None:
+                pos = end
+                break
+            start = match.start()
+            if start > last:
+                pos = start
+                break
+            if self.valid(buf, start):
+                frames.append(bytes(self._view[start : start + FRAME_LENGTH]))
+                pos = start + FRAME_LENGTH
+            else:
+                pos = start + 1
+        if pos:
+            self._discard(pos, len(frames))
+        self.good_frames += len(frames)
+        return frames
+
+    def valid(self, buf, start=0):
+        """
+        Check the start of frame pattern and the CRC of the frame at `start`.
+        """
+        if buf[start] & SOF_MASK != SOF:
+            return False
+        return exocrc.verify(buf, start)
+
+    def _discard(self, count, frame_count):
+        dropped = count - frame_count * FRAME_LENGTH
+        if dropped:
+            self.dropped_bytes += dropped
+            logger.debug("dropped %d bytes while resynchronizing", dropped)
+        # move the incomplete rest (less than one frame) to the front
+        remaining = self._end - count
+        if remaining:
+            self.buffer[0:remaining] = self.buffer[count : self._end]
+        self._end = remaining
+
+    def reset(self):
+        """
+        Forget any partially received frame.
+        """
+        self._end = 0
+
+
+class Receiver:
     """
     Simple Python receiver
 
-    Puts frontend receive into thread and enqueues with thread-safe queue
-    to minimize our chances of dropping messages. Currently made to be
-    used with exoserial/pyserial front end.
+    Puts frontend receive into thread and enqueues into a preallocated
+    :class:`~can.interfaces.exoring.FrameRing` to minimize our chances of
+    dropping messages. Currently made to be used with exoserial/pyserial
+    front end.
     """
-    def __init__(self, frontend):
+
+    def __init__(self, frontend, capacity=1024, policy=DROP_OLDEST, on_rx=None):
         """
-        Initalize the queue and setup access to the serial interface (frontend).
+        Initalize the ring buffer and setup access to the serial interface (frontend).
+
+        :param int capacity: number of frames the receive buffer can hold
+        :param str policy: overflow policy of the receive buffer,
+                           see :class:`~can.interfaces.exoring.FrameRing`
+        :param on_rx: called without arguments whenever data was read, e.g.
+                      :meth:`~can.interfaces.exoscheduler.TxScheduler.note_rx`
         """
-        self.q = queue.Queue(5)
+        self.ring = FrameRing(capacity, policy)
+        self.on_rx = on_rx
         self.running = True
         self.frontend = frontend
-        self.t = threading.Thread(target=self.receive, daemon=True)  
+        self.decoder = FrameDecoder()
+        self.t = threading.Thread(target=self.receive, daemon=True)
         self.t.start()
 
     def receive(self):
         """
-        receive, setups the serial port and if its open, reads 13 bytes and if its a good frame move onto the next byte.
+        receive, setups the serial port and if its open, reads everything that is
+        waiting in the input buffer and enqueues all good frames found in it.
 
+        When nothing is waiting a single byte is requested, so the read blocks for
+        at most the timeout of the serial port instead of spinning.
         """
-        frame = bytearray()
-        msg = bytearray()
         self.frontend.reset_input_buffer()
         self.frontend.reset_output_buffer()
+        self.decoder.reset()
         while self.running:
             if self.frontend.isOpen():
-                next_read = 13 - len(frame)
-                msg = self.frontend.read(next_read)
-                #print("msg len:", len(msg))
-                if len(msg) > 0:
-                    frame = frame + msg
-                    if len(frame) == 13:
-                        frame = self.good_frame(frame)
-
-    def good_frame(self, frame):
-        """
-        good_frame, checks to make sure the crc is correct and if so put the frame into the return queue.
-        """
-        SOF = 0xa8
-        byte_array = bytearray()
-        valid_frame = False
-        if frame[0] & 0xf8 == SOF:
-            crcobj = crcengine.new("crc16-ibm")
-            calc_crc = crcobj.calculate(frame[0:11]).to_bytes(2, byteorder="little")
-            calc_crc = calc_crc[0] << 8 | calc_crc[1]
-            frame_crc = frame[11] << 8 | frame[12]
-            if calc_crc == frame_crc:
-                self.q.put(frame)
-                valid_frame = True
-        if valid_frame == False:
-            byte_array = bytearray(frame)
-            print("invalid frame: ", binascii.hexlify(byte_array))
-            byte_array.pop(0)
-        return byte_array
+                msg = self.frontend.read(max(1, self.frontend.in_waiting))
+                if msg:
+                    if self.on_rx is not None:
+                        self.on_rx()
+                    frames = self.decoder.feed(msg)
+                    if frames:
+                        self.ring.put_many(frames)
 
     def thread_stop(self):
         """
-        thread_stop, stops the loop.
+        thread_stop, stops the loop and wakes up anyone waiting for frames.
         """
         self.running = False
-
-
+        self.ring.close()
+        if self.t is not threading.current_thread():
+            self.t.join(1.0)
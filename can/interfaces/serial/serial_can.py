@@ -91,6 +91,24 @@ class SerialBus(BusABC):
             used instead.
 
         """
+        self.ser.write(self._encode(msg))
+
+    def send_batch(self, msgs, timeout=None):
+        """
+        Send several messages over the serial device with a single write.
+
+        :param list msgs:
+            Messages to send, see :meth:`send`.
+
+        :param timeout:
+            This parameter will be ignored. The timeout value of the channel is
+            used instead.
+
+        """
+        self.ser.write(b"".join([self._encode(msg) for msg in msgs]))
+
+    @staticmethod
+    def _encode(msg):
         try:
             timestamp = struct.pack("<I", int(msg.timestamp * 1000))
         except struct.error:
@@ -101,15 +119,12 @@ class SerialBus(BusABC):
             raise ValueError("Arbitration Id is out of range")
         byte_msg = bytearray()
         byte_msg.append(0xAA)
-        for i in range(0, 4):
-            byte_msg.append(timestamp[i])
+        byte_msg += timestamp
         byte_msg.append(msg.dlc)
-        for i in range(0, 4):
-            byte_msg.append(a_id[i])
-        for i in range(0, msg.dlc):
-            byte_msg.append(msg.data[i])
+        byte_msg += a_id
+        byte_msg += msg.data[: msg.dlc]
         byte_msg.append(0xBB)
-        self.ser.write(byte_msg)
+        return byte_msg
 
     def _recv_internal(self, timeout):
         """
@@ -7,7 +7,7 @@ Interface for slcan compatible interfaces (win32/linux).
 
 """
 
-from typing import Any, Optional, Tuple
+from typing import Any, Optional, Sequence, Tuple
 from can import typechecking
 
 import io
@@ -235,6 +235,23 @@ class slcanBus(BusABC):
     def send(self, msg: Message, timeout: Optional[float] = None) -> None:
         if timeout != self.serialPortOrig.write_timeout:
             self.serialPortOrig.write_timeout = timeout
+        self._write(self._encode(msg))
+
+    def send_batch(
+        self, msgs: Sequence[Message], timeout: Optional[float] = None
+    ) -> None:
+        if timeout != self.serialPortOrig.write_timeout:
+            self.serialPortOrig.write_timeout = timeout
+        # one write and flush for the whole batch
+        self.serialPortOrig.write(
+            b"".join(
+                [self._encode(msg).encode() + self.LINE_TERMINATOR for msg in msgs]
+            )
+        )
+        self.serialPortOrig.flush()
+
+    @staticmethod
+    def _encode(msg: Message) -> str:
         if msg.is_remote_frame:
             if msg.is_extended_id:
                 sendStr = "R%08X%d" % (msg.arbitration_id, msg.dlc)
@@ -246,7 +263,7 @@ class slcanBus(BusABC):
             else:
                 sendStr = "t%03X%d" % (msg.arbitration_id, msg.dlc)
             sendStr += "".join(["%02X" % b for b in msg.data])
-        self._write(sendStr)
+        return sendStr
 
     def shutdown(self) -> None:
         self.close()
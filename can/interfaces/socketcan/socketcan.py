@@ -29,6 +29,7 @@ except ImportError:
 
 import can
 from can import Message, BusABC
+from can.messagepool import MessagePool
 from can.broadcastmanager import (
     ModifiableCyclicTaskABC,
     RestartableCyclicTaskABC,
@@ -175,6 +176,34 @@ def build_can_frame(msg: Message) -> bytes:
     return CAN_FRAME_HEADER_STRUCT.pack(can_id, msg.dlc, flags) + data
 
 
+CAN_MTU = CAN_FRAME_HEADER_STRUCT.size + 8
+_PADDING = bytes(CANFD_MTU)
+
+
+def pack_can_frame_into(buffer: bytearray, offset: int, msg: Message) -> int:
+    """Write the same frame as :func:`build_can_frame` into `buffer`.
+
+    :param buffer: the buffer to write the frame into
+    :param offset: where the frame starts in the buffer
+    :param msg: the message to pack
+    :return: the size of the frame in bytes
+    """
+    can_id = _compose_arbitration_id(msg)
+    flags = 0
+    if msg.bitrate_switch:
+        flags |= CANFD_BRS
+    if msg.error_state_indicator:
+        flags |= CANFD_ESI
+    CAN_FRAME_HEADER_STRUCT.pack_into(buffer, offset, can_id, msg.dlc, flags)
+    size = CANFD_MTU if msg.is_fd else CAN_MTU
+    start = offset + CAN_FRAME_HEADER_STRUCT.size
+    end = start + len(msg.data)
+    buffer[start:end] = msg.data
+    # the buffer is reused, so clear what is left of an earlier frame
+    buffer[end : offset + size] = _PADDING[: offset + size - end]
+    return size
+
+
 def build_bcm_header(
     opcode: int,
     flags: int,
@@ -506,7 +535,12 @@ def bind_socket(sock: socket.socket, channel: str = "can0") -> None:
 
 
 def capture_message(
-    sock: socket.socket, get_channel: bool = False
+    sock: socket.socket,
+    get_channel: bool = False,
+    pool: Optional[MessagePool] = None,
+    buffer: Optional[bytearray] = None,
+    nonblocking: bool = False,
+    zero_copy: bool = False,
 ) -> Optional[Message]:
     """
     Captures a message from given socket.
@@ -515,17 +549,34 @@ def capture_message(
         The socket to read a message from.
     :param get_channel:
         Find out which channel the message comes from.
+    :param pool:
+        A pool to take the message from instead of creating one.
+    :param buffer:
+        A buffer of at least CANFD_MTU bytes to read the frame into instead
+        of allocating one, only allowed together with `pool`, which copies
+        the data out of it.
+    :param nonblocking:
+        Return None instead of waiting if no frame is available.
+    :param zero_copy:
+        Keep the data as the :class:`bytes` it was received as, ignored
+        together with `pool`.
 
     :return: The received message, or None on failure.
     """
+    flags = socket.MSG_DONTWAIT if nonblocking else 0
     # Fetching the Arb ID, DLC and Data
     try:
+        if buffer is not None:
+            nbytes, _, msg_flags, addr = sock.recvmsg_into((buffer,), 0, flags)
+            cf = memoryview(buffer)[:nbytes]
+        else:
+            cf, _, msg_flags, addr = sock.recvmsg(CANFD_MTU, 0, flags)
         if get_channel:
-            cf, _, msg_flags, addr = sock.recvmsg(CANFD_MTU)
             channel = addr[0] if isinstance(addr, tuple) else addr
         else:
-            cf, _, msg_flags, _ = sock.recvmsg(CANFD_MTU)
             channel = None
+    except BlockingIOError:
+        return None
     except socket.error as exc:
         raise can.CanError("Error receiving: %s" % exc)
 
@@ -562,19 +613,21 @@ def capture_message(
         # log.debug("CAN: Standard")
         arbitration_id = can_id & 0x000007FF
 
-    msg = Message(
-        timestamp=timestamp,
-        channel=channel,
-        arbitration_id=arbitration_id,
-        is_extended_id=is_extended_frame_format,
-        is_remote_frame=is_remote_transmission_request,
-        is_error_frame=is_error_frame,
-        is_fd=is_fd,
-        is_rx=is_rx,
-        bitrate_switch=bitrate_switch,
-        error_state_indicator=error_state_indicator,
-        dlc=can_dlc,
-        data=data,
+    from_fields = Message._from_fields if pool is None else pool.acquire
+    msg = from_fields(
+        timestamp,
+        arbitration_id,
+        is_extended_frame_format,
+        is_remote_transmission_request,
+        is_error_frame,
+        channel,
+        can_dlc,
+        b"" if is_remote_transmission_request else data,
+        is_fd,
+        is_rx,
+        bitrate_switch,
+        error_state_indicator,
+        zero_copy=zero_copy,
     )
 
     # log_rx.debug('Received: %s', msg)
@@ -625,6 +678,8 @@ class SocketcanBus(BusABC):
         self._is_filtered = False
         self._task_id = 0
         self._task_id_guard = threading.Lock()
+        self._rx_buffer = bytearray(CANFD_MTU)
+        self._tx_buffer = bytearray(64 * CANFD_MTU)
 
         # set the receive_own_messages parameter
         try:
@@ -673,7 +728,14 @@ class SocketcanBus(BusABC):
 
         if ready_receive_sockets:  # not empty
             get_channel = self.channel == ""
-            msg = capture_message(self.socket, get_channel)
+            if self.message_pool is None:
+                msg = capture_message(
+                    self.socket, get_channel, zero_copy=self.zero_copy
+                )
+            else:
+                msg = capture_message(
+                    self.socket, get_channel, self.message_pool, self._rx_buffer
+                )
             if msg and not msg.channel and self.channel:
                 # Default to our own channel
                 msg.channel = self.channel
@@ -682,6 +744,30 @@ class SocketcanBus(BusABC):
         # socket wasn't readable or timeout occurred
         return None, self._is_filtered
 
+    def _recv_batch_internal(
+        self, max_messages: int, timeout: Optional[float]
+    ) -> Tuple[List[Message], bool]:
+        # wait for the first frame only, then read without blocking until
+        # the socket is empty
+        msg, already_filtered = self._recv_internal(timeout)
+        if msg is None:
+            return [], already_filtered
+        msgs = [msg]
+        get_channel = self.channel == ""
+        pool = self.message_pool
+        buffer = self._rx_buffer if pool is not None else None
+        while len(msgs) < max_messages:
+            msg = capture_message(
+                self.socket, get_channel, pool, buffer, True, self.zero_copy
+            )
+            if msg is None:
+                break
+            if not msg.channel and self.channel:
+                # Default to our own channel
+                msg.channel = self.channel
+            msgs.append(msg)
+        return msgs, self._is_filtered
+
     def send(self, msg: Message, timeout: Optional[float] = None) -> None:
         """Transmit a message to the CAN bus.
 
@@ -720,6 +806,68 @@ class SocketcanBus(BusABC):
 
         raise can.CanError("Transmit buffer full")
 
+    def send_batch(
+        self, msgs: Sequence[Message], timeout: Optional[float] = None
+    ) -> None:
+        """Transmit several messages to the CAN bus, in order.
+
+        All frames are packed into one buffer that is kept between calls and
+        written without blocking, the socket is only polled when the transmit
+        queue is full.
+
+        :param msgs: the messages to send
+        :param timeout:
+            Wait up to this many seconds in total for the transmit queue to be
+            ready. If not given, the call may fail as soon as it is full.
+
+        :raises can.BatchSendError:
+            if not all messages could be written, with the number of
+            messages that were
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            for msg in msgs:
+                log.getChild("tx").debug("sending: %s", msg)
+
+        needed = len(msgs) * CANFD_MTU
+        if len(self._tx_buffer) < needed:
+            self._tx_buffer = bytearray(needed)
+        buffer = self._tx_buffer
+        ends = []
+        offset = 0
+        for msg in msgs:
+            offset += pack_can_frame_into(buffer, offset, msg)
+            ends.append(offset)
+
+        deadline = time.time() + (timeout or 0)
+        address_channels = self.channel == ""
+        sock = self.socket
+        start = 0
+        with memoryview(buffer) as view:
+            for sent, end in enumerate(ends):
+                frame = view[start:end]
+                channel = msgs[sent].channel if address_channels else None
+                while True:
+                    try:
+                        if channel:
+                            # Message must be addressed to a specific channel
+                            sock.sendto(frame, socket.MSG_DONTWAIT, (str(channel),))
+                        else:
+                            sock.send(frame, socket.MSG_DONTWAIT)
+                        break
+                    except OSError as exc:
+                        if exc.errno not in (errno.EAGAIN, errno.ENOBUFS):
+                            raise can.BatchSendError(
+                                "Failed to transmit: %s" % exc, sent
+                            ) from exc
+                    time_left = deadline - time.time()
+                    if time_left > 0:
+                        # wait for the transmit queue to drain
+                        select.select([], [sock], [], time_left)
+                    else:
+                        raise can.BatchSendError("Transmit buffer full", sent)
+                frame.release()
+                start = end
+
     def _send_once(self, data: bytes, channel: Optional[str] = None) -> int:
         try:
             if self.channel == "" and channel:
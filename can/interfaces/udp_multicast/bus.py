@@ -3,7 +3,7 @@ import select
 import socket
 import struct
 
-from typing import List, Optional, Tuple, Union
+from typing import List, Optional, Sequence, Tuple, Union
 
 log = logging.getLogger(__name__)
 
@@ -119,6 +119,28 @@ class UdpMulticastBus(BusABC):
         data = pack_message(message)
         self._multicast.send(data, timeout)
 
+    def send_batch(
+        self, msgs: Sequence[can.Message], timeout: Optional[float] = None
+    ) -> None:
+        """Send every message as its own datagram, like :meth:`send` does.
+
+        The messages are all packed before the first one is sent and
+        `timeout` applies to each datagram.
+        """
+        if not self.is_fd and any(message.is_fd for message in msgs):
+            raise RuntimeError("cannot send FD message over bus with CAN FD disabled")
+
+        datagrams = [pack_message(message) for message in msgs]
+        sent = 0
+        try:
+            for data in datagrams:
+                self._multicast.send(data, timeout)
+                sent += 1
+        except OSError as error:
+            raise can.BatchSendError(
+                "Sent {} of {} messages: {}".format(sent, len(msgs), error), sent
+            ) from error
+
     def fileno(self) -> int:
         """Provides the internally used file descriptor of the socket or `-1` if not available."""
         return self._multicast.fileno()
@@ -6,7 +6,7 @@ Any VirtualBus instances connecting to the same channel
 and reside in the same process will receive the same messages.
 """
 
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
 from copy import deepcopy
 import logging
@@ -16,7 +16,7 @@ from threading import RLock
 from random import randint
 
 from can import CanError
-from can.bus import BusABC
+from can.bus import BusABC, BatchSendError
 from can.message import Message
 
 logger = logging.getLogger(__name__)
@@ -99,6 +99,23 @@ class VirtualBus(BusABC):
         else:
             return msg, False
 
+    def _recv_batch_internal(
+        self, max_messages: int, timeout: Optional[float]
+    ) -> Tuple[List[Message], bool]:
+        self._check_if_open()
+        try:
+            msgs = [self.queue.get(block=True, timeout=timeout)]
+        except queue.Empty:
+            return [], False
+        # take everything else that is waiting without blocking
+        get_nowait = self.queue.get_nowait
+        try:
+            while len(msgs) < max_messages:
+                msgs.append(get_nowait())
+        except queue.Empty:
+            pass
+        return msgs, False
+
     def send(self, msg: Message, timeout: Optional[float] = None) -> None:
         self._check_if_open()
 
@@ -119,6 +136,69 @@ class VirtualBus(BusABC):
         if not all_sent:
             raise CanError("Could not send message to one or more recipients")
 
+    def send_batch(
+        self, msgs: Sequence[Message], timeout: Optional[float] = None
+    ) -> None:
+        self._check_if_open()
+
+        timestamp = time.time()
+        deadline = None if timeout is None else timestamp + timeout
+        payloads = [bytes(msg.data) for msg in msgs]
+        sent = len(msgs)
+        for bus_queue in self.channel:
+            if bus_queue is self.queue and not self.receive_own_messages:
+                continue
+            is_rx = bus_queue is not self.queue
+            copies = [
+                Message._from_fields(
+                    timestamp,
+                    msg.arbitration_id,
+                    msg.is_extended_id,
+                    msg.is_remote_frame,
+                    msg.is_error_frame,
+                    self.channel_id,
+                    msg.dlc,
+                    data,
+                    msg.is_fd,
+                    is_rx,
+                    msg.bitrate_switch,
+                    msg.error_state_indicator,
+                )
+                for msg, data in zip(msgs, payloads)
+            ]
+            sent = min(sent, self._put_all(bus_queue, copies, deadline))
+        if sent < len(msgs):
+            raise BatchSendError(
+                "Could not send all messages to one or more recipients", sent
+            )
+
+    @staticmethod
+    def _put_all(
+        bus_queue: queue.Queue, msgs: List[Message], deadline: Optional[float]
+    ) -> int:
+        """
+        Put the messages into the queue through its public interface, so its
+        size limit and the waiting of the receiver keep working, waiting for
+        room until the deadline.
+
+        :return: the number of messages put into the queue
+        """
+        for put, msg in enumerate(msgs):
+            try:
+                bus_queue.put_nowait(msg)
+            except queue.Full:
+                if deadline is None:
+                    bus_queue.put(msg)
+                    continue
+                time_left = deadline - time.time()
+                if time_left <= 0:
+                    return put
+                try:
+                    bus_queue.put(msg, timeout=time_left)
+                except queue.Full:
+                    return put
+        return len(msgs)
+
     def shutdown(self) -> None:
         if self._open:
             self._open = False
@@ -6,7 +6,7 @@ Example .asc files:
     - under `test/data/logfile.asc`
 """
 
-from typing import cast, Any, Generator, IO, List, Optional, Union, Dict
+from typing import cast, Any, Generator, IO, List, Optional, Tuple, Union
 from can import typechecking
 
 from datetime import datetime
@@ -39,6 +39,7 @@ class ASCReader(BaseIOHandler):
         self,
         file: Union[typechecking.FileLike, typechecking.StringPathLike],
         base: str = "hex",
+        zero_copy: bool = False,
     ) -> None:
         """
         :param file: a path-like object or as file-like object to read from
@@ -47,8 +48,11 @@ class ASCReader(BaseIOHandler):
         :param base: Select the base(hex or dec) of id and data.
                      If the header of the asc file contains base information,
                      this value will be overwritten. Default "hex".
+        :param zero_copy: leave the data of the messages as :class:`bytes`,
+                          see :meth:`can.Message.writable_data`
         """
         super().__init__(file, mode="r")
+        self.zero_copy = zero_copy
 
         if not self.file:
             raise ValueError("The given file cannot be None")
@@ -79,14 +83,13 @@ class ASCReader(BaseIOHandler):
             else:
                 break
 
-    def _extract_can_id(self, str_can_id: str, msg_kwargs: Dict[str, Any]) -> None:
+    def _extract_can_id(self, str_can_id: str) -> Tuple[int, bool]:
+        """
+        :return: the arbitration id and whether it is extended
+        """
         if str_can_id[-1:].lower() == "x":
-            msg_kwargs["is_extended_id"] = True
-            can_id = int(str_can_id[0:-1], self._converted_base)
-        else:
-            msg_kwargs["is_extended_id"] = False
-            can_id = int(str_can_id, self._converted_base)
-        msg_kwargs["arbitration_id"] = can_id
+            return int(str_can_id[0:-1], self._converted_base), True
+        return int(str_can_id, self._converted_base), False
 
     @staticmethod
     def _check_base(base: str) -> int:
@@ -94,89 +97,114 @@ class ASCReader(BaseIOHandler):
             raise ValueError('base should be either "hex" or "dec"')
         return BASE_DEC if base == "dec" else BASE_HEX
 
-    def _process_data_string(
-        self, data_str: str, data_length: int, msg_kwargs: Dict[str, Any]
-    ) -> None:
-        frame = bytearray()
+    def _process_data_string(self, data_str: str, data_length: int) -> bytes:
         data = data_str.split()
-        for byte in data[:data_length]:
-            frame.append(int(byte, self._converted_base))
-        msg_kwargs["data"] = frame
+        return bytes([int(byte, self._converted_base) for byte in data[:data_length]])
 
     def _process_classic_can_frame(
-        self, line: str, msg_kwargs: Dict[str, Any]
+        self, line: str, timestamp: float, channel: Optional[int]
     ) -> Message:
 
         # CAN error frame
         if line.strip()[0:10].lower() == "errorframe":
             # Error Frame
-            msg_kwargs["is_error_frame"] = True
-        else:
-            abr_id_str, dir, rest_of_message = line.split(None, 2)
-            msg_kwargs["is_rx"] = dir == "Rx"
-            self._extract_can_id(abr_id_str, msg_kwargs)
-
-            if rest_of_message[0].lower() == "r":
-                # CAN Remote Frame
-                msg_kwargs["is_remote_frame"] = True
-                remote_data = rest_of_message.split()
-                if len(remote_data) > 1:
-                    dlc_str = remote_data[1]
-                    if dlc_str.isdigit():
-                        msg_kwargs["dlc"] = int(dlc_str, self._converted_base)
-            else:
-                # Classic CAN Message
-                try:
-                    # There is data after DLC
-                    _, dlc_str, data = rest_of_message.split(None, 2)
-                except ValueError:
-                    # No data after DLC
-                    _, dlc_str = rest_of_message.split(None, 1)
-                    data = ""
-
-                dlc = int(dlc_str, self._converted_base)
-                msg_kwargs["dlc"] = dlc
-                self._process_data_string(data, dlc, msg_kwargs)
+            return Message._from_fields(
+                timestamp, 0, True, False, True, channel, 0, b""
+            )
 
-        return Message(**msg_kwargs)
+        abr_id_str, dir, rest_of_message = line.split(None, 2)
+        can_id, is_extended_id = self._extract_can_id(abr_id_str)
+
+        if rest_of_message[0].lower() == "r":
+            # CAN Remote Frame
+            dlc = 0
+            remote_data = rest_of_message.split()
+            if len(remote_data) > 1:
+                dlc_str = remote_data[1]
+                if dlc_str.isdigit():
+                    dlc = int(dlc_str, self._converted_base)
+            return Message._from_fields(
+                timestamp,
+                can_id,
+                is_extended_id,
+                True,
+                False,
+                channel,
+                dlc,
+                b"",
+                False,
+                dir == "Rx",
+                zero_copy=self.zero_copy,
+            )
 
-    def _process_fd_can_frame(self, line: str, msg_kwargs: Dict[str, Any]) -> Message:
+        # Classic CAN Message
+        try:
+            # There is data after DLC
+            _, dlc_str, data = rest_of_message.split(None, 2)
+        except ValueError:
+            # No data after DLC
+            _, dlc_str = rest_of_message.split(None, 1)
+            data = ""
+
+        dlc = int(dlc_str, self._converted_base)
+        return Message._from_fields(
+            timestamp,
+            can_id,
+            is_extended_id,
+            False,
+            False,
+            channel,
+            dlc,
+            self._process_data_string(data, dlc),
+            False,
+            dir == "Rx",
+            zero_copy=self.zero_copy,
+        )
+
+    def _process_fd_can_frame(self, line: str, timestamp: float) -> Message:
         channel, dir, rest_of_message = line.split(None, 2)
         # See ASCWriter
-        msg_kwargs["channel"] = int(channel) - 1
-        msg_kwargs["is_rx"] = dir == "Rx"
+        channel = int(channel) - 1
+        is_rx = dir == "Rx"
 
         # CAN FD error frame
         if rest_of_message.strip()[:10].lower() == "errorframe":
             # Error Frame
             # TODO: maybe use regex to parse BRS, ESI, etc?
-            msg_kwargs["is_error_frame"] = True
-        else:
-            can_id_str, frame_name_or_brs, rest_of_message = rest_of_message.split(
-                None, 2
+            return Message._from_fields(
+                timestamp, 0, True, False, True, channel, 0, b"", True, is_rx
             )
 
-            if frame_name_or_brs.isdigit():
-                brs = frame_name_or_brs
-                esi, dlc_str, data_length_str, data = rest_of_message.split(None, 3)
-            else:
-                brs, esi, dlc_str, data_length_str, data = rest_of_message.split(
-                    None, 4
-                )
-
-            self._extract_can_id(can_id_str, msg_kwargs)
-            msg_kwargs["bitrate_switch"] = brs == "1"
-            msg_kwargs["error_state_indicator"] = esi == "1"
-            dlc = int(dlc_str, self._converted_base)
-            msg_kwargs["dlc"] = dlc
-            data_length = int(data_length_str)
-
-            # CAN remote Frame
-            msg_kwargs["is_remote_frame"] = data_length == 0
+        can_id_str, frame_name_or_brs, rest_of_message = rest_of_message.split(None, 2)
 
-            self._process_data_string(data, data_length, msg_kwargs)
-
-        return Message(**msg_kwargs)
+        if frame_name_or_brs.isdigit():
+            brs = frame_name_or_brs
+            esi, dlc_str, data_length_str, data = rest_of_message.split(None, 3)
+        else:
+            brs, esi, dlc_str, data_length_str, data = rest_of_message.split(None, 4)
+
+        can_id, is_extended_id = self._extract_can_id(can_id_str)
+        dlc = int(dlc_str, self._converted_base)
+        data_length = int(data_length_str)
+
+        # CAN remote Frame
+        is_remote_frame = data_length == 0
+
+        return Message._from_fields(
+            timestamp,
+            can_id,
+            is_extended_id,
+            is_remote_frame,
+            False,
+            channel,
+            dlc,
+            self._process_data_string(data, data_length),
+            True,
+            is_rx,
+            brs == "1",
+            esi == "1",
+            zero_copy=self.zero_copy,
+        )
 
     def __iter__(self) -> Generator[Message, None, None]:
         # This is guaranteed to not be None since we raise ValueError in __init__
@@ -188,29 +216,21 @@ class ASCReader(BaseIOHandler):
             if not temp or not temp[0].isdigit():
                 # Could be a comment
                 continue
-            msg_kwargs = {}
             try:
                 timestamp, channel, rest_of_message = temp.split(None, 2)
                 timestamp = float(timestamp)
-                msg_kwargs["timestamp"] = timestamp
-                if channel == "CANFD":
-                    msg_kwargs["is_fd"] = True
-                elif channel.isdigit():
-                    # See ASCWriter
-                    msg_kwargs["channel"] = int(channel) - 1
-                else:
-                    # Not a CAN message. Possible values include "statistic", J1939TP
-                    continue
             except ValueError:
                 # Some other unprocessed or unknown format
                 continue
 
-            if "is_fd" not in msg_kwargs:
-                msg = self._process_classic_can_frame(rest_of_message, msg_kwargs)
-            else:
-                msg = self._process_fd_can_frame(rest_of_message, msg_kwargs)
-            if msg is not None:
-                yield msg
+            if channel == "CANFD":
+                yield self._process_fd_can_frame(rest_of_message, timestamp)
+            elif channel.isdigit():
+                # See ASCWriter
+                yield self._process_classic_can_frame(
+                    rest_of_message, timestamp, int(channel) - 1
+                )
+            # else not a CAN message. Possible values include "statistic", J1939TP
 
         self.stop()
 
@@ -224,6 +244,8 @@ class ASCWriter(BaseIOHandler, Listener):
     It the first message does not have a timestamp, it is set to zero.
     """
 
+    retains_messages = False
+
     FORMAT_MESSAGE = "{channel}  {id:<15} {dir:<4} {dtype} {data}"
     FORMAT_MESSAGE_FD = " ".join(
         [
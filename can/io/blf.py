@@ -138,13 +138,16 @@ class BLFReader(BaseIOHandler):
     silently ignored.
     """
 
-    def __init__(self, file):
+    def __init__(self, file, zero_copy=False):
         """
         :param file: a path-like object or as file-like object to read from
                      If this is a file-like object, is has to opened in binary
                      read mode, not text read mode.
+        :param bool zero_copy: leave the data of the messages as :class:`bytes`,
+                               see :meth:`can.Message.writable_data`
         """
         super().__init__(file, mode="rb")
+        self.zero_copy = zero_copy
         data = self.file.read(FILE_HEADER_STRUCT.size)
         header = FILE_HEADER_STRUCT.unpack(data)
         if header[0] != b"LOGG":
@@ -212,6 +215,8 @@ class BLFReader(BaseIOHandler):
         unpack_can_fd_64_msg = CAN_FD_MSG_64_STRUCT.unpack_from
         can_fd_64_msg_size = CAN_FD_MSG_64_STRUCT.size
         unpack_can_error_ext = CAN_ERROR_EXT_STRUCT.unpack_from
+        from_fields = Message._from_fields
+        zero_copy = self.zero_copy
 
         start_timestamp = self.start_timestamp
         max_pos = len(data)
@@ -259,15 +264,19 @@ class BLFReader(BaseIOHandler):
 
             if obj_type == CAN_MESSAGE or obj_type == CAN_MESSAGE2:
                 channel, flags, dlc, can_id, can_data = unpack_can_msg(data, pos)
-                yield Message(
-                    timestamp=timestamp,
-                    arbitration_id=can_id & 0x1FFFFFFF,
-                    is_extended_id=bool(can_id & CAN_MSG_EXT),
-                    is_remote_frame=bool(flags & REMOTE_FLAG),
-                    is_rx=not bool(flags & DIR),
-                    dlc=dlc,
-                    data=can_data[:dlc],
-                    channel=channel - 1,
+                is_remote_frame = bool(flags & REMOTE_FLAG)
+                yield from_fields(
+                    timestamp,
+                    can_id & 0x1FFFFFFF,
+                    bool(can_id & CAN_MSG_EXT),
+                    is_remote_frame,
+                    False,
+                    channel - 1,
+                    dlc,
+                    b"" if is_remote_frame else can_data[:dlc],
+                    False,
+                    not bool(flags & DIR),
+                    zero_copy=zero_copy,
                 )
             elif obj_type == CAN_ERROR_EXT:
                 members = unpack_can_error_ext(data, pos)
@@ -275,14 +284,16 @@ class BLFReader(BaseIOHandler):
                 dlc = members[5]
                 can_id = members[7]
                 can_data = members[9]
-                yield Message(
-                    timestamp=timestamp,
-                    is_error_frame=True,
-                    is_extended_id=bool(can_id & CAN_MSG_EXT),
-                    arbitration_id=can_id & 0x1FFFFFFF,
-                    dlc=dlc,
-                    data=can_data[:dlc],
-                    channel=channel - 1,
+                yield from_fields(
+                    timestamp,
+                    can_id & 0x1FFFFFFF,
+                    bool(can_id & CAN_MSG_EXT),
+                    False,
+                    True,
+                    channel - 1,
+                    dlc,
+                    can_data[:dlc],
+                    zero_copy=zero_copy,
                 )
             elif obj_type == CAN_FD_MESSAGE:
                 members = unpack_can_fd_msg(data, pos)
@@ -297,34 +308,41 @@ class BLFReader(BaseIOHandler):
                     valid_bytes,
                     can_data,
                 ) = members
-                yield Message(
-                    timestamp=timestamp,
-                    arbitration_id=can_id & 0x1FFFFFFF,
-                    is_extended_id=bool(can_id & CAN_MSG_EXT),
-                    is_remote_frame=bool(flags & REMOTE_FLAG),
-                    is_fd=bool(fd_flags & 0x1),
-                    is_rx=not bool(flags & DIR),
-                    bitrate_switch=bool(fd_flags & 0x2),
-                    error_state_indicator=bool(fd_flags & 0x4),
-                    dlc=dlc2len(dlc),
-                    data=can_data[:valid_bytes],
-                    channel=channel - 1,
+                is_remote_frame = bool(flags & REMOTE_FLAG)
+                yield from_fields(
+                    timestamp,
+                    can_id & 0x1FFFFFFF,
+                    bool(can_id & CAN_MSG_EXT),
+                    is_remote_frame,
+                    False,
+                    channel - 1,
+                    dlc2len(dlc),
+                    b"" if is_remote_frame else can_data[:valid_bytes],
+                    bool(fd_flags & 0x1),
+                    not bool(flags & DIR),
+                    bool(fd_flags & 0x2),
+                    bool(fd_flags & 0x4),
+                    zero_copy=zero_copy,
                 )
             elif obj_type == CAN_FD_MESSAGE_64:
                 members = unpack_can_fd_64_msg(data, pos)[:7]
                 channel, dlc, valid_bytes, _, can_id, _, fd_flags = members
                 pos += can_fd_64_msg_size
-                yield Message(
-                    timestamp=timestamp,
-                    arbitration_id=can_id & 0x1FFFFFFF,
-                    is_extended_id=bool(can_id & CAN_MSG_EXT),
-                    is_remote_frame=bool(fd_flags & 0x0010),
-                    is_fd=bool(fd_flags & 0x1000),
-                    bitrate_switch=bool(fd_flags & 0x2000),
-                    error_state_indicator=bool(fd_flags & 0x4000),
-                    dlc=dlc2len(dlc),
-                    data=data[pos : pos + valid_bytes],
-                    channel=channel - 1,
+                is_remote_frame = bool(fd_flags & 0x0010)
+                yield from_fields(
+                    timestamp,
+                    can_id & 0x1FFFFFFF,
+                    bool(can_id & CAN_MSG_EXT),
+                    is_remote_frame,
+                    False,
+                    channel - 1,
+                    dlc2len(dlc),
+                    b"" if is_remote_frame else data[pos : pos + valid_bytes],
+                    bool(fd_flags & 0x1000),
+                    True,
+                    bool(fd_flags & 0x2000),
+                    bool(fd_flags & 0x4000),
+                    zero_copy=zero_copy,
                 )
 
             pos = next_pos
@@ -335,6 +353,8 @@ class BLFWriter(BaseIOHandler, Listener):
     Logs CAN data to a Binary Logging File compatible with Vector's tools.
     """
 
+    retains_messages = False
+
     #: Max log container size of uncompressed data
     max_container_size = 128 * 1024
 
@@ -29,13 +29,16 @@ class CanutilsLogReader(BaseIOHandler):
         ``(0.0) vcan0 001#8d00100100820100``
     """
 
-    def __init__(self, file):
+    def __init__(self, file, zero_copy=False):
         """
         :param file: a path-like object or as file-like object to read from
                      If this is a file-like object, is has to opened in text
                      read mode, not binary read mode.
+        :param bool zero_copy: leave the data of the messages as :class:`bytes`,
+                               see :meth:`can.Message.writable_data`
         """
         super().__init__(file, mode="r")
+        self.zero_copy = zero_copy
 
     def __iter__(self):
         for line in self.file:
@@ -62,26 +65,28 @@ class CanutilsLogReader(BaseIOHandler):
                 else:
                     dlc = 0
 
-                dataBin = None
+                dataBin = b""
             else:
                 isRemoteFrame = False
 
                 dlc = len(data) // 2
-                dataBin = bytearray()
-                for i in range(0, len(data), 2):
-                    dataBin.append(int(data[i : (i + 2)], 16))
+                dataBin = bytes.fromhex(data)
 
             if canId & CAN_ERR_FLAG and canId & CAN_ERR_BUSERROR:
-                msg = Message(timestamp=timestamp, is_error_frame=True)
+                msg = Message._from_fields(
+                    timestamp, 0, True, False, True, None, 0, b""
+                )
             else:
-                msg = Message(
-                    timestamp=timestamp,
-                    arbitration_id=canId & 0x1FFFFFFF,
-                    is_extended_id=isExtended,
-                    is_remote_frame=isRemoteFrame,
-                    dlc=dlc,
-                    data=dataBin,
-                    channel=channel,
+                msg = Message._from_fields(
+                    timestamp,
+                    canId & 0x1FFFFFFF,
+                    isExtended,
+                    isRemoteFrame,
+                    False,
+                    channel,
+                    dlc,
+                    dataBin,
+                    zero_copy=self.zero_copy,
                 )
             yield msg
 
@@ -97,6 +102,8 @@ class CanutilsLogWriter(BaseIOHandler, Listener):
     It the first message does not have a timestamp, it is set to zero.
     """
 
+    retains_messages = False
+
     def __init__(self, file, channel="vcan0", append=False):
         """
         :param file: a path-like object or as file-like object to write to
@@ -37,6 +37,8 @@ class CSVWriter(BaseIOHandler, Listener):
     Each line is terminated with a platform specific line separator.
     """
 
+    retains_messages = False
+
     def __init__(self, file, append=False):
         """
         :param file: a path-like object or a file-like object to write to.
@@ -127,3 +127,59 @@ class MessageSync:  # pylint: disable=too-few-public-methods
             sleep(sleep_period)
 
             yield message
+
+    def batches(
+        self, max_messages: int = 256, window: float = 0.0
+    ) -> typing.Generator[typing.List["can.Message"], None, None]:
+        """Iterate over lists of messages that are due at the same time, to
+        be sent with :meth:`can.BusABC.send_batch`.
+
+        The first message of every batch is delayed like when iterating over
+        the instance, the following messages join it as long as they are due
+        within `window` seconds, which is always the case when the playback
+        has fallen behind the recording. Without timestamps every batch holds
+        a single message.
+
+        :param max_messages: the largest number of messages in a batch
+        :param window: seconds a message may be sent earlier than recorded
+        """
+        playback_start_time = time()
+        recorded_start_time = None
+        batch: typing.List["can.Message"] = []
+
+        for message in self.raw_messages:
+
+            # Work out the correct wait time
+            if self.timestamps:
+                if recorded_start_time is None:
+                    recorded_start_time = message.timestamp
+
+                now = time()
+                current_offset = now - playback_start_time
+                recorded_offset_from_start = message.timestamp - recorded_start_time
+                remaining_gap = max(0.0, recorded_offset_from_start - current_offset)
+
+                if batch and len(batch) < max_messages and remaining_gap <= window:
+                    batch.append(message)
+                    continue
+
+                sleep_period = max(self.gap, min(self.skip, remaining_gap))
+            else:
+                sleep_period = self.gap
+
+            if batch:
+                yield batch
+                if self.timestamps:
+                    # sending the batch took some of the time to wait
+                    current_offset = time() - playback_start_time
+                    remaining_gap = max(
+                        0.0, recorded_offset_from_start - current_offset
+                    )
+                    sleep_period = max(self.gap, min(self.skip, remaining_gap))
+
+            sleep(sleep_period)
+
+            batch = [message]
+
+        if batch:
+            yield batch
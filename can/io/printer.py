@@ -20,6 +20,8 @@ class Printer(BaseIOHandler, Listener):
                               standard out
     """
 
+    retains_messages = False
+
     def __init__(self, file=None, append=False):
         """
         :param file: an optional path-like object or as file-like object to "print"
@@ -2,10 +2,14 @@
 This module contains the implementation of `can.Listener` and some readers.
 """
 
-from typing import AsyncIterator, Awaitable, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, List, Optional, Union
 
 from can.message import Message
 from can.bus import BusABC
+from can.metrics import ReaderMetrics
+
+if TYPE_CHECKING:
+    from can.shaping import TransmitShaper
 
 from abc import ABCMeta, abstractmethod
 
@@ -33,8 +37,15 @@ class Listener(metaclass=ABCMeta):
 
         # Important to ensure all outputs are flushed
         listener.stop()
+
+    :attr bool retains_messages: whether the listener keeps references to
+                                 messages after :meth:`on_message_received`
+                                 returned; a :class:`~can.Notifier` only
+                                 recycles pooled messages if no listener does
     """
 
+    retains_messages = True
+
     @abstractmethod
     def on_message_received(self, msg: Message):
         """This method is called to handle the given message.
@@ -43,6 +54,19 @@ class Listener(metaclass=ABCMeta):
 
         """
 
+    def on_messages_received(self, msgs: List[Message]):
+        """This method is called to handle a batch of messages, e.g. the
+        result of :meth:`can.BusABC.recv_batch`.
+
+        The default passes every message to :meth:`on_message_received`,
+        listeners that can handle many messages more efficiently at once
+        may override it.
+
+        :param msgs: the delivered messages, oldest first
+        """
+        for msg in msgs:
+            self.on_message_received(msg)
+
     def __call__(self, msg: Message):
         self.on_message_received(msg)
 
@@ -65,14 +89,23 @@ class RedirectReader(Listener):
     """
     A RedirectReader sends all received messages to another Bus.
 
+    Batches delivered by a :class:`~can.Notifier` with a ``batch_size`` are
+    forwarded with a single call to :meth:`~can.BusABC.send_batch`.
+
+    To keep a gateway from overloading the other bus, pass a
+    :class:`~can.TransmitShaper` of that bus instead of the bus itself.
+
     """
 
-    def __init__(self, bus: BusABC):
+    def __init__(self, bus: Union[BusABC, "TransmitShaper"]):
         self.bus = bus
 
     def on_message_received(self, msg: Message):
         self.bus.send(msg)
 
+    def on_messages_received(self, msgs: List[Message]):
+        self.bus.send_batch(msgs)
+
 
 class BufferedReader(Listener):
     """
@@ -88,6 +121,10 @@ class BufferedReader(Listener):
     :attr bool is_stopped: ``True`` if the reader has been stopped
     """
 
+    #: The :class:`~can.metrics.ReaderMetrics` counting for this reader,
+    #: set by :meth:`can.MetricsRegistry.instrument`
+    metrics: Optional[ReaderMetrics] = None
+
     def __init__(self):
         # set to "infinite" size
         self.buffer = SimpleQueue()
@@ -114,10 +151,16 @@ class BufferedReader(Listener):
         :param timeout: The number of seconds to wait for a new message.
         :return: the Message if there is one, or None if there is not.
         """
+        metrics = self.metrics
         try:
-            return self.buffer.get(block=not self.is_stopped, timeout=timeout)
+            msg = self.buffer.get(block=not self.is_stopped, timeout=timeout)
         except Empty:
+            if metrics is not None:
+                metrics.add(ReaderMetrics.GET_TIMEOUTS)
             return None
+        if metrics is not None:
+            metrics.add(ReaderMetrics.MESSAGES_RETRIEVED)
+        return msg
 
     def stop(self):
         """Prohibits any more additions to this reader.
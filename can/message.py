@@ -106,6 +106,49 @@ class Message:
         if check:
             self._check()
 
+    @classmethod
+    def _from_fields(
+        cls,
+        timestamp: float,
+        arbitration_id: int,
+        is_extended_id: bool,
+        is_remote_frame: bool,
+        is_error_frame: bool,
+        channel: Optional[typechecking.Channel],
+        dlc: int,
+        data: typechecking.CanData,
+        is_fd: bool = False,
+        is_rx: bool = True,
+        bitrate_switch: bool = False,
+        error_state_indicator: bool = False,
+        zero_copy: bool = False,
+    ) -> "Message":
+        """
+        Create a message from positional fields, skipping all conversions
+        and checks of the constructor. Meant for backends and log readers,
+        which already have correct values.
+
+        `data` must be a :class:`bytes`, :class:`bytearray` or, with
+        `zero_copy`, a :class:`memoryview`, and empty for remote frames.
+
+        :param zero_copy: keep `data` as it is instead of copying it into a
+                          new :class:`bytearray`, see :meth:`writable_data`
+        """
+        msg = object.__new__(cls)
+        msg.timestamp = timestamp
+        msg.arbitration_id = arbitration_id
+        msg.is_extended_id = is_extended_id
+        msg.is_remote_frame = is_remote_frame
+        msg.is_error_frame = is_error_frame
+        msg.channel = channel
+        msg.dlc = dlc
+        msg.data = data if zero_copy else bytearray(data)
+        msg.is_fd = is_fd
+        msg.is_rx = is_rx
+        msg.bitrate_switch = bitrate_switch
+        msg.error_state_indicator = error_state_indicator
+        return msg
+
     def __str__(self) -> str:
         field_strings = ["Timestamp: {0:>15.6f}".format(self.timestamp)]
         if self.is_extended_id:
@@ -138,8 +181,9 @@ class Message:
         else:
             field_strings.append(" " * 24)
 
-        if (self.data is not None) and (self.data.isalnum()):
-            field_strings.append("'{}'".format(self.data.decode("utf-8", "replace")))
+        data = bytes(self.data) if self.data is not None else None
+        if (data is not None) and (data.isalnum()):
+            field_strings.append("'{}'".format(data.decode("utf-8", "replace")))
 
         if self.channel is not None:
             try:
@@ -194,6 +238,33 @@ class Message:
     def __bytes__(self) -> bytes:
         return bytes(self.data)
 
+    def writable_data(self) -> bytearray:
+        """
+        Get the data for modification, the only safe way to change the
+        data of a received message in place.
+
+        Buses and log readers opened with ``zero_copy=True`` leave the data
+        of their messages as immutable :class:`bytes` or a
+        :class:`memoryview`, so ``msg.data[0] = 0xFF`` raises a
+        :class:`TypeError`. The data is copied into a :class:`bytearray` on
+        the first call, which then replaces :attr:`data`::
+
+            msg.writable_data()[0] = 0xFF
+
+        :return: :attr:`data`, always a :class:`bytearray`
+        """
+        data = self.data
+        if not isinstance(data, bytearray):
+            data = self.data = bytearray(data)
+        return data
+
+    def release(self) -> None:
+        """
+        Hand the message back to the :class:`~can.MessagePool` it came from.
+        Does nothing for messages that do not belong to a pool, so listeners
+        may call it on every message they are done with.
+        """
+
     def __copy__(self) -> "Message":
         new = Message(
             timestamp=self.timestamp,
@@ -220,7 +291,9 @@ class Message:
             is_error_frame=self.is_error_frame,
             channel=deepcopy(self.channel, memo),
             dlc=self.dlc,
-            data=deepcopy(self.data, memo),
+            data=bytes(self.data)
+            if isinstance(self.data, memoryview)
+            else deepcopy(self.data, memo),
             is_fd=self.is_fd,
             is_rx=self.is_rx,
             bitrate_switch=self.bitrate_switch,
@@ -0,0 +1,390 @@
+"""
+This module contains :class:`can.MessageBatch`, a columnar container for
+many messages.
+
+Every attribute of the messages is kept in one array per column instead of
+one :class:`can.Message` object per frame. With NumPy the columns are NumPy
+arrays and slicing returns views, without NumPy they are :class:`array.array`
+objects and slicing copies.
+"""
+
+from array import array
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+
+from . import typechecking
+from .message import Message
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#: Bits of the :attr:`MessageBatch.flags` column
+FLAG_EXTENDED_ID = 0x01
+FLAG_REMOTE_FRAME = 0x02
+FLAG_ERROR_FRAME = 0x04
+FLAG_FD = 0x08
+FLAG_RX = 0x10
+FLAG_BITRATE_SWITCH = 0x20
+FLAG_ERROR_STATE_INDICATOR = 0x40
+
+_FLAGS = (
+    ("is_extended_id", FLAG_EXTENDED_ID),
+    ("is_remote_frame", FLAG_REMOTE_FRAME),
+    ("is_error_frame", FLAG_ERROR_FRAME),
+    ("is_fd", FLAG_FD),
+    ("is_rx", FLAG_RX),
+    ("bitrate_switch", FLAG_BITRATE_SWITCH),
+    ("error_state_indicator", FLAG_ERROR_STATE_INDICATOR),
+)
+
+# typecodes of the columns without NumPy
+_TYPECODES = {
+    "timestamp": "d",
+    "arbitration_id": "L",
+    "flags": "B",
+    "dlc": "B",
+    "channel_index": "H",
+}
+
+
+class MessageBatch:
+    """
+    Many messages as a structure of arrays.
+
+    :attr timestamp: the timestamps (float64)
+    :attr arbitration_id: the arbitration ids (uint32)
+    :attr flags: the boolean attributes as bits, see the ``FLAG_*`` constants (uint8)
+    :attr dlc: the data lengths (uint8)
+    :attr channel_index: for every message the position of its channel in
+                         :attr:`channels` (uint16)
+    :attr list channels: the distinct channels of the messages
+    :attr data: the payloads, shape ``(n, width)`` with NumPy or a flat array
+                of ``n * width`` bytes without; bytes beyond the dlc are zero
+    :attr int width: the maximum payload length, 8 or 64 by default
+
+    Indexing with an integer returns a :class:`can.Message`, indexing with a
+    slice or a boolean mask returns another batch::
+
+        batch = can.MessageBatch.from_messages(can.LogReader("trace.asc"))
+        engine = batch[batch.arbitration_id == 0x0CF00400]
+        for msg in engine[:10]:
+            print(msg)
+    """
+
+    __slots__ = (
+        "timestamp",
+        "arbitration_id",
+        "flags",
+        "dlc",
+        "channel_index",
+        "channels",
+        "data",
+        "width",
+    )
+
+    def __init__(
+        self,
+        timestamp,
+        arbitration_id,
+        flags,
+        dlc,
+        channel_index,
+        channels: List[Optional[typechecking.Channel]],
+        data,
+        width: int,
+    ):
+        """
+        Wrap existing columns, see :meth:`from_messages` and :meth:`empty` to
+        create a batch.
+
+        :raises ValueError: if the columns have different lengths
+        """
+        self.timestamp = timestamp
+        self.arbitration_id = arbitration_id
+        self.flags = flags
+        self.dlc = dlc
+        self.channel_index = channel_index
+        self.channels = channels
+        self.data = data
+        self.width = width
+        count = len(timestamp)
+        if not (
+            len(arbitration_id) == len(flags) == len(dlc) == len(channel_index) == count
+        ) or len(data) != (count if numpy is not None else count * width):
+            raise ValueError("all columns must have the same length")
+
+    @classmethod
+    def empty(cls, count: int = 0, width: int = 8) -> "MessageBatch":
+        """
+        :return: a batch of `count` zeroed messages
+        """
+        if numpy is not None:
+            return cls(
+                numpy.zeros(count, numpy.float64),
+                numpy.zeros(count, numpy.uint32),
+                numpy.zeros(count, numpy.uint8),
+                numpy.zeros(count, numpy.uint8),
+                numpy.zeros(count, numpy.uint16),
+                [None],
+                numpy.zeros((count, width), numpy.uint8),
+                width,
+            )
+        columns = [
+            array(code, bytes(array(code).itemsize * count))
+            for code in _TYPECODES.values()
+        ]
+        return cls(*columns, [None], array("B", bytes(count * width)), width)
+
+    @classmethod
+    def from_messages(
+        cls, msgs: Iterable[Message], width: Optional[int] = None
+    ) -> "MessageBatch":
+        """
+        Collect messages into a batch.
+
+        :param msgs: any iterable of messages, e.g. a :class:`can.LogReader`
+        :param width: the payload width, by default 8 or 64 if any message
+                      carries more than 8 bytes; longer payloads are cut off
+        """
+        msgs = msgs if isinstance(msgs, (list, tuple)) else list(msgs)
+        if width is None:
+            width = 64 if any(len(msg.data) > 8 for msg in msgs) else 8
+        batch = cls.empty(len(msgs), width)
+        channels = {}
+        flags = [sum(bit for name, bit in _FLAGS if getattr(msg, name)) for msg in msgs]
+        indices = [channels.setdefault(msg.channel, len(channels)) for msg in msgs]
+        if numpy is not None:
+            batch.timestamp[:] = [msg.timestamp for msg in msgs]
+            batch.arbitration_id[:] = [msg.arbitration_id for msg in msgs]
+            batch.dlc[:] = [msg.dlc for msg in msgs]
+            batch.flags[:] = flags
+            batch.channel_index[:] = indices
+            payload = b"".join(
+                bytes(msg.data[:width]).ljust(width, b"\x00") for msg in msgs
+            )
+            batch.data[:] = numpy.frombuffer(payload, numpy.uint8).reshape(-1, width)
+        else:
+            batch.timestamp = array("d", [msg.timestamp for msg in msgs])
+            batch.arbitration_id = array("L", [msg.arbitration_id for msg in msgs])
+            batch.dlc = array("B", [msg.dlc for msg in msgs])
+            batch.flags = array("B", flags)
+            batch.channel_index = array("H", indices)
+            batch.data = array(
+                "B",
+                b"".join(bytes(msg.data[:width]).ljust(width, b"\x00") for msg in msgs),
+            )
+        batch.channels = list(channels) or [None]
+        return batch
+
+    @classmethod
+    def concatenate(cls, batches: Sequence["MessageBatch"]) -> "MessageBatch":
+        """
+        Join several batches into one, the payload width is the widest one.
+        """
+        if not batches:
+            return cls.empty()
+        width = max(batch.width for batch in batches)
+        channels: List[Optional[typechecking.Channel]] = []
+        lookup = {}
+        remapped = []
+        for batch in batches:
+            mapping = [
+                lookup.setdefault(channel, len(lookup)) for channel in batch.channels
+            ]
+            remapped.append([mapping[i] for i in batch.channel_index])
+        channels = list(lookup)
+        if numpy is not None:
+            data = numpy.zeros((sum(len(b) for b in batches), width), numpy.uint8)
+            row = 0
+            for batch in batches:
+                data[row : row + len(batch), : batch.width] = batch.data
+                row += len(batch)
+            return cls(
+                numpy.concatenate([b.timestamp for b in batches]),
+                numpy.concatenate([b.arbitration_id for b in batches]),
+                numpy.concatenate([b.flags for b in batches]),
+                numpy.concatenate([b.dlc for b in batches]),
+                numpy.array(sum(remapped, []), numpy.uint16),
+                channels,
+                data,
+                width,
+            )
+        data = array("B")
+        for batch in batches:
+            if batch.width == width:
+                data.extend(batch.data)
+            else:
+                padding = bytes(width - batch.width)
+                for i in range(len(batch)):
+                    data.extend(batch.data[i * batch.width : (i + 1) * batch.width])
+                    data.frombytes(padding)
+        columns = [
+            sum((getattr(b, name) for b in batches), array(code))
+            for name, code in _TYPECODES.items()
+            if name != "channel_index"
+        ]
+        timestamp, arbitration_id, flags, dlc = columns
+        return cls(
+            timestamp,
+            arbitration_id,
+            flags,
+            dlc,
+            array("H", sum(remapped, [])),
+            channels,
+            data,
+            width,
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __repr__(self) -> str:
+        return "MessageBatch({} messages, width={})".format(len(self), self.width)
+
+    def _flag(self, bit: int):
+        if numpy is not None:
+            return (self.flags & bit) != 0
+        return [bool(flags & bit) for flags in self.flags]
+
+    @property
+    def is_extended_id(self):
+        """Booleans for the extended id flag."""
+        return self._flag(FLAG_EXTENDED_ID)
+
+    @property
+    def is_remote_frame(self):
+        """Booleans for the remote frame flag."""
+        return self._flag(FLAG_REMOTE_FRAME)
+
+    @property
+    def is_error_frame(self):
+        """Booleans for the error frame flag."""
+        return self._flag(FLAG_ERROR_FRAME)
+
+    @property
+    def is_fd(self):
+        """Booleans for the CAN FD flag."""
+        return self._flag(FLAG_FD)
+
+    @property
+    def is_rx(self):
+        """Booleans for the received flag."""
+        return self._flag(FLAG_RX)
+
+    @property
+    def channel(self):
+        """The channel of every message."""
+        if numpy is not None:
+            channels = numpy.empty(len(self.channels), dtype=object)
+            channels[:] = self.channels
+            return channels[self.channel_index]
+        return [self.channels[i] for i in self.channel_index]
+
+    def payload(self, index: int) -> bytes:
+        """
+        :return: the data of one message, cut to its dlc
+        """
+        if self.flags[index] & FLAG_REMOTE_FRAME:
+            return b""
+        length = min(self.dlc[index], self.width)
+        if numpy is not None:
+            return self.data[index, :length].tobytes()
+        start = index * self.width
+        return self.data[start : start + length].tobytes()
+
+    def message(self, index: int) -> Message:
+        """
+        :return: the message at `index` as a :class:`can.Message`
+        """
+        flags = int(self.flags[index])
+        return Message(
+            timestamp=float(self.timestamp[index]),
+            arbitration_id=int(self.arbitration_id[index]),
+            is_extended_id=bool(flags & FLAG_EXTENDED_ID),
+            is_remote_frame=bool(flags & FLAG_REMOTE_FRAME),
+            is_error_frame=bool(flags & FLAG_ERROR_FRAME),
+            channel=self.channels[self.channel_index[index]],
+            dlc=int(self.dlc[index]),
+            data=self.payload(index),
+            is_fd=bool(flags & FLAG_FD),
+            is_rx=bool(flags & FLAG_RX),
+            bitrate_switch=bool(flags & FLAG_BITRATE_SWITCH),
+            error_state_indicator=bool(flags & FLAG_ERROR_STATE_INDICATOR),
+        )
+
+    def __iter__(self) -> Iterator[Message]:
+        return (self.message(i) for i in range(len(self)))
+
+    def to_messages(self) -> List[Message]:
+        """
+        :return: all messages as :class:`can.Message` objects
+        """
+        return list(self)
+
+    def __getitem__(self, key) -> Union[Message, "MessageBatch"]:
+        """
+        :param key: an integer for a single :class:`can.Message`, or a slice,
+                    a boolean mask or a sequence of indices for a batch
+        """
+        if isinstance(key, int) or (
+            numpy is not None and isinstance(key, numpy.integer)
+        ):
+            if key < 0:
+                key += len(self)
+            if not 0 <= key < len(self):
+                raise IndexError("message index out of range")
+            return self.message(key)
+        if numpy is not None:
+            if not isinstance(key, slice):
+                key = numpy.asarray(key)
+            return MessageBatch(
+                self.timestamp[key],
+                self.arbitration_id[key],
+                self.flags[key],
+                self.dlc[key],
+                self.channel_index[key],
+                self.channels,
+                self.data[key],
+                self.width,
+            )
+        return self._take(key)
+
+    def _take(self, key) -> "MessageBatch":
+        if isinstance(key, slice):
+            rows = range(len(self))[key]
+            if rows.step == 1:
+                data = self.data[rows.start * self.width : rows.stop * self.width]
+            else:
+                data = self._rows(rows)
+            return MessageBatch(
+                self.timestamp[key],
+                self.arbitration_id[key],
+                self.flags[key],
+                self.dlc[key],
+                self.channel_index[key],
+                self.channels,
+                data,
+                self.width,
+            )
+        key = list(key)
+        if len(key) == len(self) and all(isinstance(k, bool) for k in key):
+            rows = [i for i, selected in enumerate(key) if selected]
+        else:
+            rows = key
+        return MessageBatch(
+            *[
+                array(code, [getattr(self, name)[i] for i in rows])
+                for name, code in _TYPECODES.items()
+            ],
+            self.channels,
+            self._rows(rows),
+            self.width,
+        )
+
+    def _rows(self, rows) -> array:
+        width = self.width
+        data = array("B")
+        for i in rows:
+            data.extend(self.data[i * width : (i + 1) * width])
+        return data
@@ -0,0 +1,130 @@
+"""
+This module contains :class:`can.MessagePool`, a free list of messages for
+receiving without allocating a new :class:`can.Message` per frame.
+
+Buses with a pool hand out :class:`PooledMessage` objects. Once a message is
+not needed anymore, :meth:`~can.Message.release` puts it back into the pool
+and a later frame is decoded into the same object and payload buffer. A
+message must not be used after it was released, keep a :func:`~copy.copy`
+instead.
+"""
+
+import threading
+from typing import List, Optional
+
+from . import typechecking
+from .message import Message
+
+
+class PooledMessage(Message):
+    """
+    A :class:`can.Message` that belongs to a :class:`MessagePool`.
+
+    Its :attr:`~can.Message.data` is always a :class:`bytearray` that is
+    reused for later frames.
+    """
+
+    __slots__ = ("_pool", "_released")
+
+    def release(self) -> None:
+        """
+        Put the message back into its pool. Releasing it again before it was
+        handed out another time does nothing.
+        """
+        self._pool.release(self)
+
+
+class MessagePool:
+    """
+    A free list of :class:`PooledMessage` objects.
+
+    A pool is opt-in per bus::
+
+        bus.message_pool = can.MessagePool()
+        msg = bus.recv()
+        process(msg)
+        msg.release()
+
+    or for all buses of a :class:`can.Notifier`, which also releases every
+    message after it was dispatched if no listener retains messages, see
+    :attr:`can.Listener.retains_messages`. Buses in several threads may share
+    a pool.
+
+    :attr int created: the number of messages the pool allocated so far
+    """
+
+    def __init__(self, size: int = 1024):
+        """
+        :param size: the largest number of free messages to keep, messages
+                     released to a full pool are left to the garbage collector
+        """
+        self.size = size
+        self.created = 0
+        self._free: List[PooledMessage] = []
+        # guards the free list, the counter and the released flags
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """The number of free messages."""
+        return len(self._free)
+
+    def acquire(
+        self,
+        timestamp: float,
+        arbitration_id: int,
+        is_extended_id: bool,
+        is_remote_frame: bool,
+        is_error_frame: bool,
+        channel: Optional[typechecking.Channel],
+        dlc: int,
+        data: typechecking.CanData,
+        is_fd: bool = False,
+        is_rx: bool = True,
+        bitrate_switch: bool = False,
+        error_state_indicator: bool = False,
+        zero_copy: bool = False,
+    ) -> PooledMessage:
+        """
+        Take a free message or create one, with the fields in the order of
+        :meth:`can.Message._from_fields`. The payload is always copied into
+        the buffer of the message, ignoring `zero_copy`, so `data` may be a
+        view of a receive buffer that is reused afterwards.
+        """
+        with self._lock:
+            if self._free:
+                msg = self._free.pop()
+                msg._released = False
+            else:
+                msg = None
+                self.created += 1
+        if msg is None:
+            msg = object.__new__(PooledMessage)
+            msg._pool = self
+            msg._released = False
+            msg.data = bytearray(data)
+        else:
+            msg.writable_data()[:] = data
+        msg.timestamp = timestamp
+        msg.arbitration_id = arbitration_id
+        msg.is_extended_id = is_extended_id
+        msg.is_remote_frame = is_remote_frame
+        msg.is_error_frame = is_error_frame
+        msg.channel = channel
+        msg.dlc = dlc
+        msg.is_fd = is_fd
+        msg.is_rx = is_rx
+        msg.bitrate_switch = bitrate_switch
+        msg.error_state_indicator = error_state_indicator
+        return msg
+
+    def release(self, msg: PooledMessage) -> None:
+        """
+        Put a message back into the pool, usually called through
+        :meth:`PooledMessage.release`.
+        """
+        with self._lock:
+            if msg._released:
+                return
+            msg._released = True
+            if len(self._free) < self.size:
+                self._free.append(msg)
@@ -0,0 +1,583 @@
+"""
+This module contains the opt-in instrumentation of buses, notifiers and
+buffered readers, and its export in the Prometheus text format.
+
+Nothing is counted until an object is added to a :class:`MetricsRegistry`,
+so uninstrumented objects only pay for a check of their ``metrics``
+attribute. Every thread counts into its own shard of a :class:`MetricSet`,
+which needs no locks, and a snapshot adds the shards up. Latencies go into
+histograms with logarithmic buckets of 16 linear sub-buckets each, like HDR
+histograms, which keeps their relative error below 7% over the whole range.
+"""
+
+import http.server
+import os
+import threading
+from bisect import bisect_right
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+#: The bits of a value kept below the highest one when picking its bucket
+SUB_BUCKET_BITS = 4
+#: Enough buckets for any duration of up to 2**63 nanoseconds
+BUCKETS = (64 - SUB_BUCKET_BITS + 1) << SUB_BUCKET_BITS
+
+#: The upper bounds in seconds of the exported Prometheus histogram buckets
+DEFAULT_EXPORT_BUCKETS = (
+    1e-6,
+    2.5e-6,
+    5e-6,
+    1e-5,
+    2.5e-5,
+    5e-5,
+    1e-4,
+    2.5e-4,
+    5e-4,
+    1e-3,
+    2.5e-3,
+    5e-3,
+    1e-2,
+    2.5e-2,
+    5e-2,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+
+def _bucket_bounds(index: int) -> Tuple[int, int]:
+    """
+    :return: the lowest value and one past the highest value in nanoseconds
+             that go into the bucket
+    """
+    if index < 2 << SUB_BUCKET_BITS:
+        return index, index + 1
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = (index & ((1 << SUB_BUCKET_BITS) - 1)) | (1 << SUB_BUCKET_BITS)
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+#: The upper bounds of the buckets in seconds, for a binary search
+_UPPER_BOUNDS = [_bucket_bounds(index)[1] * 1e-9 for index in range(BUCKETS)]
+
+
+class _Histogram:
+    """
+    The durations recorded by one thread.
+    """
+
+    __slots__ = ("counts", "sum")
+
+    def __init__(self):
+        # one more bucket for the (impossibly) long durations
+        self.counts = [0] * (BUCKETS + 1)
+        self.sum = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect_right(_UPPER_BOUNDS, seconds)] += 1
+        self.sum += seconds
+
+
+class HistogramSnapshot:
+    """
+    The recorded durations of a histogram at one point in time.
+
+    :attr int count: the number of durations
+    :attr float sum: their sum in seconds
+    :attr list buckets: ``(lower bound, upper bound, count)`` tuples of the
+                        buckets that are not empty, ordered and in seconds
+    """
+
+    __slots__ = ("count", "sum", "buckets")
+
+    def __init__(
+        self, count: int, total: float, buckets: List[Tuple[float, float, int]]
+    ):
+        self.count = count
+        self.sum = total
+        self.buckets = buckets
+
+    @property
+    def mean(self) -> float:
+        """The mean duration in seconds."""
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        :param q: the quantile between 0 and 1, e.g. 0.99
+        :return: the upper bound in seconds of the bucket holding the quantile,
+                 0.0 without durations
+        """
+        rank = q * self.count
+        seen = 0
+        for _, upper, count in self.buckets:
+            seen += count
+            if seen >= rank:
+                return upper
+        return self.buckets[-1][1] if self.buckets else 0.0
+
+    def cumulative(self, bounds: Sequence[float]) -> List[int]:
+        """
+        :param bounds: ascending upper bounds in seconds
+        :return: the number of durations in the buckets that end at or below
+                 every bound, as needed for the ``le`` buckets of Prometheus,
+                 a bucket that a bound falls into is not counted for it
+        """
+        counts = []
+        index = 0
+        seen = 0
+        for bound in bounds:
+            while index < len(self.buckets) and self.buckets[index][1] <= bound:
+                seen += self.buckets[index][2]
+                index += 1
+            counts.append(seen)
+        return counts
+
+    def __repr__(self) -> str:
+        return "HistogramSnapshot(count={}, mean={:.6f}, p99={:.6f})".format(
+            self.count, self.mean, self.quantile(0.99)
+        )
+
+
+class _Shard:
+    """
+    The counters and histograms one thread writes to.
+    """
+
+    __slots__ = ("counters", "histograms", "ticks")
+
+    def __init__(self, counters: int, histograms: int):
+        self.counters = [0] * counters
+        self.histograms = [_Histogram() for _ in range(histograms)]
+        self.ticks = 0
+
+
+class _Local(threading.local):
+    """
+    Creates the shard of every thread on first use.
+    """
+
+    def __init__(self, metric_set: "MetricSet"):
+        self.shard = metric_set._new_shard()
+        self.counters = self.shard.counters
+
+
+class MetricSet:
+    """
+    The counters and latency histograms of one instrumented object.
+
+    Subclasses name their counters and histograms, the position of a name
+    is the index that is passed to :meth:`add` and :meth:`observe`.
+
+    Only every `timing_interval` th operation of a thread that is counted
+    with :meth:`start` is timed, as reading the clock and recording costs
+    more than counting. The counters are always exact.
+
+    :attr dict labels: the Prometheus labels of all exported values
+    :attr int timing_interval: time one in this many operations
+    """
+
+    #: The prefix of the exported metric names
+    name = "can"
+    #: The names of the counters, exported with a ``_total`` suffix
+    counters: Tuple[str, ...] = ()
+    #: The names of the histograms
+    histograms: Tuple[str, ...] = ()
+
+    def __init__(self, labels: Dict[str, str], timing_interval: int = 1):
+        self.labels = {key: str(value) for key, value in labels.items()}
+        self.timing_interval = timing_interval
+        self.gauges: Dict[str, Callable[[], float]] = {}
+        self._shards: List[_Shard] = []
+        self._local = _Local(self)
+
+    def _new_shard(self) -> _Shard:
+        shard = _Shard(len(self.counters), len(self.histograms))
+        self._shards.append(shard)
+        return shard
+
+    def shard(self) -> _Shard:
+        """
+        :return: the counters and histograms of the calling thread
+        """
+        return self._local.shard
+
+    def add(self, counter: int, value: int = 1):
+        """Increment a counter of the calling thread."""
+        self._local.counters[counter] += value
+
+    def observe(self, histogram: int, seconds: float):
+        """Record a duration in a histogram of the calling thread."""
+        self._local.shard.histograms[histogram].record(seconds)
+
+    def start(self, counter: int, value: int = 1) -> float:
+        """
+        Count an operation that is about to start, like :meth:`add`, and
+        tell whether to time it::
+
+            start = metrics.start(NotifierMetrics.MESSAGES_DISPATCHED)
+            ...
+            if start:
+                metrics.observe(
+                    NotifierMetrics.DISPATCH_DURATION, perf_counter() - start
+                )
+
+        :return: the current :func:`time.perf_counter` if the operation is
+                 timed, else 0.0
+        """
+        shard = self._local.shard
+        shard.counters[counter] += value
+        shard.ticks += 1
+        if shard.ticks % self.timing_interval:
+            return 0.0
+        return perf_counter()
+
+    def snapshot(self) -> Dict[str, Union[int, float, HistogramSnapshot]]:
+        """
+        :return: the counters summed up over all threads, the histograms
+                 merged and the current values of the gauges, by name
+        """
+        shards = list(self._shards)
+        values: Dict[str, Union[int, float, HistogramSnapshot]] = {}
+        for index, name in enumerate(self.counters):
+            values[name] = sum(shard.counters[index] for shard in shards)
+        for index, name in enumerate(self.histograms):
+            counts = [0] * (BUCKETS + 1)
+            total = 0.0
+            for shard in shards:
+                histogram = shard.histograms[index]
+                total += histogram.sum
+                for bucket, bucket_count in enumerate(histogram.counts):
+                    if bucket_count:
+                        counts[bucket] += bucket_count
+            buckets = []
+            for bucket, bucket_count in enumerate(counts):
+                if bucket_count:
+                    lower, upper = _bucket_bounds(bucket)
+                    buckets.append((lower * 1e-9, upper * 1e-9, bucket_count))
+            values[name] = HistogramSnapshot(sum(counts), total, buckets)
+        for name, gauge in self.gauges.items():
+            values[name] = gauge()
+        return values
+
+    def __repr__(self) -> str:
+        return "{}({!r})".format(type(self).__name__, self.labels)
+
+
+class BusMetrics(MetricSet):
+    """
+    Counts the frames a bus received, dropped in its software filters and
+    sent, and times its sends.
+
+    Receiving is counted by :meth:`can.BusABC.recv` and
+    :meth:`can.BusABC.recv_batch`, so interfaces that override ``recv``
+    only count what they send.
+    """
+
+    name = "can_bus"
+    counters = (
+        "frames_received",
+        "frames_filtered",
+        "recv_timeouts",
+        "frames_sent",
+        "send_errors",
+    )
+    histograms = ("send_duration_seconds",)
+
+    FRAMES_RECEIVED = 0
+    FRAMES_FILTERED = 1
+    RECV_TIMEOUTS = 2
+    FRAMES_SENT = 3
+    SEND_ERRORS = 4
+    SEND_DURATION = 0
+
+
+class NotifierMetrics(MetricSet):
+    """
+    Counts the messages a notifier dispatched and times how long its
+    listeners took for every message or batch.
+    """
+
+    name = "can_notifier"
+    counters = ("messages_dispatched", "errors")
+    histograms = ("dispatch_duration_seconds",)
+
+    MESSAGES_DISPATCHED = 0
+    ERRORS = 1
+    DISPATCH_DURATION = 0
+
+
+class ReaderMetrics(MetricSet):
+    """
+    Counts the messages taken out of a :class:`can.BufferedReader` and
+    tells how many are waiting.
+    """
+
+    name = "can_reader"
+    counters = ("messages_retrieved", "get_timeouts")
+
+    MESSAGES_RETRIEVED = 0
+    GET_TIMEOUTS = 1
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str], extra: str = "") -> str:
+    pairs = ['{}="{}"'.format(key, _escape(value)) for key, value in labels.items()]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class MetricsRegistry:
+    """
+    Instruments buses, notifiers and buffered readers and exports what they
+    counted::
+
+        registry = can.MetricsRegistry()
+        registry.instrument(bus)
+        registry.instrument(notifier)
+        server = registry.serve(port=9108)
+
+    Instrumenting sets the ``metrics`` attribute of the object to its new
+    :class:`MetricSet`. The ``send`` and ``send_batch`` methods of a bus are
+    wrapped on the instance, other instances of the same class are not
+    affected.
+    """
+
+    def __init__(self, timing_interval: int = 16):
+        """
+        :param timing_interval:
+            time one in this many operations of every thread, 1 to time
+            all of them, see :class:`MetricSet`
+        """
+        self.timing_interval = timing_interval
+        self._metric_sets: List[MetricSet] = []
+        self._numbers: Dict[type, int] = {}
+        self._lock = threading.Lock()
+
+    def instrument(self, obj: Any, **labels: str) -> MetricSet:
+        """
+        Start counting for a bus, a notifier or a buffered reader.
+
+        :param obj: a :class:`can.BusABC`, :class:`can.Notifier` or
+                    :class:`can.BufferedReader`
+        :param labels: Prometheus labels of its values, by default the
+                       channel of a bus or the position among the notifiers
+                       or readers of this registry
+        :return: the metric set counting for the object
+        :raises TypeError: if the object can not be instrumented
+        """
+        # imported here as the instrumented modules import this one
+        from can.bus import BusABC
+        from can.listener import BufferedReader
+        from can.notifier import Notifier
+
+        if isinstance(obj, BusABC):
+            # instrument the bus below a ThreadSafeBus
+            obj = getattr(obj, "__wrapped__", obj)
+            metric_set: MetricSet = BusMetrics(
+                labels or {"channel": str(obj.channel_info)}, self.timing_interval
+            )
+            self._wrap_sends(obj, metric_set)
+        elif isinstance(obj, Notifier):
+            metric_set = NotifierMetrics(
+                labels or {"notifier": str(self._number(NotifierMetrics))},
+                self.timing_interval,
+            )
+        elif isinstance(obj, BufferedReader):
+            metric_set = ReaderMetrics(
+                labels or {"reader": str(self._number(ReaderMetrics))},
+                self.timing_interval,
+            )
+            metric_set.gauges["queue_size"] = obj.buffer.qsize
+        else:
+            raise TypeError("Can not instrument {!r}".format(obj))
+        obj.metrics = metric_set
+        with self._lock:
+            self._metric_sets.append(metric_set)
+        return metric_set
+
+    def _number(self, kind: type) -> int:
+        with self._lock:
+            number = self._numbers.get(kind, 0)
+            self._numbers[kind] = number + 1
+        return number
+
+    @staticmethod
+    def _wrap_sends(bus: Any, metrics: MetricSet):
+        from can.bus import BusABC
+
+        sent = BusMetrics.FRAMES_SENT
+        errors = BusMetrics.SEND_ERRORS
+        duration = BusMetrics.SEND_DURATION
+        interval = metrics.timing_interval
+        local = metrics._local
+        send = bus.send
+
+        # backends may take more arguments, like the data size of the exo buses
+        def metered_send(msg, *args, **kwargs):
+            # the count of sent frames doubles as the tick that picks the
+            # sends which are timed
+            counters = local.counters
+            try:
+                if counters[sent] % interval:
+                    send(msg, *args, **kwargs)
+                else:
+                    start = perf_counter()
+                    send(msg, *args, **kwargs)
+                    local.shard.histograms[duration].record(perf_counter() - start)
+            except Exception:
+                counters[errors] += 1
+                raise
+            counters[sent] += 1
+
+        bus.send = metered_send
+
+        if type(bus).send_batch is BusABC.send_batch:
+            # the generic implementation calls the wrapped send
+            return
+        send_batch = bus.send_batch
+
+        def metered_send_batch(msgs, *args, **kwargs):
+            shard = local.shard
+            shard.ticks += 1
+            try:
+                if shard.ticks % interval:
+                    send_batch(msgs, *args, **kwargs)
+                else:
+                    start = perf_counter()
+                    send_batch(msgs, *args, **kwargs)
+                    shard.histograms[duration].record(perf_counter() - start)
+            except Exception as error:
+                shard.counters[sent] += getattr(error, "sent", 0)
+                shard.counters[errors] += 1
+                raise
+            shard.counters[sent] += len(msgs)
+
+        bus.send_batch = metered_send_batch
+
+    def remove(self, obj: Any):
+        """
+        Stop counting for an object and drop its values from the exports.
+
+        :raises ValueError: if the object was not instrumented by this registry
+        """
+        obj = getattr(obj, "__wrapped__", obj)
+        metric_set = getattr(obj, "metrics", None)
+        with self._lock:
+            self._metric_sets.remove(metric_set)
+        obj.metrics = None
+        for method in ("send", "send_batch"):
+            if method in vars(obj):
+                delattr(obj, method)
+
+    def snapshot(self) -> List[Tuple[MetricSet, Dict[str, Any]]]:
+        """
+        :return: every metric set with its values, see :meth:`MetricSet.snapshot`
+        """
+        with self._lock:
+            metric_sets = list(self._metric_sets)
+        return [(metric_set, metric_set.snapshot()) for metric_set in metric_sets]
+
+    def prometheus_text(self, buckets: Sequence[float] = DEFAULT_EXPORT_BUCKETS) -> str:
+        """
+        :param buckets: the upper bounds in seconds of the exported histogram
+                        buckets, they are as exact as the histograms
+        :return: all values in the Prometheus text exposition format
+        """
+        families: Dict[str, Tuple[str, List[str]]] = {}
+
+        def family(name: str, kind: str) -> List[str]:
+            if name not in families:
+                families[name] = (kind, [])
+            return families[name][1]
+
+        for metric_set, values in self.snapshot():
+            labels = metric_set.labels
+            for counter in metric_set.counters:
+                name = "{}_{}_total".format(metric_set.name, counter)
+                family(name, "counter").append(
+                    "{}{} {}".format(name, _format_labels(labels), values[counter])
+                )
+            for histogram in metric_set.histograms:
+                name = "{}_{}".format(metric_set.name, histogram)
+                lines = family(name, "histogram")
+                snapshot = values[histogram]
+                for bound, count in zip(buckets, snapshot.cumulative(buckets)):
+                    lines.append(
+                        "{}_bucket{} {}".format(
+                            name, _format_labels(labels, 'le="{}"'.format(bound)), count
+                        )
+                    )
+                lines.append(
+                    "{}_bucket{} {}".format(
+                        name, _format_labels(labels, 'le="+Inf"'), snapshot.count
+                    )
+                )
+                lines.append(
+                    "{}_sum{} {}".format(name, _format_labels(labels), snapshot.sum)
+                )
+                lines.append(
+                    "{}_count{} {}".format(name, _format_labels(labels), snapshot.count)
+                )
+            for gauge in metric_set.gauges:
+                name = "{}_{}".format(metric_set.name, gauge)
+                family(name, "gauge").append(
+                    "{}{} {}".format(name, _format_labels(labels), values[gauge])
+                )
+
+        text = []
+        for name, (kind, lines) in families.items():
+            text.append("# TYPE {} {}".format(name, kind))
+            text.extend(lines)
+        return "\n".join(text) + "\n"
+
+    def write_textfile(self, path: str):
+        """
+        Write all values for the textfile collector of the Prometheus node
+        exporter. The file is replaced at once, so it is never read half
+        written.
+
+        :param path: the file to write, usually ending in ``.prom``
+        """
+        temporary = "{}.{}.tmp".format(path, os.getpid())
+        with open(temporary, "w") as file:
+            file.write(self.prometheus_text())
+        os.replace(temporary, path)
+
+    def serve(
+        self, port: int = 9108, host: str = "127.0.0.1"
+    ) -> http.server.HTTPServer:
+        """
+        Serve all values over HTTP for Prometheus to scrape, from a daemon
+        thread.
+
+        :param port: the port to listen on, 0 picks a free one
+        :param host: the address to listen on
+        :return: the server, call its ``shutdown`` and ``server_close``
+                 methods to stop it
+        """
+        registry = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.HTTPServer((host, port), Handler)
+        thread = threading.Thread(
+            target=server.serve_forever, name="can.metrics", daemon=True
+        )
+        thread.start()
+        return server
@@ -0,0 +1,262 @@
+"""
+Contains :class:`MultiBus`, which receives from several buses behind one
+:meth:`~can.BusABC.recv`.
+"""
+
+import heapq
+import itertools
+import logging
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, List, Optional, Sequence, Tuple
+
+import can.typechecking
+from can.bus import BusABC, BusState
+from can.message import Message
+
+logger = logging.getLogger("can.multibus")
+
+
+def _fileno(bus: BusABC) -> int:
+    """:return: the file descriptor of the bus, or -1 if it has none"""
+    try:
+        return bus.fileno()
+    except (NotImplementedError, OSError, ValueError):
+        return -1
+
+
+class MultiBus(BusABC):
+    """
+    Receives from several buses and sends to them by channel.
+
+    The buses with a file descriptor are waited on together with
+    :mod:`selectors` in the thread that receives, only the buses without one
+    get a helper thread each. Every received message gets the channel of the
+    bus it came from in :attr:`~can.Message.channel`, and a message that is
+    sent goes to the bus of its channel.
+
+    With `ordered`, messages are held back for `reorder_window` seconds and
+    returned in the order of their timestamps across all buses, which have
+    to take their timestamps from the same clock for that.
+
+    The buses are shut down together with this one.
+    """
+
+    def __init__(
+        self,
+        buses: Sequence[BusABC],
+        channels: Optional[Sequence[Any]] = None,
+        ordered: bool = False,
+        reorder_window: float = 0.05,
+        poll_interval: float = 0.1,
+        can_filters: Optional[can.typechecking.CanFilters] = None,
+        **kwargs: object
+    ):
+        """
+        :param buses: the buses to merge
+        :param channels: the channel of every bus, by default its index
+        :param ordered: return the messages in the order of their timestamps
+        :param reorder_window: how long an ordered message is held back for
+                               messages with earlier timestamps in seconds
+        :param poll_interval: how long the helper threads of buses without
+                              file descriptor wait for a message in seconds
+        :raises ValueError: if the number of channels does not match or a
+                            channel is given twice
+        """
+        if channels is None:
+            channels = range(len(buses))
+        channels = list(channels)
+        if len(channels) != len(buses):
+            raise ValueError("need one channel for every bus")
+        if len(set(channels)) != len(channels):
+            raise ValueError("the channels must be unique")
+
+        self.buses = list(buses)
+        self.channels = channels
+        self.ordered = ordered
+        self.reorder_window = reorder_window
+        self.poll_interval = poll_interval
+        self.channel_info = "MultiBus: " + ", ".join(
+            bus.channel_info for bus in self.buses
+        )
+        self._buses_by_channel = dict(zip(channels, self.buses))
+
+        self._pending: Deque[Message] = deque()
+        self._held: List[Tuple[float, int, float, Message]] = []
+        self._sequence = itertools.count()
+
+        # helper threads hand over their messages through a deque and wake
+        # up the selector with a byte on a socket pair
+        self._received: Deque[Tuple[Any, List[Message]]] = deque()
+        self._wakeup, self._wakeup_writer = socket.socketpair()
+        self._wakeup.setblocking(False)
+        self._wakeup_writer.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._wakeup, selectors.EVENT_READ, None)
+
+        self._running = True
+        self._threads: List[threading.Thread] = []
+        for bus, channel in zip(self.buses, channels):
+            fileno = _fileno(bus)
+            if fileno >= 0:
+                try:
+                    self._selector.register(
+                        fileno, selectors.EVENT_READ, (bus, channel)
+                    )
+                    continue
+                except (OSError, ValueError) as error:
+                    logger.debug("cannot select %s: %s", bus.channel_info, error)
+            thread = threading.Thread(
+                target=self._rx_thread,
+                args=(bus, channel),
+                name='can.multibus for channel "{}"'.format(channel),
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        super().__init__(channel=channels, can_filters=can_filters, **kwargs)
+
+    @property
+    def helper_threads(self) -> int:
+        """The number of buses that are read by a helper thread."""
+        return len(self._threads)
+
+    def _rx_thread(self, bus: BusABC, channel: Any):
+        while self._running:
+            try:
+                msgs = bus.recv_batch(timeout=self.poll_interval)
+            except Exception as error:
+                if self._running:
+                    logger.error("could not receive from %s: %s", channel, error)
+                    time.sleep(self.poll_interval)
+                continue
+            if msgs:
+                self._received.append((channel, msgs))
+                try:
+                    self._wakeup_writer.send(b"\0")
+                except BlockingIOError:
+                    # the socket is full of wake ups already
+                    pass
+
+    def _add(self, channel: Any, msgs: List[Message]):
+        if self.ordered:
+            release = time.perf_counter() + self.reorder_window
+            for msg in msgs:
+                msg.channel = channel
+                heapq.heappush(
+                    self._held, (msg.timestamp, next(self._sequence), release, msg)
+                )
+        else:
+            for msg in msgs:
+                msg.channel = channel
+            self._pending.extend(msgs)
+
+    def _read(self, timeout: Optional[float]):
+        for key, _ in self._selector.select(timeout):
+            if key.data is None:
+                try:
+                    while self._wakeup.recv(4096):
+                        pass
+                except BlockingIOError:
+                    pass
+                while self._received:
+                    self._add(*self._received.popleft())
+                continue
+            bus, channel = key.data
+            # take everything the bus buffered, its file descriptor may not
+            # be readable again for those messages
+            msgs = bus.recv_batch(timeout=0)
+            while msgs:
+                self._add(channel, msgs)
+                msgs = bus.recv_batch(timeout=0)
+
+    def _next(self, now: float) -> Tuple[Optional[Message], Optional[float]]:
+        """
+        :return: the next message if there is one to return, else None and
+                 the seconds until a held back message is due or None
+        """
+        if not self.ordered:
+            if self._pending:
+                return self._pending.popleft(), None
+            return None, None
+        if not self._held:
+            return None, None
+        release = self._held[0][2]
+        if release <= now:
+            return heapq.heappop(self._held)[3], None
+        return None, release - now
+
+    def _recv_internal(
+        self, timeout: Optional[float]
+    ) -> Tuple[Optional[Message], bool]:
+        end_time = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            now = time.perf_counter()
+            msg, due = self._next(now)
+            if msg is not None:
+                return msg, False
+            if end_time is None:
+                wait = due
+            else:
+                wait = max(0.0, end_time - now)
+                if due is not None:
+                    wait = min(wait, due)
+            self._read(wait)
+            msg, _ = self._next(time.perf_counter())
+            if msg is not None:
+                return msg, False
+            if end_time is not None and time.perf_counter() >= end_time:
+                return None, False
+
+    def send(self, msg: Message, timeout: Optional[float] = None):
+        """
+        Send a message on the bus of its channel.
+
+        :raises ValueError: if no bus has the channel of the message
+        """
+        try:
+            bus = self._buses_by_channel[msg.channel]
+        except KeyError:
+            raise ValueError("no bus for channel {!r}".format(msg.channel)) from None
+        bus.send(msg, timeout)
+
+    def fileno(self) -> int:
+        """
+        The file descriptor of the selector, which is readable when one of
+        the buses is. Not available with `ordered`, as held back messages
+        become due without any of them being readable.
+        """
+        if self.ordered or not hasattr(self._selector, "fileno"):
+            raise NotImplementedError("MultiBus has no file descriptor to wait on")
+        return self._selector.fileno()
+
+    def flush_tx_buffer(self):
+        for bus in self.buses:
+            bus.flush_tx_buffer()
+
+    @property
+    def state(self) -> BusState:
+        """The state of the first bus that is not active, if any."""
+        for bus in self.buses:
+            if bus.state != BusState.ACTIVE:
+                return bus.state
+        return BusState.ACTIVE
+
+    @state.setter
+    def state(self, new_state: BusState):
+        for bus in self.buses:
+            bus.state = new_state
+
+    def shutdown(self):
+        self._running = False
+        for thread in self._threads:
+            thread.join(self.poll_interval + 1.0)
+        for bus in self.buses:
+            bus.shutdown()
+        self._selector.close()
+        self._wakeup.close()
+        self._wakeup_writer.close()
@@ -7,6 +7,8 @@ from typing import Iterable, List, Optional, Union
 from can.bus import BusABC
 from can.listener import Listener
 from can.message import Message
+from can.messagepool import MessagePool, PooledMessage
+from can.metrics import NotifierMetrics
 
 import threading
 import logging
@@ -17,12 +19,19 @@ logger = logging.getLogger("can.Notifier")
 
 
 class Notifier:
+
+    #: The :class:`~can.metrics.NotifierMetrics` counting for this notifier,
+    #: set by :meth:`can.MetricsRegistry.instrument`
+    metrics: Optional[NotifierMetrics] = None
+
     def __init__(
         self,
         bus: BusABC,
         listeners: Iterable[Listener],
         timeout: float = 1.0,
         loop: Optional[asyncio.AbstractEventLoop] = None,
+        message_pool: Optional[MessagePool] = None,
+        batch_size: int = 1,
     ):
         """Manages the distribution of :class:`can.Message` instances to listeners.
 
@@ -38,11 +47,22 @@ class Notifier:
         :param listeners: An iterable of :class:`~can.Listener`
         :param timeout: An optional maximum number of seconds to wait for any message.
         :param loop: An :mod:`asyncio` event loop to schedule listeners in.
+        :param message_pool:
+            A :class:`~can.MessagePool` for all buses that do not have one yet.
+            Pooled messages are released after they were dispatched, unless
+            a listener retains messages, see :attr:`can.Listener.retains_messages`.
+        :param batch_size:
+            If larger than 1, read up to this many messages at once with
+            :meth:`~can.BusABC.recv_batch` and hand them to
+            :meth:`~can.Listener.on_messages_received` of the listeners,
+            so every listener gets a whole batch before the next one.
         """
         self.listeners = list(listeners)
         self.bus = bus
         self.timeout = timeout
         self._loop = loop
+        self.message_pool = message_pool
+        self.batch_size = batch_size
 
         #: Exception raised in thread
         self.exception: Optional[Exception] = None
@@ -61,6 +81,8 @@ class Notifier:
         :param bus:
             CAN bus instance.
         """
+        if self.message_pool is not None and bus.message_pool is None:
+            bus.message_pool = self.message_pool
         reader: int = -1
         try:
             reader = bus.fileno()
@@ -106,6 +128,7 @@ class Notifier:
 
     def _rx_thread(self, bus: BusABC):
         msg = None
+        msgs: List[Message] = []
         try:
             while self._running:
                 if msg is not None:
@@ -116,7 +139,18 @@ class Notifier:
                             )
                         else:
                             self._on_message_received(msg)
-                msg = bus.recv(self.timeout)
+                elif msgs:
+                    with self._lock:
+                        if self._loop is not None:
+                            self._loop.call_soon_threadsafe(
+                                self._on_messages_received, msgs
+                            )
+                        else:
+                            self._on_messages_received(msgs)
+                if self.batch_size > 1:
+                    msgs = bus.recv_batch(self.batch_size, self.timeout)
+                else:
+                    msg = bus.recv(self.timeout)
         except Exception as exc:
             self.exception = exc
             if self._loop is not None:
@@ -126,18 +160,89 @@ class Notifier:
                 raise
 
     def _on_message_available(self, bus: BusABC):
+        # buses may buffer several messages per read of their file descriptor,
+        # so take everything that is available without blocking
+        if self.batch_size > 1:
+            msgs = bus.recv_batch(self.batch_size, 0)
+            while msgs:
+                self._on_messages_received(msgs)
+                msgs = bus.recv_batch(self.batch_size, 0)
+            return
         msg = bus.recv(0)
-        if msg is not None:
+        while msg is not None:
             self._on_message_received(msg)
+            msg = bus.recv(0)
 
     def _on_message_received(self, msg: Message):
+        metrics = self.metrics
+        if metrics is not None:
+            start = metrics.start(NotifierMetrics.MESSAGES_DISPATCHED)
+        tasks = []
         for callback in self.listeners:
             res = callback(msg)
             if self._loop is not None and asyncio.iscoroutine(res):
                 # Schedule coroutine
-                self._loop.create_task(res)
+                tasks.append(self._loop.create_task(res))
+        if isinstance(msg, PooledMessage) and not any(
+            getattr(listener, "retains_messages", True) for listener in self.listeners
+        ):
+            self._release([msg], tasks)
+        if metrics is not None and start:
+            metrics.observe(
+                NotifierMetrics.DISPATCH_DURATION, time.perf_counter() - start
+            )
+
+    def _on_messages_received(self, msgs: List[Message]):
+        metrics = self.metrics
+        if metrics is not None:
+            start = metrics.start(NotifierMetrics.MESSAGES_DISPATCHED, len(msgs))
+        tasks = []
+        for callback in self.listeners:
+            on_messages_received = getattr(callback, "on_messages_received", None)
+            if on_messages_received is not None:
+                results = [on_messages_received(msgs)]
+            else:
+                results = [callback(msg) for msg in msgs]
+            if self._loop is not None:
+                for res in results:
+                    if asyncio.iscoroutine(res):
+                        # Schedule coroutine
+                        tasks.append(self._loop.create_task(res))
+        if not any(
+            getattr(listener, "retains_messages", True) for listener in self.listeners
+        ):
+            self._release(msgs, tasks)
+        if metrics is not None and start:
+            metrics.observe(
+                NotifierMetrics.DISPATCH_DURATION, time.perf_counter() - start
+            )
+
+    @staticmethod
+    def _release(msgs: List[Message], tasks: List["asyncio.Task"]):
+        """
+        Hand pooled messages back to their pool, but not before the
+        coroutines scheduled for them are done with them.
+        """
+        if not tasks:
+            for msg in msgs:
+                msg.release()
+            return
+        pending = [len(tasks)]
+
+        def task_done(_task):
+            # done callbacks run in the event loop, one at a time
+            pending[0] -= 1
+            if not pending[0]:
+                for msg in msgs:
+                    msg.release()
+
+        for task in tasks:
+            task.add_done_callback(task_done)
 
     def _on_error(self, exc: Exception) -> bool:
+        if self.metrics is not None:
+            self.metrics.add(NotifierMetrics.ERRORS)
+
         listeners_with_on_error = [
             listener for listener in self.listeners if hasattr(listener, "on_error")
         ]
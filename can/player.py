@@ -92,6 +92,13 @@ def main():
         help="""<s> skip gaps greater than 's' seconds""",
     )
 
+    parser.add_argument(
+        "--bus-load",
+        type=float,
+        help="""<%%> keep the estimated bus load below this share of the bitrate,
+                        which requires --bitrate""",
+    )
+
     parser.add_argument(
         "infile",
         metavar="input-file",
@@ -126,7 +133,14 @@ def main():
         config["fd"] = True
     if results.data_bitrate:
         config["data_bitrate"] = results.data_bitrate
+    if results.bus_load and not results.bitrate:
+        parser.error("--bus-load requires --bitrate")
     bus = Bus(results.channel, **config)
+    sender = bus
+    if results.bus_load:
+        sender = can.TransmitShaper(
+            bus, can.TokenBucket.from_bus_load(results.bus_load, results.bitrate)
+        )
 
     reader = LogReader(results.infile)
 
@@ -137,12 +151,13 @@ def main():
     print(f"Can LogReader (Started on {datetime.now()})")
 
     try:
-        for m in in_sync:
-            if m.is_error_frame and not error_frames:
-                continue
+        for batch in in_sync.batches():
+            if not error_frames:
+                batch = [m for m in batch if not m.is_error_frame]
             if verbosity >= 3:
-                print(m)
-            bus.send(m)
+                for m in batch:
+                    print(m)
+            sender.send_batch(batch)
     except KeyboardInterrupt:
         pass
     finally:
@@ -0,0 +1,445 @@
+"""
+This module contains the optional transmit shaping of a bus.
+
+A :class:`TransmitShaper` sends through a bus and holds every frame to
+token buckets, one for the whole bus and one per arbitration id if wanted.
+A bucket refills at a fixed rate and each frame takes tokens out of it,
+either one per frame or the number of bits the frame occupies on the bus,
+which expresses a limit as a share of the bitrate. Frames that find too few
+tokens are delayed, dropped or queued, depending on the mode of the shaper.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+from can import CanError
+from can.broadcastmanager import ThreadBasedCyclicSendTask
+from can.bus import BatchSendError, BusABC
+from can.message import Message
+
+logger = logging.getLogger("can.shaping")
+
+#: Sleep until the frame may be sent
+BLOCK = "block"
+#: Drop the frame
+DROP = "drop"
+#: Queue the frame and send it from a thread once it may be sent
+QUEUE = "queue"
+
+#: The seconds of traffic a bucket holds if no burst is given
+DEFAULT_BURST_TIME = 0.01
+
+#: The bits of an extended classic frame with 8 data bytes and worst case
+#: bit stuffing, including the interframe space
+MAX_CLASSIC_FRAME_BITS = 160
+
+
+def frame_bits(msg: Message) -> int:
+    """
+    Estimate the bits a frame occupies on the bus, with worst case bit
+    stuffing and the interframe space.
+
+    CAN FD frames are counted as if all of them went at the nominal bitrate,
+    which overestimates frames that switch the bitrate.
+    """
+    data_bits = 0 if msg.is_remote_frame else 8 * len(msg.data)
+    if msg.is_extended_id:
+        fixed, stuffed = 67, 54
+    else:
+        fixed, stuffed = 47, 34
+    return fixed + data_bits + (stuffed + data_bits - 1) // 4
+
+
+class TokenBucket:
+    """
+    Lets `rate` tokens per second through on average and bursts of up to
+    `burst` tokens.
+
+    A bucket that is given for several arbitration ids limits them together.
+
+    :attr float rate: tokens added per second
+    :attr float burst: the most tokens the bucket holds
+    :attr bool bits: whether a frame takes as many tokens as it has bits
+                     instead of one
+    """
+
+    __slots__ = ("rate", "burst", "bits", "_tokens", "_updated")
+
+    def __init__(self, rate: float, burst: Optional[float] = None, bits: bool = False):
+        """
+        :param rate: frames per second, or bits per second if `bits` is set
+        :param burst: the most tokens that can be taken at once, by default
+                      what the rate adds in 10 ms but at least one frame
+        :param bits: take the bits of a frame out of the bucket, see
+                     :func:`frame_bits`
+        :raises ValueError: if the rate is not positive
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst is None:
+            burst = max(
+                rate * DEFAULT_BURST_TIME, MAX_CLASSIC_FRAME_BITS if bits else 1
+            )
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.bits = bits
+        self._tokens = self.burst
+        self._updated = time.perf_counter()
+
+    @classmethod
+    def from_bus_load(
+        cls, percent: float, bitrate: int, burst: Optional[float] = None
+    ) -> "TokenBucket":
+        """
+        Create a bucket that keeps the estimated bus load below `percent`.
+
+        :param percent: the share of the bitrate, between 0 and 100
+        :param bitrate: the nominal bitrate of the bus in bits per second
+        :param burst: the most bits that can be sent at once
+        :raises ValueError: if `percent` is out of range
+        """
+        if not 0 < percent <= 100:
+            raise ValueError("percent must be above 0 and at most 100")
+        return cls(bitrate * percent / 100.0, burst, bits=True)
+
+    def cost(self, msg: Message) -> float:
+        """
+        :return: the tokens that sending the message takes, a frame larger
+                 than the bucket waits for a full bucket
+        """
+        return min(frame_bits(msg) if self.bits else 1.0, self.burst)
+
+    def delay(self, cost: float, now: float) -> float:
+        """
+        :return: the seconds until `cost` tokens are in the bucket
+        """
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        missing = cost - self._tokens
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, cost: float):
+        """
+        Take tokens out of the bucket, which may leave it in debt for frames
+        that wait for their delay.
+        """
+        self._tokens -= cost
+
+    def __repr__(self) -> str:
+        return "TokenBucket(rate={}, burst={}, bits={})".format(
+            self.rate, self.burst, self.bits
+        )
+
+
+class ShapingStats:
+    """
+    What shaping did to the frames of a bus or an arbitration id.
+
+    :attr int count: frames sent
+    :attr int delayed: frames that were held back
+    :attr int dropped: frames that were dropped
+    :attr float total: sum of the delays in seconds
+    :attr float max: longest delay in seconds
+    """
+
+    __slots__ = ("count", "delayed", "dropped", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.delayed = 0
+        self.dropped = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, delay: float):
+        self.count += 1
+        if delay > 0:
+            self.delayed += 1
+            self.total += delay
+            if delay > self.max:
+                self.max = delay
+
+    @property
+    def mean(self) -> float:
+        """The mean delay of all frames sent in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            "ShapingStats(count={}, delayed={}, dropped={}, mean={:.6f}, "
+            "max={:.6f})".format(
+                self.count, self.delayed, self.dropped, self.mean, self.max
+            )
+        )
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.perf_counter())
+
+
+class TransmitShaper:
+    """
+    Sends through a bus and keeps the frames within token buckets.
+
+    It can be used wherever a bus is only used to send, for example by a
+    :class:`~can.RedirectReader` that forwards traffic to a slower bus, and
+    :meth:`send_periodic` runs cyclic tasks through it.
+
+    In the ``"block"`` mode, :meth:`send` sleeps until the frame may be
+    sent. In the ``"drop"`` mode, it drops the frame instead. In the
+    ``"queue"`` mode, frames are queued by arbitration id and sent from a
+    thread, so an id that is over its limit does not hold back the others.
+
+    :attr dict stats: :class:`ShapingStats` of all frames under the key
+                      None and of every arbitration id with its own bucket
+    """
+
+    def __init__(
+        self,
+        bus: BusABC,
+        limit: Optional[TokenBucket] = None,
+        id_limits: Optional[Dict[int, TokenBucket]] = None,
+        mode: str = BLOCK,
+        max_queued: int = 1024,
+    ):
+        """
+        :param bus: the bus to send on
+        :param limit: the bucket of all frames, None to only limit ids
+        :param id_limits: buckets by arbitration id
+        :param mode: ``"block"``, ``"drop"`` or ``"queue"``
+        :param max_queued: the number of frames that can be queued
+        :raises ValueError: if the mode is unknown
+        """
+        if mode not in (BLOCK, DROP, QUEUE):
+            raise ValueError("unknown shaping mode: {}".format(mode))
+        self.bus = bus
+        self.limit = limit
+        self.id_limits = dict(id_limits or {})
+        self.mode = mode
+        self.max_queued = max_queued
+        self.stats: Dict[Optional[int], ShapingStats] = {None: ShapingStats()}
+        for arbitration_id in self.id_limits:
+            self.stats[arbitration_id] = ShapingStats()
+
+        self._lock = threading.Lock()
+        self._lock_send_periodic = threading.Lock()
+
+        # the queued frames of every arbitration id with the time they
+        # were queued and their position in the queue
+        self._queues: Dict[int, Deque[Tuple[float, int, Message]]] = {}
+        self._queued = 0
+        self._changed = threading.Condition(self._lock)
+        self._running = True
+        self._thread = None
+        if mode == QUEUE:
+            self._sequence = itertools.count()
+            self._thread = threading.Thread(
+                target=self._run, name="can.shaping", daemon=True
+            )
+            self._thread.start()
+
+    def __len__(self) -> int:
+        """The number of queued frames."""
+        return self._queued
+
+    def _delay(self, msg: Message, now: float) -> float:
+        """:return: the seconds until the buckets of the frame allow it"""
+        delay = 0.0
+        if self.limit is not None:
+            delay = self.limit.delay(self.limit.cost(msg), now)
+        bucket = self.id_limits.get(msg.arbitration_id)
+        if bucket is not None:
+            delay = max(delay, bucket.delay(bucket.cost(msg), now))
+        return delay
+
+    def _take(self, msg: Message, delay: float):
+        if self.limit is not None:
+            self.limit.take(self.limit.cost(msg))
+        self.stats[None].add(delay)
+        bucket = self.id_limits.get(msg.arbitration_id)
+        if bucket is not None:
+            bucket.take(bucket.cost(msg))
+            self.stats[msg.arbitration_id].add(delay)
+
+    def _drop(self, msg: Message):
+        self.stats[None].dropped += 1
+        if msg.arbitration_id in self.id_limits:
+            self.stats[msg.arbitration_id].dropped += 1
+
+    def _reserve(self, msg: Message, deadline: Optional[float]) -> Optional[float]:
+        """
+        Take the tokens of a frame.
+
+        :return: the seconds to wait before sending it, None if it was dropped
+        :raises can.CanError: if the frame would have to wait past the deadline
+        """
+        with self._lock:
+            now = time.perf_counter()
+            delay = self._delay(msg, now)
+            if delay > 0:
+                if self.mode == DROP:
+                    self._drop(msg)
+                    return None
+                if deadline is not None and now + delay > deadline:
+                    raise CanError(
+                        "Transmit limit allows the next frame in {:.3f} s".format(delay)
+                    )
+            self._take(msg, delay)
+        return delay
+
+    def send(self, msg: Message, timeout: Optional[float] = None) -> bool:
+        """
+        Send a message once its buckets allow it.
+
+        :param msg: the message to send
+        :param timeout: seconds to wait for the buckets or for room in the
+                        queue, and then for the bus, None to wait
+                        indefinitely
+        :return: False if the message was dropped, else True
+        :raises can.CanError: if the message could not be sent in time
+        """
+        if self.mode == QUEUE:
+            self._put([msg], timeout)
+            return True
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        delay = self._reserve(msg, deadline)
+        if delay is None:
+            return False
+        if delay > 0:
+            time.sleep(delay)
+        self.bus.send(msg, _remaining(deadline))
+        return True
+
+    def send_batch(
+        self, msgs: Sequence[Message], timeout: Optional[float] = None
+    ) -> int:
+        """
+        Send several messages, the ones that the buckets allow together
+        with one :meth:`~can.BusABC.send_batch` of the bus.
+
+        :return: the number of messages sent or queued, less than given if
+                 some were dropped
+        :raises can.BatchSendError: if not all messages could be sent in time
+        """
+        if self.mode == QUEUE:
+            self._put(msgs, timeout)
+            return len(msgs)
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        sent = 0
+        ready: List[Message] = []
+        try:
+            for msg in msgs:
+                try:
+                    delay = self._reserve(msg, deadline)
+                except CanError:
+                    # the frames that already took their tokens still go out
+                    sent += self._send_ready(ready, deadline)
+                    raise
+                if delay is None:
+                    continue
+                if delay > 0:
+                    sent += self._send_ready(ready, deadline)
+                    ready = []
+                    time.sleep(delay)
+                ready.append(msg)
+            sent += self._send_ready(ready, deadline)
+        except BatchSendError as error:
+            raise BatchSendError(str(error), sent + error.sent) from error
+        except CanError as error:
+            raise BatchSendError(str(error), sent) from error
+        return sent
+
+    def _send_ready(self, msgs: List[Message], deadline: Optional[float]) -> int:
+        if msgs:
+            self.bus.send_batch(msgs, _remaining(deadline))
+        return len(msgs)
+
+    def send_periodic(
+        self,
+        msgs: Union[Sequence[Message], Message],
+        period: float,
+        duration: Optional[float] = None,
+    ) -> ThreadBasedCyclicSendTask:
+        """
+        Start sending messages periodically through the shaper, so they
+        count against the buckets like every other frame.
+
+        See :meth:`can.BusABC.send_periodic` for the parameters. The task
+        is not attached to the bus and has to be stopped by the caller.
+        """
+        return ThreadBasedCyclicSendTask(
+            self, self._lock_send_periodic, msgs, period, duration
+        )
+
+    def _put(self, msgs: Sequence[Message], timeout: Optional[float]):
+        now = time.perf_counter()
+        with self._changed:
+            for msg in msgs:
+                if self._queued >= self.max_queued:
+                    if not self._changed.wait_for(
+                        lambda: self._queued < self.max_queued or not self._running,
+                        timeout,
+                    ):
+                        raise CanError("transmit queue is full")
+                if not self._running:
+                    raise CanError("transmit shaper was stopped")
+                queue = self._queues.get(msg.arbitration_id)
+                if queue is None:
+                    queue = self._queues[msg.arbitration_id] = deque()
+                queue.append((now, next(self._sequence), msg))
+                self._queued += 1
+            self._changed.notify_all()
+
+    def _next(self) -> Tuple[float, float, Message]:
+        """
+        Pick the oldest of the queued frames that may be sent first.
+
+        :return: the seconds until it may be sent, when it was queued and
+                 the frame
+        """
+        now = time.perf_counter()
+        candidates = []
+        for queue in self._queues.values():
+            queued, sequence, msg = queue[0]
+            candidates.append((self._delay(msg, now), sequence, queued, msg))
+        delay, _, queued, msg = min(candidates, key=lambda item: item[:2])
+        return delay, queued, msg
+
+    def _run(self):
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: self._queued or not self._running)
+                if not self._queued:
+                    return
+                delay, queued, msg = self._next()
+                if delay > 0:
+                    # a frame that may go earlier can be queued meanwhile
+                    self._changed.wait(delay)
+                    continue
+                queue = self._queues[msg.arbitration_id]
+                queue.popleft()
+                if not queue:
+                    del self._queues[msg.arbitration_id]
+                self._queued -= 1
+                self._take(msg, time.perf_counter() - queued)
+                self._changed.notify_all()
+            try:
+                self.bus.send(msg)
+            except Exception as error:
+                logger.error("could not send frame: %s", error)
+
+    def stop(self, timeout: float = 1.0):
+        """
+        Send the queued frames and stop the thread of the ``"queue"`` mode.
+        """
+        with self._changed:
+            self._running = False
+            self._changed.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+"""
+This example downloads an image to a simulated ExoTerra node with
+:class:`can.ExoBlockTransfer`, comparing a window of one segment (one
+acknowledgement per frame) with larger windows, on a clean line and with
+lost frames.
+
+Only works on POSIX systems:
+
+    python3 -m examples.exo_block_benchmark [baudrate]
+
+"""
+
+import os
+import random
+import sys
+import time
+
+import can
+from can.exomessage import ExoFrame
+from can.exoblock import SEGMENT_SIZE
+from can.interfaces.exoserial.simulator import ExoSimulator, BITS_PER_BYTE
+from can.interfaces.exocrc import FRAME_LENGTH
+
+IMAGE = os.urandom(16 * 1024)
+WINDOWS = (1, 8, 48)
+LOSS = (0.0, 0.01)
+TURNAROUND = 0.001
+
+
+class Node:
+    """
+    Answers block transfers for the simulator and loses frames at random.
+    """
+
+    def __init__(self):
+        self.server = can.ExoBlockServer(node_id=1)
+        self.loss = 0.0
+
+    def __call__(self, frame):
+        if random.random() < self.loss:
+            return []
+        return [
+            ExoFrame(cob_id, data)
+            for cob_id, data in self.server.on_frame(frame.cob_id, frame.data)
+        ]
+
+
+def main():
+    baudrate = int(sys.argv[1]) if len(sys.argv) > 1 else 115200
+    # payload bytes per second if the line carried nothing but segments
+    line_rate = baudrate / BITS_PER_BYTE / FRAME_LENGTH * SEGMENT_SIZE
+    node = Node()
+    with ExoSimulator(baudrate, node, TURNAROUND) as sim:
+        with can.Bus(
+            interface="exoserial", channel=sim.port, baudrate=baudrate, udp_tap=False
+        ) as bus:
+            transfer = can.ExoBlockTransfer(bus, node_id=1, timeout=0.2, retries=20)
+            notifier = can.Notifier(bus, [transfer], timeout=0.1)
+            time.sleep(0.1)
+            for loss in LOSS:
+                node.loss = loss
+                for window in WINDOWS:
+                    transfer.window = window
+                    duration = transfer.download(0x1F50, 1, IMAGE)
+                    assert node.server.objects[(0x1F50, 1)] == IMAGE
+                    rate = len(IMAGE) / duration
+                    print(
+                        "loss {:>4.0%} window {:>2} {:>8.1f} KiB/s {:>5.0%} of line rate"
+                        " {:>5} segments repeated".format(
+                            loss,
+                            window,
+                            rate / 1024,
+                            rate / line_rate,
+                            transfer.retransmits,
+                        )
+                    )
+            notifier.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+"""
+This example measures the ExoTerra serial interface end to end against the
+pty based device simulator: receive and transmit throughput, how long the
+receiver takes to deliver a frame after a burst of line noise, and the
+latency from the device writing a frame until a :class:`can.Notifier`
+listener sees it.
+
+Only works on POSIX systems:
+
+    python3 -m examples.exo_bus_benchmark [baudrate]
+
+Without a baud rate the simulator writes as fast as the pty allows.
+
+"""
+
+import os
+import struct
+import sys
+import threading
+import time
+
+import can
+from can.exomessage import ExoFrame
+from can.interfaces.exoserial.simulator import ExoSimulator
+
+FRAMES = 20000
+BATCH = 64
+LATENCY_SAMPLES = 1000
+NOISE_TRIALS = 100
+NOISE_BYTES = 256
+
+SEQUENCE = struct.Struct("<I")
+
+
+class Collector(can.Listener):
+    """
+    Records the arrival time of every message by its sequence number.
+    """
+
+    def __init__(self):
+        self.arrivals = {}
+        self.expected = 0
+        self.done = threading.Event()
+
+    def reset(self, expected):
+        self.arrivals = {}
+        self.expected = expected
+        self.done.clear()
+
+    def on_message_received(self, msg):
+        self.arrivals[SEQUENCE.unpack_from(msg.data)[0]] = time.perf_counter()
+        if len(self.arrivals) >= self.expected:
+            self.done.set()
+
+
+def frame(sequence):
+    return ExoFrame(0x180 | sequence & 0x7F, SEQUENCE.pack(sequence).ljust(8, b"\x00"))
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def rx_throughput(sim, collector):
+    collector.reset(FRAMES)
+    start = time.perf_counter()
+    sim.burst([frame(i) for i in range(FRAMES)], BATCH)
+    collector.done.wait(60.0)
+    return len(collector.arrivals) / (max(collector.arrivals.values()) - start)
+
+
+def tx_throughput(sim, bus):
+    msgs = [frame(i).to_message() for i in range(FRAMES)]
+    already = len(sim.received)
+    start = time.perf_counter()
+    for i in range(0, FRAMES, BATCH):
+        bus.send_many(msgs[i : i + BATCH])
+    sim.wait_for(already + FRAMES, 60.0)
+    return (len(sim.received) - already) / (sim.received[-1][0] - start)
+
+
+def latencies(sim, collector, count, noise=0):
+    collector.reset(count)
+    sent = {}
+    for i in range(count):
+        if noise:
+            sent[i] = sim.inject_noise(os.urandom(noise))
+            sim.send(frame(i))
+        else:
+            sent[i] = sim.send(frame(i))
+        # let every frame travel on its own
+        deadline = time.perf_counter() + 0.01
+        while i not in collector.arrivals and time.perf_counter() < deadline:
+            time.sleep(0.0001)
+    collector.done.wait(5.0)
+    return [collector.arrivals[i] - sent[i] for i in sent if i in collector.arrivals]
+
+
+def report(name, samples, expected):
+    print(
+        "{:<22} p50 {:>8.1f} us  p90 {:>8.1f} us  p99 {:>8.1f} us  max {:>8.1f} us"
+        "  ({} of {})".format(
+            name,
+            percentile(samples, 0.5) * 1e6,
+            percentile(samples, 0.9) * 1e6,
+            percentile(samples, 0.99) * 1e6,
+            max(samples) * 1e6,
+            len(samples),
+            expected,
+        )
+    )
+
+
+def main():
+    baudrate = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    collector = Collector()
+    with ExoSimulator(baudrate) as sim:
+        with can.Bus(
+            interface="exoserial",
+            channel=sim.port,
+            baudrate=baudrate or 1000000,
+            rx_buffer_size=FRAMES,
+            udp_tap=False,
+        ) as bus:
+            notifier = can.Notifier(bus, [collector], timeout=0.1)
+            time.sleep(0.1)
+
+            print("rx {:>12.0f} frames/s".format(rx_throughput(sim, collector)))
+            print("tx {:>12.0f} frames/s".format(tx_throughput(sim, bus)))
+            report(
+                "latency", latencies(sim, collector, LATENCY_SAMPLES), LATENCY_SAMPLES
+            )
+            report(
+                "recovery after noise",
+                latencies(sim, collector, NOISE_TRIALS, NOISE_BYTES),
+                NOISE_TRIALS,
+            )
+            print(
+                "dropped {} bytes, {} frames overrun".format(
+                    bus.receiver.decoder.dropped_bytes, bus.receiver.ring.overruns
+                )
+            )
+            notifier.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+"""
+This example compares the throughput of the table driven CRC codec used by the
+ExoTerra interfaces with the crcengine based implementation it replaces.
+
+    python3 -m examples.exo_crc_benchmark
+
+"""
+
+import random
+import timeit
+
+import crcengine
+
+from can.interfaces import exocrc
+
+FRAMES = 10000
+
+
+def build_frames(count):
+    """
+    Creates a contiguous buffer of `count` random frames with valid checksums.
+    """
+    rand = random.Random(0)
+    buf = bytearray()
+    for _ in range(count):
+        frame = bytearray(rand.getrandbits(8) for _ in range(exocrc.FRAME_LENGTH))
+        exocrc.append(frame)
+        buf += frame
+    return buf
+
+
+def crcengine_per_frame(buf):
+    """
+    The previous approach: a new engine per frame.
+    """
+    for offset in range(0, len(buf), exocrc.FRAME_LENGTH):
+        crcobj = crcengine.new("crc16-ibm")
+        crcobj.calculate(buf[offset : offset + 11])
+
+
+def exocrc_per_frame(buf):
+    for offset in range(0, len(buf), exocrc.FRAME_LENGTH):
+        exocrc.verify(buf, offset)
+
+
+def report(name, func, buf, repeat=3):
+    best = min(timeit.repeat(lambda: func(buf), number=1, repeat=repeat))
+    print(
+        "{:<32} {:>10.0f} frames/s {:>8.2f} us/frame".format(
+            name, FRAMES / best, best / FRAMES * 1e6
+        )
+    )
+
+
+def main():
+    buf = build_frames(FRAMES)
+    print("C accelerated path available: {}".format(exocrc._crc_fast is not None))
+    report("crcengine.new() per frame", crcengine_per_frame, buf)
+    report("exocrc.verify() per frame", exocrc_per_frame, buf)
+    report("exocrc.verify_many()", exocrc.verify_many, buf)
+    report(
+        "exocrc table path",
+        lambda b: [
+            exocrc._crc_table(b[o : o + 11])
+            for o in range(0, len(b), exocrc.FRAME_LENGTH)
+        ],
+        buf,
+    )
+
+
+if __name__ == "__main__":
+    main()
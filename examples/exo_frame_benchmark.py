@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+"""
+This example compares the frames/s of the ExoTerra frame codec with the byte
+by byte encoding and decoding the buses used before, and with the vectorized
+NumPy decoder if NumPy is installed.
+
+    python3 -m examples.exo_frame_benchmark
+
+"""
+
+import time
+
+import can
+from can import exomessage
+from can.interfaces import exocrc
+
+FRAMES = 20000
+
+
+def encode_before(msg):
+    byte_msg = bytearray()
+    byte0 = 0xA8
+    byte0 |= (msg.arbitration_id & 0x700) >> 8
+    byte1 = msg.arbitration_id & 0xFF
+    byte2 = (msg.is_remote_frame & 0x1) << 7
+    byte2 |= (msg.is_extended_id & 0x1) << 6
+    byte2 |= 8
+    byte_msg.append(byte0)
+    byte_msg.append(byte1)
+    byte_msg.append(byte2)
+    msg_data = bytearray(8)
+    for i, v in enumerate(msg.data):
+        if i < 8:
+            msg_data[i] = v
+    byte_msg.extend(msg_data)
+    byte_msg.extend(exocrc.crc(byte_msg).to_bytes(2, byteorder="little"))
+    return byte_msg
+
+
+def decode_before(rx_bytes):
+    cob_id = (rx_bytes[0] & 0x7) << 8
+    cob_id |= rx_bytes[1] & 0xFF
+    remote_frame = (rx_bytes[2] & 0x80) >> 7
+    extended_id = (rx_bytes[2] & 0x40) >> 6
+    data = rx_bytes[3:11]
+    return can.Message(
+        timestamp=time.time(),
+        arbitration_id=cob_id,
+        is_remote_frame=remote_frame,
+        is_extended_id=extended_id,
+        data=data,
+    )
+
+
+def report(name, duration):
+    print(
+        "{:<28} {:>10.0f} frames/s {:>8.2f} us/frame".format(
+            name, FRAMES / duration, duration / FRAMES * 1e6
+        )
+    )
+
+
+def main():
+    msgs = [
+        can.Message(arbitration_id=i & 0x7FF, data=i.to_bytes(8, "little"))
+        for i in range(FRAMES)
+    ]
+
+    start = time.perf_counter()
+    for msg in msgs:
+        encode_before(msg)
+    report("encode before", time.perf_counter() - start)
+
+    buf = bytearray(exomessage.FRAME_LENGTH * FRAMES)
+    start = time.perf_counter()
+    for i, msg in enumerate(msgs):
+        exomessage.encode_message_into(buf, i * exomessage.FRAME_LENGTH, msg)
+    report("encode_message_into", time.perf_counter() - start)
+
+    frames = [
+        bytes(buf[i : i + exomessage.FRAME_LENGTH])
+        for i in range(0, len(buf), exomessage.FRAME_LENGTH)
+    ]
+    start = time.perf_counter()
+    for frame in frames:
+        decode_before(frame)
+    report("decode before", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    now = time.time()
+    for frame in frames:
+        exomessage.decode_message(frame, 0, now)
+    report("decode_message", time.perf_counter() - start)
+
+    view = memoryview(buf)
+    start = time.perf_counter()
+    for offset in range(0, len(buf), exomessage.FRAME_LENGTH):
+        exomessage.ExoFrame.decode_from(view, offset)
+    report("ExoFrame.decode_from", time.perf_counter() - start)
+
+    if exomessage.numpy is not None:
+        start = time.perf_counter()
+        exomessage.decode_array(buf)
+        report("decode_array (NumPy)", time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+"""
+This example compares the CPU usage and latency of one ExoSerialBus plus
+Notifier per port with a single ExoMultiSerialBus serving all ports, for 1
+to 16 simulated RS-485 segments.
+
+A child process writes frames stamped with the time they were written to
+the master side of one pty per port, so the CPU time of this process is
+spent on receiving only.
+
+Only works on POSIX systems:
+
+    python3 -m examples.exo_multiport_benchmark
+
+"""
+
+import multiprocessing
+import os
+import struct
+import threading
+import time
+import tty
+
+import can
+from can.exomessage import ExoFrame
+
+PORTS = (1, 2, 4, 8, 16)
+RATE = 500  # frames per second and port
+DURATION = 2.0
+
+STAMP = struct.Struct("<d")
+
+
+def feed(masters, rate, duration):
+    """
+    Write one stamped frame per port every 1 / rate seconds.
+    """
+    frame = bytearray(13)
+    interval = 1.0 / rate
+    end = time.perf_counter() + duration
+    deadline = time.perf_counter()
+    while deadline < end:
+        for master in masters:
+            ExoFrame(0x181, STAMP.pack(time.perf_counter())).encode_into(frame)
+            os.write(master, frame)
+        deadline += interval
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class LatencyListener(can.Listener):
+    def __init__(self):
+        self.latencies = []
+        self.lock = threading.Lock()
+
+    def on_message_received(self, msg):
+        latency = time.perf_counter() - STAMP.unpack_from(msg.data)[0]
+        with self.lock:
+            self.latencies.append(latency)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def open_per_port(names, listener):
+    buses = [
+        can.Bus(interface="exoserial", channel=name, baudrate=1000000, udp_tap=False)
+        for name in names
+    ]
+    notifiers = [can.Notifier(bus, [listener], timeout=0.1) for bus in buses]
+    return buses, notifiers
+
+
+def open_multiport(names, listener):
+    bus = can.Bus(interface="exomultiserial", channel=names, baudrate=1000000)
+    return [bus], [can.Notifier(bus, [listener], timeout=0.1)]
+
+
+def run(ports, open_buses):
+    ptys = [os.openpty() for _ in range(ports)]
+    for master, slave in ptys:
+        tty.setraw(master)
+        tty.setraw(slave)
+    listener = LatencyListener()
+    buses, notifiers = open_buses([os.ttyname(slave) for _, slave in ptys], listener)
+    time.sleep(0.2)
+    threads = threading.active_count()
+
+    feeder = multiprocessing.get_context("fork").Process(
+        target=feed, args=([master for master, _ in ptys], RATE, DURATION)
+    )
+    cpu = time.process_time()
+    feeder.start()
+    feeder.join()
+    time.sleep(0.1)
+    cpu = time.process_time() - cpu
+
+    for notifier in notifiers:
+        notifier.stop()
+    for bus in buses:
+        bus.shutdown()
+    for master, slave in ptys:
+        os.close(slave)
+        os.close(master)
+
+    samples = listener.latencies
+    print(
+        "{:>5} {:<10} {:>4} threads {:>6.1f}% CPU  p50 {:>7.1f} us  p99 {:>7.1f} us"
+        "  {:>6} of {} frames".format(
+            ports,
+            open_buses.__name__[5:],
+            threads,
+            cpu / (DURATION + 0.1) * 100,
+            percentile(samples, 0.5) * 1e6,
+            percentile(samples, 0.99) * 1e6,
+            len(samples),
+            int(ports * RATE * DURATION),
+        )
+    )
+
+
+def main():
+    print("ports {} frames/s per port".format(RATE))
+    for ports in PORTS:
+        for open_buses in (open_per_port, open_multiport):
+            run(ports, open_buses)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+"""
+This example measures the transmit throughput of the ExoTerra serial interface
+over a pseudo terminal, comparing one ``send()`` per message with a batched
+``send_many()``.
+
+Only works on POSIX systems:
+
+    python3 -m examples.exo_send_benchmark
+
+"""
+
+import os
+import threading
+import time
+import tty
+
+import can
+from can.interfaces.exocrc import FRAME_LENGTH
+
+MESSAGES = 20000
+BATCH = 64
+
+
+class PtySink:
+    """
+    Opens a pseudo terminal and counts everything written to its slave side.
+    """
+
+    def __init__(self):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.master)
+        tty.setraw(self.slave)
+        self.name = os.ttyname(self.slave)
+        self.received = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._drain, daemon=True)
+        self.thread.start()
+
+    def _drain(self):
+        while self.running:
+            try:
+                self.received += len(os.read(self.master, 65536))
+            except OSError:
+                break
+
+    def wait_for(self, count, timeout=30.0):
+        end = time.perf_counter() + timeout
+        while self.received < count and time.perf_counter() < end:
+            time.sleep(0.001)
+
+    def close(self):
+        self.running = False
+        os.close(self.slave)
+        os.close(self.master)
+
+
+def run(bus, sink, msgs, batched):
+    sink.received = 0
+    start = time.perf_counter()
+    if batched:
+        for i in range(0, len(msgs), BATCH):
+            bus.send_many(msgs[i : i + BATCH])
+    else:
+        for msg in msgs:
+            bus.send(msg)
+    sink.wait_for(len(msgs) * FRAME_LENGTH)
+    return time.perf_counter() - start
+
+
+def main():
+    sink = PtySink()
+    msgs = [
+        can.Message(arbitration_id=i & 0x7FF, data=i.to_bytes(8, "little"))
+        for i in range(MESSAGES)
+    ]
+    with can.Bus(interface="exoserial", channel=sink.name, baudrate=1000000) as bus:
+        for name, batched in (("send()", False), ("send_many()", True)):
+            duration = run(bus, sink, msgs, batched)
+            print(
+                "{:<14} {:>10.0f} frames/s {:>8.2f} us/frame".format(
+                    name, MESSAGES / duration, duration / MESSAGES * 1e6
+                )
+            )
+    sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+"""
+This example reads many parameters from a simulated ExoTerra device, first
+one request at a time by waiting for every response with ``recv()``, then
+pipelined with :class:`can.ExoTransactions` and a growing number of
+outstanding requests.
+
+Only works on POSIX systems:
+
+    python3 -m examples.exo_transaction_benchmark [baudrate]
+
+The simulated device starts to answer 2 ms after a request arrived.
+
+"""
+
+import sys
+import time
+
+import can
+from can.exomessage import ExoFrame
+from can.interfaces.exoserial.simulator import ExoSimulator
+
+REQUESTS = 500
+OUTSTANDING = (1, 4, 16)
+TURNAROUND = 0.002
+
+
+def respond(frame):
+    data = bytearray(frame.data)
+    data[0] = 0x43
+    return [ExoFrame(frame.cob_id - 0x80, data)]
+
+
+def upload(index):
+    return can.Message(
+        arbitration_id=0x601,
+        is_extended_id=False,
+        data=[0x40, index & 0xFF, index >> 8, 0, 0, 0, 0, 0],
+    )
+
+
+def sequential(bus, requests):
+    for request in requests:
+        bus.send(request)
+        while True:
+            response = bus.recv(1.0)
+            if response is None:
+                raise can.CanError("no response")
+            if response.data[1:4] == request.data[1:4]:
+                break
+
+
+def report(name, duration):
+    print(
+        "{:<16} {:>8.0f} requests/s {:>8.1f} us/request".format(
+            name, REQUESTS / duration, duration / REQUESTS * 1e6
+        )
+    )
+
+
+def main():
+    baudrate = int(sys.argv[1]) if len(sys.argv) > 1 else 115200
+    requests = [upload(0x2000 + i) for i in range(REQUESTS)]
+    with ExoSimulator(baudrate, respond, TURNAROUND) as sim:
+        with can.Bus(
+            interface="exoserial", channel=sim.port, baudrate=baudrate, udp_tap=False
+        ) as bus:
+            time.sleep(0.1)
+            start = time.perf_counter()
+            sequential(bus, requests)
+            report("send + recv", time.perf_counter() - start)
+
+            for outstanding in OUTSTANDING:
+                transactions = can.ExoTransactions(bus, max_outstanding=outstanding)
+                notifier = can.Notifier(bus, [transactions], timeout=0.1)
+                start = time.perf_counter()
+                transactions.request_many(requests)
+                report(
+                    "{} outstanding".format(outstanding), time.perf_counter() - start
+                )
+                notifier.stop()
+                transactions.stop()
+
+
+if __name__ == "__main__":
+    main()
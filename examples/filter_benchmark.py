@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+"""
+This example compares the software filtering of :meth:`can.BusABC.recv`
+before the filters were compiled, walking the list of filter dicts for every
+message, with :class:`can.FilterMatcher`, for growing numbers of filters.
+
+    python3 -m examples.filter_benchmark
+
+"""
+
+import random
+import timeit
+
+import can
+
+COUNTS = (1, 10, 50, 100, 200)
+MESSAGES = 20000
+
+
+def match_list(filters, msg):
+    for _filter in filters:
+        if "extended" in _filter:
+            if _filter["extended"] != msg.is_extended_id:
+                continue
+        if (_filter["can_id"] ^ msg.arbitration_id) & _filter["can_mask"] == 0:
+            return True
+    return False
+
+
+def gateway_filters(count):
+    """
+    Mostly single identifiers, some ranges, half standard and half extended.
+    """
+    filters = []
+    for i in range(count):
+        if i % 2:
+            can_id, can_mask, extended = random.getrandbits(29), 0x1FFFFFFF, True
+        elif i % 10 == 0:
+            can_id, can_mask, extended = random.getrandbits(11), 0x7F0, None
+        else:
+            can_id, can_mask, extended = random.getrandbits(11), 0x7FF, False
+        _filter = {"can_id": can_id, "can_mask": can_mask}
+        if extended is not None:
+            _filter["extended"] = extended
+        filters.append(_filter)
+    return filters
+
+
+def main():
+    random.seed(0)
+    msgs = [
+        can.Message(arbitration_id=random.getrandbits(11), is_extended_id=False)
+        if i % 2
+        else can.Message(arbitration_id=random.getrandbits(29))
+        for i in range(MESSAGES)
+    ]
+    print("{:>8} {:>16} {:>16}".format("filters", "list us/msg", "compiled us/msg"))
+    for count in COUNTS:
+        filters = gateway_filters(count)
+        matcher = can.FilterMatcher(filters)
+        assert [matcher(msg) for msg in msgs] == [match_list(filters, m) for m in msgs]
+        before = timeit.timeit(
+            lambda: [match_list(filters, msg) for msg in msgs], number=1
+        )
+        after = timeit.timeit(lambda: [matcher(msg) for msg in msgs], number=1)
+        print(
+            "{:>8} {:>16.3f} {:>16.3f}".format(
+                count, before / MESSAGES * 1e6, after / MESSAGES * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
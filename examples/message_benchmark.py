@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+"""
+This example measures what creating a :class:`can.Message` costs, with the
+keyword constructor and with the positional path the backends and readers
+use, and how many messages per second the log readers decode, with and
+without ``zero_copy``.
+
+    python3 -m examples.message_benchmark
+
+"""
+
+import os
+import tempfile
+import timeit
+
+import can
+from can import Message
+
+MESSAGES = 50000
+DATA = bytes(range(8))
+
+
+def constructor():
+    return Message(
+        timestamp=1.0,
+        arbitration_id=0x123,
+        is_extended_id=False,
+        is_remote_frame=False,
+        is_error_frame=False,
+        channel=0,
+        dlc=8,
+        data=DATA,
+    )
+
+
+def from_fields(zero_copy=False):
+    return Message._from_fields(
+        1.0, 0x123, False, False, False, 0, 8, DATA, zero_copy=zero_copy
+    )
+
+
+def report(name, duration):
+    print(
+        "{:<36} {:>10.0f} msgs/s {:>8.3f} us/msg".format(
+            name, MESSAGES / duration, duration / MESSAGES * 1e6
+        )
+    )
+
+
+def read(filename, zero_copy):
+    with can.LogReader(filename, zero_copy=zero_copy) as reader:
+        for _ in reader:
+            pass
+
+
+def main():
+    report("Message(...)", timeit.timeit(constructor, number=MESSAGES))
+    for zero_copy in (False, True):
+        suffix = " (zero copy)" if zero_copy else ""
+        report(
+            "Message._from_fields(...)" + suffix,
+            timeit.timeit(lambda: from_fields(zero_copy), number=MESSAGES),
+        )
+
+    msgs = [
+        Message(
+            timestamp=i * 0.001,
+            arbitration_id=i & 0x7FF,
+            is_extended_id=False,
+            channel=0,
+            data=DATA,
+        )
+        for i in range(MESSAGES)
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in ("blf", "asc", "log"):
+            filename = os.path.join(directory, "trace." + extension)
+            with can.Logger(filename) as logger:
+                for msg in msgs:
+                    logger(msg)
+            for zero_copy in (False, True):
+                suffix = " (zero copy)" if zero_copy else ""
+                report(
+                    "read .{}{}".format(extension, suffix),
+                    timeit.timeit(lambda: read(filename, zero_copy), number=1),
+                )
+
+
+if __name__ == "__main__":
+    main()
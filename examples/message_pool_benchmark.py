@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""
+This example decodes a sustained stream of ExoTerra frames with and without a
+:class:`can.MessagePool`, handing the messages to a consumer that works on
+them in batches, and reports the throughput, the garbage collections, the
+time spent in them and the memory allocated while running.
+
+    python3 -m examples.message_pool_benchmark
+
+"""
+
+import gc
+import time
+import tracemalloc
+
+import can
+from can.exomessage import ExoFrame, decode_message
+
+FRAMES = 200000
+BATCH = 1000
+
+
+class GcTimer:
+    """
+    Counts the collections and adds up their durations.
+    """
+
+    def __init__(self):
+        self.collections = 0
+        self.paused = 0.0
+        self._start = 0.0
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+        else:
+            self.collections += 1
+            self.paused += time.perf_counter() - self._start
+
+
+def run(frames, pool):
+    batch = []
+    timer = GcTimer()
+    gc.collect()
+    gc.callbacks.append(timer)
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        batch.append(decode_message(frame, 0, i * 1e-4, pool=pool))
+        if len(batch) == BATCH:
+            for msg in batch:
+                msg.release()
+            batch.clear()
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.callbacks.remove(timer)
+    print(
+        "{:<12} {:>10.0f} frames/s {:>5} collections {:>8.2f} ms in gc"
+        " {:>8.1f} KiB peak".format(
+            "pooled" if pool is not None else "allocated",
+            len(frames) / duration,
+            timer.collections,
+            timer.paused * 1e3,
+            peak / 1024,
+        )
+    )
+
+
+def main():
+    frames = [
+        bytes(ExoFrame(i & 0x7FF, i.to_bytes(8, "little")).encode())
+        for i in range(BATCH)
+    ] * (FRAMES // BATCH)
+    run(frames, None)
+    run(frames, can.MessagePool(size=BATCH))
+
+
+if __name__ == "__main__":
+    main()
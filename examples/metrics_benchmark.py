@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+"""
+This example measures what instrumenting with :class:`can.MetricsRegistry`
+costs, for sending and receiving on the virtual bus and on a serial bus that
+loops back, and for a burst of frames on the virtual bus that a
+:class:`can.Notifier` dispatches to a :class:`can.BufferedReader`.
+The runs with and without metrics alternate, and the median difference in
+CPU time, summed up over all threads, between the two runs of a pair is
+reported.
+
+    python3 -m examples.metrics_benchmark
+
+"""
+
+import statistics
+import time
+
+import can
+
+FRAMES = 5000
+RUNS = 20
+
+
+def send_and_recv(sender, receiver):
+    msg = can.Message(arbitration_id=0x123, data=range(8))
+    for _ in range(FRAMES):
+        sender.send(msg)
+        receiver.recv(0)
+
+
+def notify(sender, reader):
+    msg = can.Message(arbitration_id=0x123, data=range(8))
+    for _ in range(FRAMES):
+        sender.send(msg)
+    for _ in range(FRAMES):
+        reader.get_message(1.0)
+
+
+def main():
+    buses = [can.Bus(interface="virtual", channel="benchmark") for _ in range(2)]
+    buses += [can.Bus(interface="virtual", channel="notified") for _ in range(2)]
+    buses.append(can.Bus("loop://", interface="serial"))
+    reader = can.BufferedReader()
+    notifier = can.Notifier(buses[3], [reader], timeout=0.1)
+
+    for name, function, args in (
+        ("virtual", send_and_recv, (buses[0], buses[1])),
+        ("serial", send_and_recv, (buses[4], buses[4])),
+        ("notify", notify, (buses[2], reader)),
+    ):
+        durations = {False: [], True: []}
+        for _ in range(RUNS):
+            for metered in (False, True):
+                registry = can.MetricsRegistry()
+                if metered:
+                    for obj in buses + [notifier, reader]:
+                        registry.instrument(obj)
+                start = time.process_time()
+                function(*args)
+                durations[metered].append((time.process_time() - start) / FRAMES)
+                if metered:
+                    for obj in buses + [notifier, reader]:
+                        registry.remove(obj)
+        plain = statistics.median(durations[False])
+        overhead = statistics.median(
+            with_metrics - without
+            for without, with_metrics in zip(durations[False], durations[True])
+        )
+        print(
+            "{:<8} {:>6.2f} us/frame  metrics add {:>5.2f} us/frame  {:>+5.1f}%".format(
+                name, plain * 1e6, overhead * 1e6, overhead / plain * 100
+            )
+        )
+
+    notifier.stop()
+    for bus in buses:
+        bus.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+"""
+This example measures the per-frame cost of taking a burst of waiting
+frames out of a bus with :meth:`can.BusABC.recv` and with
+:meth:`can.BusABC.recv_batch`, for the virtual bus and, on POSIX systems,
+the ExoTerra serial bus fed by the simulator.
+
+    python3 -m examples.recv_batch_benchmark
+
+"""
+
+import sys
+import time
+
+import can
+from can.exomessage import ExoFrame
+
+FRAMES = 20000
+BATCH = 256
+
+
+def drain_single(bus):
+    count = 0
+    while bus.recv(0) is not None:
+        count += 1
+    return count
+
+
+def drain_batch(bus):
+    count = 0
+    msgs = bus.recv_batch(BATCH, 0)
+    while msgs:
+        count += len(msgs)
+        msgs = bus.recv_batch(BATCH, 0)
+    return count
+
+
+def report(name, results):
+    single, batch = results
+    print(
+        "{:<10} recv {:>6.2f} us/frame  recv_batch {:>6.2f} us/frame  {:>4.1f}x".format(
+            name, single * 1e6, batch * 1e6, single / batch
+        )
+    )
+
+
+def virtual():
+    sender = can.Bus(interface="virtual", channel="benchmark")
+    bus = can.Bus(interface="virtual", channel="benchmark")
+    msg = can.Message(arbitration_id=0x123, data=range(8))
+    results = []
+    for drain in (drain_single, drain_batch):
+        for _ in range(FRAMES):
+            sender.send(msg)
+        start = time.perf_counter()
+        assert drain(bus) == FRAMES
+        results.append((time.perf_counter() - start) / FRAMES)
+    sender.shutdown()
+    bus.shutdown()
+    return results
+
+
+def exoserial():
+    from can.interfaces.exoserial.simulator import ExoSimulator
+
+    frames = [ExoFrame(i & 0x7FF, i.to_bytes(8, "little")) for i in range(FRAMES)]
+    results = []
+    with ExoSimulator() as sim:
+        with can.Bus(
+            interface="exoserial",
+            channel=sim.port,
+            rx_buffer_size=FRAMES,
+            udp_tap=False,
+        ) as bus:
+            time.sleep(0.1)
+            for drain in (drain_single, drain_batch):
+                sim.burst(frames)
+                # wait until the receiver thread has buffered the whole burst
+                while len(bus.receiver.ring) < FRAMES:
+                    time.sleep(0.01)
+                start = time.perf_counter()
+                assert drain(bus) == FRAMES
+                results.append((time.perf_counter() - start) / FRAMES)
+    return results
+
+
+def main():
+    report("virtual", virtual())
+    if sys.platform != "win32":
+        report("exoserial", exoserial())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+"""
+This example measures the per-frame cost of sending a burst of frames with
+:meth:`can.BusABC.send` in a loop and with :meth:`can.BusABC.send_batch`,
+for the virtual bus and, if it exists, the SocketCAN interface ``vcan0``.
+
+    python3 -m examples.send_batch_benchmark
+
+"""
+
+import time
+
+import can
+
+FRAMES = 20000
+BATCH = 256
+
+
+def send_single(bus, msgs):
+    for msg in msgs:
+        bus.send(msg)
+
+
+def send_batch(bus, msgs):
+    for start in range(0, len(msgs), BATCH):
+        bus.send_batch(msgs[start : start + BATCH])
+
+
+def measure(bus, msgs, drain):
+    results = []
+    for send in (send_single, send_batch):
+        start = time.perf_counter()
+        send(bus, msgs)
+        results.append((time.perf_counter() - start) / len(msgs))
+        drain()
+    return results
+
+
+def report(name, results):
+    single, batch = results
+    print(
+        "{:<10} send {:>6.2f} us/frame  send_batch {:>6.2f} us/frame  {:>4.1f}x".format(
+            name, single * 1e6, batch * 1e6, single / batch
+        )
+    )
+
+
+def virtual(msgs):
+    bus = can.Bus(interface="virtual", channel="benchmark")
+    receiver = can.Bus(interface="virtual", channel="benchmark")
+
+    def drain():
+        while receiver.recv_batch(timeout=0):
+            pass
+
+    results = measure(bus, msgs, drain)
+    bus.shutdown()
+    receiver.shutdown()
+    return results
+
+
+def socketcan(msgs):
+    bus = can.Bus(interface="socketcan", channel="vcan0")
+    results = measure(bus, msgs, lambda: time.sleep(0.1))
+    bus.shutdown()
+    return results
+
+
+def main():
+    msgs = [can.Message(arbitration_id=i & 0x7FF, data=range(8)) for i in range(FRAMES)]
+    report("virtual", virtual(msgs))
+    try:
+        report("socketcan", socketcan(msgs))
+    except (OSError, ImportError) as error:
+        print("socketcan  skipped: {}".format(error))
+
+
+if __name__ == "__main__":
+    main()
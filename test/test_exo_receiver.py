@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the streaming frame decoder of the ExoTerra receiver.
+"""
+
+import unittest
+
+import crcengine
+
+from can.interfaces.receiver import FrameDecoder, FRAME_LENGTH
+
+
+def build_frame(cob_id, data=b"", rtr=False):
+    frame = bytearray(FRAME_LENGTH)
+    frame[0] = 0xA8 | (cob_id & 0x700) >> 8
+    frame[1] = cob_id & 0xFF
+    frame[2] = (rtr & 0x1) << 7 | 8
+    frame[3 : 3 + len(data)] = data
+    crc = crcengine.new("crc16-ibm").calculate(frame[0:11])
+    frame[11:13] = crc.to_bytes(2, byteorder="little")
+    return bytes(frame)
+
+
+class FrameDecoderTest(unittest.TestCase):
+    def setUp(self):
+        self.decoder = FrameDecoder()
+        self.frames = [build_frame(0x100 + i, bytes(range(i, i + 8))) for i in range(5)]
+
+    def test_multiple_frames_in_one_read(self):
+        self.assertEqual(self.decoder.feed(b"".join(self.frames)), self.frames)
+        self.assertEqual(len(self.decoder), 0)
+        self.assertEqual(self.decoder.dropped_bytes, 0)
+
+    def test_split_frames(self):
+        stream = b"".join(self.frames)
+        received = []
+        for i in range(0, len(stream), 5):
+            received.extend(self.decoder.feed(stream[i : i + 5]))
+        self.assertEqual(received, self.frames)
+
+    def test_leading_noise(self):
+        noise = b"\x00\xa9\x13\xaf\xff\xaa\x01"
+        received = self.decoder.feed(noise + self.frames[0])
+        self.assertEqual(received, [self.frames[0]])
+        self.assertEqual(self.decoder.dropped_bytes, len(noise))
+
+    def test_corrupted_frame_is_skipped(self):
+        corrupted = bytearray(self.frames[1])
+        corrupted[5] ^= 0xFF
+        stream = self.frames[0] + bytes(corrupted) + self.frames[2]
+        self.assertEqual(self.decoder.feed(stream), [self.frames[0], self.frames[2]])
+        self.assertEqual(self.decoder.dropped_bytes, FRAME_LENGTH)
+
+    def test_partial_frame_is_kept(self):
+        self.assertEqual(self.decoder.feed(self.frames[0][:7]), [])
+        self.assertEqual(self.decoder.feed(self.frames[0][7:]), [self.frames[0]])
+
+    def test_long_garbage(self):
+        garbage = bytes([0xA8, 0x00, 0x08]) * 3000
+        self.assertEqual(self.decoder.feed(garbage + self.frames[3]), [self.frames[3]])
+        self.assertEqual(self.decoder.good_frames, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
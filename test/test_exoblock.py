@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the windowed ExoTerra block transfers.
+"""
+
+import os
+import time
+import unittest
+
+import can
+from can.exoblock import (
+    ExoBlockTransfer,
+    ExoBlockServer,
+    BlockTransferError,
+    ABORT,
+    ACK,
+    END,
+)
+
+from .config import IS_WINDOWS
+
+if not IS_WINDOWS:
+    from can.interfaces.exoserial.simulator import ExoSimulator
+
+
+class Node(can.Listener):
+    """
+    Serves block downloads on a bus and can lose frames on the way.
+    """
+
+    def __init__(self, bus, server):
+        self.bus = bus
+        self.server = server
+        self.received = 0
+        self.lose_request = lambda count, data: False
+        self.lose_answer = lambda data: False
+
+    def on_message_received(self, msg):
+        self.received += 1
+        if self.lose_request(self.received, msg.data):
+            return
+        for cob_id, data in self.server.on_frame(msg.arbitration_id, bytes(msg.data)):
+            if not self.lose_answer(data):
+                self.bus.send(
+                    can.Message(arbitration_id=cob_id, is_extended_id=False, data=data)
+                )
+
+
+class ExoBlockTransferTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = can.Bus(interface="virtual", channel="exoblock")
+        self.node_bus = can.Bus(interface="virtual", channel="exoblock")
+        self.server = ExoBlockServer(node_id=5)
+        self.node = Node(self.node_bus, self.server)
+        self.transfer = ExoBlockTransfer(self.bus, node_id=5, timeout=0.1)
+        self.notifiers = [
+            can.Notifier(self.node_bus, [self.node], 0.01),
+            can.Notifier(self.bus, [self.transfer], 0.01),
+        ]
+        self.data = os.urandom(1000)
+
+    def tearDown(self):
+        for notifier in self.notifiers:
+            notifier.stop()
+        self.bus.shutdown()
+        self.node_bus.shutdown()
+
+    def test_download(self):
+        for window in (1, 7, 48):
+            self.transfer.window = window
+            self.transfer.download(0x1F50, window, self.data)
+            self.assertEqual(self.server.objects[(0x1F50, window)], self.data)
+            self.assertEqual(self.transfer.retransmits, 0)
+
+    def test_node_window(self):
+        server = ExoBlockServer(node_id=5, window=4)
+        self.node.server = server
+        self.transfer.download(0x2000, 0, self.data)
+        self.assertEqual(server.objects[(0x2000, 0)], self.data)
+
+    def test_progress(self):
+        progress = []
+        self.transfer.window = 10
+        self.transfer.download(
+            0x1F50, 1, self.data, lambda done, total, _: progress.append((done, total))
+        )
+        # 143 segments in blocks of 10
+        self.assertEqual(len(progress), 15)
+        self.assertEqual(progress[-1], (1000, 1000))
+        self.assertEqual(progress, sorted(progress))
+
+    def test_empty(self):
+        self.transfer.download(0x1F50, 1, b"")
+        self.assertEqual(self.server.objects[(0x1F50, 1)], b"")
+
+    def test_lost_segments_are_repeated(self):
+        self.node.lose_request = lambda count, data: data[0] < END and count % 5 == 0
+        self.transfer.download(0x1F50, 1, self.data)
+        self.assertEqual(self.server.objects[(0x1F50, 1)], self.data)
+        self.assertGreater(self.transfer.retransmits, 0)
+
+    def test_lost_acks(self):
+        lost = []
+
+        def lose_answer(data):
+            if data[0] == ACK and len(lost) < 3:
+                lost.append(data)
+                return True
+            return False
+
+        self.node.lose_answer = lose_answer
+        self.transfer.download(0x1F50, 1, self.data)
+        self.assertEqual(self.server.objects[(0x1F50, 1)], self.data)
+        self.assertEqual(len(lost), 3)
+
+    def test_idle_answers_are_not_queued(self):
+        self.transfer.on_message_received(
+            can.Message(arbitration_id=0x585, is_extended_id=False, data=bytes(8))
+        )
+        self.assertTrue(self.transfer._responses.empty())
+
+    def test_no_node(self):
+        transfer = ExoBlockTransfer(self.bus, node_id=6, timeout=0.02, retries=1)
+        with self.assertRaises(BlockTransferError):
+            transfer.download(0x1F50, 1, self.data)
+
+    def test_window_is_checked(self):
+        with self.assertRaises(ValueError):
+            ExoBlockTransfer(self.bus, node_id=5, window=49)
+
+
+class ExoBlockServerTest(unittest.TestCase):
+    def test_crc_mismatch_aborts(self):
+        server = ExoBlockServer(node_id=1)
+        server.on_frame(0x601, bytes([0x3F, 0x00, 0x20, 0x00, 3, 0, 0, 0]))
+        server.on_frame(0x601, bytes([0x81, 1, 2, 3, 0, 0, 0, 0]))
+        answers = server.on_frame(0x601, bytes([END, 0x12, 0x34, 0, 0, 0, 0, 0]))
+        self.assertEqual(answers[0][0], 0x581)
+        self.assertEqual(answers[0][1][0], ABORT)
+        self.assertEqual(server.objects, {})
+
+    def test_other_nodes_are_ignored(self):
+        server = ExoBlockServer(node_id=1)
+        self.assertEqual(
+            server.on_frame(0x602, bytes([0x3F, 0x00, 0x20, 0x00, 3, 0, 0, 0])), []
+        )
+
+
+@unittest.skipIf(IS_WINDOWS, "the simulator needs a pty")
+class ExoBlockSimulatorTest(unittest.TestCase):
+    def test_download(self):
+        server = ExoBlockServer(node_id=3, window=16)
+        sim = ExoSimulator(responder=server.responder)
+        self.addCleanup(sim.close)
+        bus = can.Bus(interface="exoserial", channel=sim.port)
+        self.addCleanup(bus.shutdown)
+        # the receiver resets the input buffer when its thread starts
+        time.sleep(0.1)
+        transfer = ExoBlockTransfer(bus, node_id=3, timeout=0.5)
+        notifier = can.Notifier(bus, [transfer], 0.01)
+        self.addCleanup(notifier.stop)
+        data = os.urandom(200)
+        transfer.download(0x1F50, 2, data)
+        self.assertEqual(server.objects[(0x1F50, 2)], data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the CRC16-IBM codec of the ExoTerra interfaces.
+"""
+
+import random
+import unittest
+
+import crcengine
+
+from can.interfaces import exocrc
+
+
+class ExoCrcTest(unittest.TestCase):
+    def setUp(self):
+        self.reference = crcengine.new("crc16-ibm")
+        rand = random.Random(42)
+        self.frames = []
+        for _ in range(20):
+            frame = bytearray(rand.getrandbits(8) for _ in range(exocrc.FRAME_LENGTH))
+            exocrc.append(frame)
+            self.frames.append(frame)
+
+    def test_check_value(self):
+        self.assertEqual(exocrc.crc(b"123456789"), 0xBB3D)
+        self.assertEqual(exocrc._crc_table(b"123456789"), 0xBB3D)
+
+    def test_matches_crcengine(self):
+        for frame in self.frames:
+            expected = self.reference.calculate(frame[0:11])
+            self.assertEqual(exocrc.crc(memoryview(frame)[0:11]), expected)
+            self.assertEqual(exocrc._crc_table(frame[0:11]), expected)
+            self.assertEqual(frame[11:13], expected.to_bytes(2, byteorder="little"))
+
+    def test_continue_from_previous_value(self):
+        self.assertEqual(exocrc.crc(b"6789", exocrc.crc(b"12345")), 0xBB3D)
+
+    def test_verify(self):
+        frame = self.frames[0]
+        self.assertTrue(exocrc.verify(frame))
+        frame[4] ^= 0x01
+        self.assertFalse(exocrc.verify(frame))
+
+    def test_verify_many(self):
+        self.frames[3][12] ^= 0x80
+        buf = b"".join(self.frames)
+        expected = [i != 3 for i in range(len(self.frames))]
+        self.assertEqual(exocrc.verify_many(buf), expected)
+        self.assertEqual(exocrc.verify_many(memoryview(buf)), expected)
+
+    def test_verify_many_partial_frame(self):
+        with self.assertRaises(ValueError):
+            exocrc.verify_many(bytes(20))
+
+
+if __name__ == "__main__":
+    unittest.main()
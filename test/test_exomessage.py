@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the ExoTerra frame codec.
+"""
+
+import unittest
+import warnings
+
+import crcengine
+
+import can
+from can.exomessage import ExoFrame, ExoMessage, FRAME_LENGTH
+from can import exomessage
+
+
+def reference_frame(cob_id, data, rtr=0, ide=0):
+    """
+    The encoding the buses used before the codec was introduced.
+    """
+    byte_msg = bytearray()
+    byte_msg.append(0xA8 | (cob_id & 0x700) >> 8)
+    byte_msg.append(cob_id & 0xFF)
+    byte_msg.append((rtr & 0x1) << 7 | (ide & 0x1) << 6 | 8)
+    msg_data = bytearray(8)
+    for i, v in enumerate(data):
+        if i < 8:
+            msg_data[i] = v
+    byte_msg.extend(msg_data)
+    crc = crcengine.new("crc16-ibm").calculate(byte_msg)
+    byte_msg.extend(crc.to_bytes(2, byteorder="little"))
+    return byte_msg
+
+
+class ExoFrameTest(unittest.TestCase):
+    def test_encode_matches_reference(self):
+        for cob_id, data, rtr, ide in [
+            (0x123, b"\x01\x02\x03", 0, 0),
+            (0x7FF, bytes(range(8)), 0, 1),
+            (0x000, b"", 1, 0),
+            (0x581, bytes(range(12)), 0, 0),
+        ]:
+            frame = ExoFrame(cob_id, data[:8], bool(rtr), bool(ide))
+            self.assertEqual(frame.encode(), reference_frame(cob_id, data, rtr, ide))
+
+    def test_round_trip_with_offset(self):
+        frames = [ExoFrame(i, bytes([i] * 8), i % 2 == 0, False) for i in range(4)]
+        buf = bytearray(2 + FRAME_LENGTH * len(frames))
+        for i, frame in enumerate(frames):
+            self.assertEqual(frame.encode_into(buf, 2 + i * FRAME_LENGTH), FRAME_LENGTH)
+        view = memoryview(buf)
+        decoded = [
+            ExoFrame.decode_from(view, 2 + i * FRAME_LENGTH, verify=True)
+            for i in range(len(frames))
+        ]
+        self.assertEqual(decoded, frames)
+
+    def test_decode_invalid(self):
+        buf = ExoFrame(0x10, b"abc").encode()
+        buf[5] ^= 0x01
+        ExoFrame.decode_from(buf)
+        with self.assertRaises(ValueError):
+            ExoFrame.decode_from(buf, verify=True)
+
+    def test_index_subindex(self):
+        frame = ExoFrame(0x601, b"\x40\x01\x50\x03\x00\x00\x00\x00")
+        self.assertEqual(frame.index, 0x5001)
+        self.assertEqual(frame.subindex, 3)
+
+    def test_message_conversion(self):
+        msg = can.Message(arbitration_id=0x321, is_extended_id=False, data=b"\x01\x02")
+        frame = ExoFrame.from_message(msg)
+        self.assertEqual(frame.data, b"\x01\x02")
+        decoded = ExoFrame.decode_from(frame.encode()).to_message(timestamp=1.5)
+        self.assertEqual(decoded.arbitration_id, 0x321)
+        self.assertFalse(decoded.is_extended_id)
+        self.assertEqual(decoded.timestamp, 1.5)
+        self.assertEqual(decoded.data, bytearray(b"\x01\x02" + bytes(6)))
+
+    def test_encode_decode_message(self):
+        msg = can.Message(arbitration_id=0x1AB, data=range(8))
+        buf = bytearray(FRAME_LENGTH)
+        exomessage.encode_message_into(buf, 0, msg)
+        self.assertEqual(buf, reference_frame(0x1AB, range(8), 0, 1))
+        decoded = exomessage.decode_message(buf, 0, 2.0)
+        self.assertTrue(decoded.equals(msg, timestamp_delta=None))
+
+    def test_describe(self):
+        buf = ExoFrame(0x123, b"\x01").encode()
+        self.assertEqual(
+            exomessage.describe(buf), " id:0x123: dl:8: d:0100000000000000"
+        )
+        self.assertEqual(exomessage.describe(bytes(FRAME_LENGTH)), "")
+
+    @unittest.skipIf(exomessage.numpy is None, "NumPy is not installed")
+    def test_decode_array(self):
+        frames = [
+            ExoFrame(0x600 + i, bytes([0x40, i, 0x50, i, 0, 0, 0, i])) for i in range(5)
+        ]
+        buf = b"".join(f.encode() for f in frames)
+        arrays = exomessage.decode_array(buf)
+        self.assertEqual(list(arrays["cob_id"]), [f.cob_id for f in frames])
+        self.assertEqual(list(arrays["index"]), [f.index for f in frames])
+        self.assertEqual(list(arrays["subindex"]), [f.subindex for f in frames])
+        self.assertEqual(arrays["data"].shape, (5, 8))
+        self.assertEqual(bytes(arrays["data"][2]), frames[2].data)
+        self.assertEqual(
+            list(arrays["crc"]),
+            [buf[i * 13 + 11] | buf[i * 13 + 12] << 8 for i in range(5)],
+        )
+        with self.assertRaises(ValueError):
+            exomessage.decode_array(buf[:-1])
+
+    def test_exo_message_is_deprecated(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            msg = ExoMessage(0x12, b"\x01\x02")
+        self.assertEqual(caught[0].category, DeprecationWarning)
+        self.assertEqual(msg.arbitration_id, 0x12)
+        self.assertEqual(msg.dlc, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
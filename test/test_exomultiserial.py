@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the multi port ExoTerra serial interface against several
+pty based device simulators.
+"""
+
+import time
+import unittest
+import unittest.mock
+
+import can
+from can.exomessage import ExoFrame
+
+from .config import IS_WINDOWS
+
+if not IS_WINDOWS:
+    from can.interfaces.exoserial.simulator import ExoSimulator
+
+
+@unittest.skipIf(IS_WINDOWS, "the simulator needs a pty")
+class ExoMultiSerialBusTest(unittest.TestCase):
+    def setUp(self):
+        self.sims = [ExoSimulator() for _ in range(3)]
+        self.bus = can.Bus(
+            interface="exomultiserial", channel=[sim.port for sim in self.sims]
+        )
+
+    def tearDown(self):
+        self.bus.shutdown()
+        for sim in self.sims:
+            sim.close()
+
+    def test_channel_string(self):
+        bus = can.Bus(
+            interface="exomultiserial",
+            channel=",".join(sim.port for sim in self.sims[:2]),
+        )
+        try:
+            self.assertEqual(bus.channels, [sim.port for sim in self.sims[:2]])
+        finally:
+            bus.shutdown()
+
+    def test_no_channel(self):
+        with self.assertRaises(ValueError):
+            can.Bus(interface="exomultiserial", channel="")
+
+    def test_loop_url_is_rejected(self):
+        with self.assertRaises(can.CanError):
+            can.Bus(interface="exomultiserial", channel="loop://")
+
+    def test_fileno(self):
+        self.assertGreaterEqual(self.bus.fileno(), 0)
+        with unittest.mock.patch("platform.system", return_value="Windows"):
+            self.assertEqual(self.bus.fileno(), -1)
+
+    def test_receive_tags_channel(self):
+        for i, sim in enumerate(self.sims):
+            sim.burst([ExoFrame(0x180 + i, bytes([i, n])) for n in range(50)])
+        received = {sim.port: [] for sim in self.sims}
+        for _ in range(150):
+            msg = self.bus.recv(2.0)
+            self.assertIsNotNone(msg)
+            received[msg.channel].append(msg)
+        for i, sim in enumerate(self.sims):
+            msgs = received[sim.port]
+            self.assertEqual([msg.data[1] for msg in msgs], list(range(50)))
+            self.assertTrue(all(msg.arbitration_id == 0x180 + i for msg in msgs))
+        self.assertIsNone(self.bus.recv(0))
+
+    def test_send_routing(self):
+        self.bus.send(
+            can.Message(arbitration_id=0x601, data=[1], channel=self.sims[2].port)
+        )
+        self.bus.send(can.Message(arbitration_id=0x602, data=[2]))
+        self.assertTrue(self.sims[2].wait_for(1))
+        self.assertTrue(self.sims[0].wait_for(1))
+        self.assertEqual(
+            ExoFrame.decode_from(self.sims[2].received[0][1]).cob_id, 0x601
+        )
+        self.assertEqual(
+            ExoFrame.decode_from(self.sims[0].received[0][1]).cob_id, 0x602
+        )
+        time.sleep(0.05)
+        self.assertEqual(self.sims[1].received, [])
+
+    def test_send_unknown_channel(self):
+        with self.assertRaises(ValueError):
+            self.bus.send(can.Message(arbitration_id=1, channel="/dev/nothing"))
+
+    def test_send_many(self):
+        msgs = [
+            can.Message(
+                arbitration_id=0x100 + i, data=[i], channel=self.sims[i % 3].port
+            )
+            for i in range(30)
+        ]
+        self.bus.send_many(msgs)
+        for i, sim in enumerate(self.sims):
+            self.assertTrue(sim.wait_for(10))
+            cob_ids = [ExoFrame.decode_from(frame).cob_id for _, frame in sim.received]
+            self.assertEqual(cob_ids, [0x100 + n for n in range(i, 30, 3)])
+
+    def test_notifier(self):
+        received = []
+        notifier = can.Notifier(self.bus, [received.append], timeout=0.1)
+        try:
+            for sim in self.sims:
+                sim.send(ExoFrame(0x181))
+            deadline = time.time() + 2.0
+            while len(received) < 3 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            notifier.stop()
+        self.assertEqual(
+            sorted(msg.channel for msg in received),
+            sorted(sim.port for sim in self.sims),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
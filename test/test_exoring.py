@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the receive ring buffer of the ExoTerra interfaces.
+"""
+
+import select
+import threading
+import time
+import unittest
+import unittest.mock
+
+from can.interfaces.exoring import FrameRing, DROP_OLDEST, DROP_NEWEST, BLOCK
+
+from .config import IS_WINDOWS
+
+
+def frame(n):
+    return bytes([n]) * 13
+
+
+class FrameRingTest(unittest.TestCase):
+    def test_fifo_order_and_timestamps(self):
+        ring = FrameRing(4)
+        for i in range(3):
+            ring.put(frame(i), timestamp=float(i))
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(ring.drain(), [(frame(i), float(i)) for i in range(3)])
+        self.assertEqual(len(ring), 0)
+
+    def test_wrap_around(self):
+        ring = FrameRing(3)
+        received = []
+        for i in range(10):
+            ring.put(frame(i))
+            if i % 2:
+                received.extend(f for f, _ in ring.drain())
+        self.assertEqual(received, [frame(i) for i in range(10)])
+        self.assertEqual(ring.overruns, 0)
+        self.assertEqual(ring.high_water, 2)
+
+    def test_drop_oldest(self):
+        ring = FrameRing(2, DROP_OLDEST)
+        self.assertEqual(ring.put_many([frame(i) for i in range(5)]), 5)
+        self.assertEqual([f for f, _ in ring.drain()], [frame(3), frame(4)])
+        self.assertEqual(ring.overruns, 3)
+        self.assertEqual(ring.total, 5)
+
+    def test_drop_newest(self):
+        ring = FrameRing(2, DROP_NEWEST)
+        self.assertEqual(ring.put_many([frame(i) for i in range(5)]), 2)
+        self.assertFalse(ring.put(frame(9)))
+        self.assertEqual([f for f, _ in ring.drain()], [frame(0), frame(1)])
+        self.assertEqual(ring.overruns, 4)
+
+    def test_block_times_out(self):
+        ring = FrameRing(1, BLOCK)
+        self.assertTrue(ring.put(frame(0)))
+        self.assertFalse(ring.put(frame(1), timeout=0.01))
+        self.assertEqual(ring.overruns, 1)
+
+    def test_block_waits_for_consumer(self):
+        ring = FrameRing(1, BLOCK)
+        ring.put(frame(0))
+        consumer = threading.Timer(0.05, ring.drain)
+        consumer.start()
+        self.assertTrue(ring.put(frame(1), timeout=2.0))
+        consumer.join()
+        self.assertEqual(ring.get(), (frame(1), unittest.mock.ANY))
+
+    def test_drain_max_frames(self):
+        ring = FrameRing(8)
+        ring.put_many([frame(i) for i in range(5)])
+        self.assertEqual(len(ring.drain(2)), 2)
+        self.assertEqual(len(ring.drain()), 3)
+
+    def test_drain_timeout(self):
+        ring = FrameRing(8)
+        start = time.time()
+        self.assertEqual(ring.drain(timeout=0.05), [])
+        self.assertGreaterEqual(time.time() - start, 0.04)
+        self.assertIsNone(ring.get())
+
+    def test_close_wakes_up_reader(self):
+        ring = FrameRing(8)
+        threading.Timer(0.05, ring.close).start()
+        self.assertEqual(ring.drain(timeout=None), [])
+
+    @unittest.skipIf(not hasattr(select, "poll"), "needs select.poll")
+    def test_fileno_readiness(self):
+        ring = FrameRing(8)
+        poller = select.poll()
+        poller.register(ring.fileno(), select.POLLIN)
+        self.assertEqual(poller.poll(0), [])
+        ring.put_many([frame(1), frame(2)])
+        self.assertEqual(len(poller.poll(0)), 1)
+        self.assertEqual(len(ring.drain()), 2)
+        # stays readable until a drain observes the empty buffer
+        self.assertEqual(len(poller.poll(0)), 1)
+        self.assertEqual(ring.drain(), [])
+        self.assertEqual(poller.poll(0), [])
+
+    @unittest.skipIf(IS_WINDOWS, "fileno is not supported on Windows")
+    def test_fileno_created_late(self):
+        ring = FrameRing(8)
+        ring.put(frame(1))
+        fd = ring.fileno()
+        self.assertEqual(select.select([fd], [], [], 0)[0], [fd])
+
+    def test_fileno_windows(self):
+        ring = FrameRing(8)
+        with unittest.mock.patch("platform.system", return_value="Windows"):
+            with self.assertRaises(NotImplementedError):
+                ring.fileno()
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            FrameRing(0)
+        with self.assertRaises(ValueError):
+            FrameRing(4, "drop_everything")
+
+
+if __name__ == "__main__":
+    unittest.main()
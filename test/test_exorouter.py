@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the object dictionary router for ExoTerra traffic.
+"""
+
+import unittest
+
+import can
+from can.exorouter import ExoRouter, ObjectSlot
+
+
+def sdo(cob_id, index, subindex, value=0):
+    return can.Message(
+        arbitration_id=cob_id,
+        data=[0x43, index & 0xFF, index >> 8, subindex]
+        + list(value.to_bytes(4, "little")),
+    )
+
+
+class ExoRouterTest(unittest.TestCase):
+    def setUp(self):
+        self.router = ExoRouter()
+
+    def test_dispatch_by_object(self):
+        statusword, position = [], []
+        self.router.subscribe(0x581, 0x6041, 0, statusword.append)
+        self.router.subscribe(0x581, 0x6064, 0, position.append)
+        msgs = [sdo(0x581, 0x6041, 0), sdo(0x581, 0x6064, 0), sdo(0x581, 0x6064, 1)]
+        for msg in msgs:
+            self.router(msg)
+        self.assertEqual(statusword, [msgs[0]])
+        self.assertEqual(position, [msgs[1]])
+        self.assertEqual(self.router.unmatched, 1)
+
+    def test_several_handlers(self):
+        first, second = [], []
+        self.router.subscribe(0x581, 0x1000, 0, first.append)
+        self.router.subscribe(0x581, 0x1000, 0, second.append)
+        msg = sdo(0x581, 0x1000, 0)
+        self.router(msg)
+        self.assertEqual(first, [msg])
+        self.assertEqual(second, [msg])
+
+    def test_cob_id_handler(self):
+        objects, pdos = [], []
+        self.router.subscribe(0x181, 0x2000, 1, objects.append)
+        self.router.subscribe(0x181, None, 0, pdos.append)
+        msgs = [sdo(0x181, 0x2000, 1), can.Message(arbitration_id=0x181, data=[1])]
+        for msg in msgs:
+            self.router(msg)
+        self.assertEqual(objects, msgs[:1])
+        self.assertEqual(pdos, msgs)
+
+    def test_default(self):
+        unrouted = []
+        router = ExoRouter(default=unrouted.append)
+        msg = sdo(0x581, 0x6041, 0)
+        router(msg)
+        self.assertEqual(unrouted, [msg])
+        self.assertEqual(router.unmatched, 1)
+
+    def test_track(self):
+        slot = self.router.track(0x581, 0x6064, 0)
+        self.assertIsInstance(slot, ObjectSlot)
+        self.assertIsNone(slot.data)
+        for value in range(3):
+            self.router(sdo(0x581, 0x6064, 0, value))
+        self.assertEqual(slot.count, 3)
+        self.assertEqual(int.from_bytes(slot.data[4:8], "little"), 2)
+
+    def test_unsubscribe(self):
+        received = []
+        handler = self.router.subscribe(0x581, 0x6041, 0, received.append)
+        self.router.unsubscribe(0x581, 0x6041, 0, handler)
+        self.router(sdo(0x581, 0x6041, 0))
+        self.assertEqual(received, [])
+        with self.assertRaises(ValueError):
+            self.router.unsubscribe(0x581, 0x6041, 0, handler)
+
+    def test_short_message(self):
+        self.router.subscribe(0x581, 0x6041, 0, self.fail)
+        self.router(can.Message(arbitration_id=0x581, data=[0x41, 0x60]))
+        self.assertEqual(self.router.unmatched, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
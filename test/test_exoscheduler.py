@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the transmit scheduler of the ExoTerra serial interface.
+"""
+
+import threading
+import time
+import unittest
+
+import can
+from can.interfaces.exoscheduler import TxScheduler
+
+
+class Line:
+    """
+    Records the frames and the times they were written.
+    """
+
+    def __init__(self):
+        self.frames = []
+        self.times = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def write(self, frame):
+        self.release.wait(1.0)
+        self.times.append(time.perf_counter())
+        self.frames.append(frame)
+
+
+class TxSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.line = Line()
+        self.scheduler = None
+
+    def tearDown(self):
+        if self.scheduler is not None:
+            self.scheduler.stop()
+
+    def wait_for(self, count, timeout=2.0):
+        end = time.perf_counter() + timeout
+        while len(self.line.frames) < count and time.perf_counter() < end:
+            time.sleep(0.001)
+        self.assertEqual(len(self.line.frames), count)
+
+    def test_lowest_id_first(self):
+        self.scheduler = TxScheduler(self.line.write)
+        self.line.release.clear()
+        self.scheduler.put(0x7FF, b"first")
+        time.sleep(0.05)
+        self.scheduler.put_many(
+            [(0x601, b"sdo"), (0x181, b"pdo 1"), (0x300, b"pdo 2"), (0x181, b"pdo 3")]
+        )
+        self.line.release.set()
+        self.wait_for(5)
+        self.assertEqual(
+            self.line.frames, [b"first", b"pdo 1", b"pdo 3", b"pdo 2", b"sdo"]
+        )
+
+    def test_inter_frame_gap(self):
+        self.scheduler = TxScheduler(self.line.write, inter_frame_gap=0.02)
+        self.scheduler.put_many([(0x100, b"x")] * 5)
+        self.wait_for(5)
+        gaps = [b - a for a, b in zip(self.line.times, self.line.times[1:])]
+        self.assertGreaterEqual(min(gaps), 0.019)
+
+    def test_frame_time(self):
+        self.scheduler = TxScheduler(self.line.write, baudrate=13000)
+        # 130 bits take 10 ms at 13000 baud
+        self.scheduler.put_many([(0x100, b"x")] * 3)
+        self.wait_for(3)
+        self.assertGreaterEqual(self.line.times[2] - self.line.times[0], 0.019)
+
+    def test_turnaround_gap(self):
+        self.scheduler = TxScheduler(self.line.write, turnaround_gap=0.05)
+        self.scheduler.note_rx()
+        received = time.perf_counter()
+        self.scheduler.put(0x100, b"x")
+        self.wait_for(1)
+        self.assertGreaterEqual(self.line.times[0] - received, 0.049)
+
+    def test_stats(self):
+        self.scheduler = TxScheduler(self.line.write)
+        self.line.release.clear()
+        self.scheduler.put_many([(0x080, b"emcy"), (0x181, b"pdo"), (0x601, b"sdo")])
+        time.sleep(0.05)
+        self.line.release.set()
+        self.wait_for(3)
+        stats = self.scheduler.stats
+        self.assertEqual(stats["nmt/sync/emcy"].count, 1)
+        self.assertEqual(stats["pdo"].count, 1)
+        self.assertEqual(stats["sdo"].count, 1)
+        self.assertEqual(stats["other"].count, 0)
+        self.assertGreater(stats["sdo"].max, 0.04)
+        self.assertEqual(stats["other"].mean, 0.0)
+
+    def test_queue_full(self):
+        self.scheduler = TxScheduler(self.line.write, max_pending=2)
+        self.line.release.clear()
+        self.scheduler.put(0x100, b"written")
+        time.sleep(0.05)
+        self.scheduler.put_many([(0x100, b"a"), (0x100, b"b")])
+        with self.assertRaises(can.CanError):
+            self.scheduler.put(0x100, b"c", timeout=0.05)
+        self.line.release.set()
+
+    def test_stop_sends_queued_frames(self):
+        self.scheduler = TxScheduler(self.line.write, inter_frame_gap=0.01)
+        self.scheduler.put_many([(0x100, b"x")] * 5)
+        self.scheduler.stop()
+        self.assertEqual(len(self.line.frames), 5)
+        with self.assertRaises(can.CanError):
+            self.scheduler.put(0x100, b"x")
+
+
+class ExoSerialSchedulerTest(unittest.TestCase):
+    def test_send_through_scheduler(self):
+        with can.Bus(
+            interface="exoserial", channel="loop://", tx_scheduler=True, udp_tap=False
+        ) as bus:
+            bus.send_many(
+                [can.Message(arbitration_id=0x600 - i, data=[i]) for i in range(3)]
+            )
+            bus.send(can.Message(arbitration_id=0x123, data=[9]))
+            received = [bus.recv(1.0) for _ in range(4)]
+            self.assertEqual(
+                sorted(msg.arbitration_id for msg in received),
+                [0x123, 0x5FE, 0x5FF, 0x600],
+            )
+            self.assertEqual(sum(s.count for s in bus.scheduler.stats.values()), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
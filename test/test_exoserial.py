@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the ExoTerra serial interface over a pyserial loopback.
+"""
+
+import asyncio
+import time
+import unittest
+
+import can
+
+from .config import IS_WINDOWS
+
+
+class ExoSerialBusTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = can.Bus(interface="exoserial", channel="loop://")
+
+    def tearDown(self):
+        self.bus.shutdown()
+
+    def test_send_and_receive(self):
+        msg = can.Message(arbitration_id=0x123, is_extended_id=False, data=[1, 2, 3])
+        self.bus.send(msg)
+        received = self.bus.recv(1.0)
+        self.assertIsNotNone(received)
+        self.assertEqual(received.arbitration_id, 0x123)
+        self.assertEqual(received.data, bytearray([1, 2, 3, 0, 0, 0, 0, 0]))
+
+    def test_zero_copy(self):
+        bus = can.Bus(interface="exoserial", channel="loop://", zero_copy=True)
+        self.addCleanup(bus.shutdown)
+        bus.send(can.Message(arbitration_id=0x123, data=[1, 2]))
+        received = bus.recv(1.0)
+        self.assertIsInstance(received.data, bytes)
+        received.writable_data()[0] = 0xFF
+        self.assertEqual(received.data[:2], b"\xff\x02")
+        self.bus.send(can.Message(arbitration_id=0x123, data=[1, 2]))
+        self.assertIsInstance(self.bus.recv(1.0).data, bytearray)
+
+    def test_send_many(self):
+        msgs = [can.Message(arbitration_id=0x100 + i, data=[i] * i) for i in range(9)]
+        self.bus.send_many(msgs)
+        for msg in msgs:
+            received = self.bus.recv(1.0)
+            self.assertEqual(received.arbitration_id, msg.arbitration_id)
+            self.assertEqual(received.data[: len(msg.data)], msg.data[:8])
+        self.assertEqual(self.bus.receiver.decoder.dropped_bytes, 0)
+
+    def test_send_many_matches_send(self):
+        msg = can.Message(arbitration_id=0x7FF, is_remote_frame=True)
+        self.bus.send(msg)
+        self.bus.send_many([msg])
+        first, second = self.bus.get_int_q().get(), self.bus.get_int_q().get()
+        self.assertEqual(first, second)
+
+    def test_recv_honors_timeout(self):
+        start = time.time()
+        self.assertIsNone(self.bus.recv(0.1))
+        self.assertLess(time.time() - start, 1.0)
+        self.assertIsNone(self.bus.recv(0))
+
+    @unittest.skipIf(IS_WINDOWS, "fileno is not supported on Windows")
+    def test_asyncio_notifier(self):
+        loop = asyncio.new_event_loop()
+        try:
+            received = []
+            done = loop.create_future()
+
+            def on_message(msg):
+                received.append(msg)
+                if len(received) == 3:
+                    done.set_result(True)
+
+            notifier = can.Notifier(self.bus, [on_message], loop=loop)
+            self.assertTrue(all(isinstance(r, int) for r in notifier._readers))
+            for i in range(3):
+                self.bus.send(can.Message(arbitration_id=i, data=[i]))
+
+            loop.run_until_complete(asyncio.wait_for(done, 2.0))
+            self.assertEqual([m.arbitration_id for m in received], [0, 1, 2])
+            notifier.stop()
+        finally:
+            loop.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the ExoTerra serial interface against the pty based
+device simulator.
+"""
+
+import time
+import unittest
+
+import can
+from can.exomessage import ExoFrame
+from can.interfaces.exocrc import FRAME_LENGTH
+
+from .config import IS_WINDOWS
+
+if not IS_WINDOWS:
+    from can.interfaces.exoserial.simulator import ExoSimulator
+
+
+@unittest.skipIf(IS_WINDOWS, "the simulator needs a pty")
+class ExoSimulatorTest(unittest.TestCase):
+    def setUp(self):
+        self.sim = ExoSimulator()
+        self.bus = can.Bus(interface="exoserial", channel=self.sim.port)
+        # the receiver resets the input buffer when its thread starts
+        time.sleep(0.1)
+
+    def tearDown(self):
+        self.bus.shutdown()
+        self.sim.close()
+
+    def assertReceived(self, frames):
+        for frame in frames:
+            msg = self.bus.recv(2.0)
+            self.assertIsNotNone(msg)
+            self.assertEqual(msg.arbitration_id, frame.cob_id)
+            self.assertEqual(bytes(msg.data), frame.data.ljust(8, b"\x00"))
+
+    def test_burst(self):
+        frames = [ExoFrame(i & 0x7FF, i.to_bytes(8, "little")) for i in range(500)]
+        self.sim.burst(frames)
+        self.assertReceived(frames)
+        self.assertEqual(self.bus.receiver.decoder.dropped_bytes, 0)
+
+    def test_recovers_from_noise(self):
+        frame = ExoFrame(0x181, b"\x01\x02\x03")
+        noise = b"\xa8\x00\x08\xff" * 10
+        self.sim.inject_noise(noise)
+        self.sim.send(frame)
+        self.assertReceived([frame])
+        self.assertEqual(self.bus.receiver.decoder.dropped_bytes, len(noise))
+
+    def test_partial_frame(self):
+        frames = [ExoFrame(0x201, b"\xaa" * 8), ExoFrame(0x202, b"\xbb" * 8)]
+        self.sim.send_partial(frames[0], 5)
+        self.sim.send_partial(frames[1], FRAME_LENGTH - 1)
+        self.assertReceived(frames)
+
+    def test_device_receives_frames(self):
+        msgs = [can.Message(arbitration_id=0x600 + i, data=[i] * 4) for i in range(3)]
+        for msg in msgs:
+            self.bus.send(msg)
+        self.assertTrue(self.sim.wait_for(len(msgs)))
+        expected = [bytes(ExoFrame.from_message(msg).encode()) for msg in msgs]
+        self.assertEqual([frame for _, frame in self.sim.received], expected)
+
+    def test_responder(self):
+        self.sim.responder = lambda frame: [ExoFrame(frame.cob_id - 0x80, frame.data)]
+        self.bus.send(can.Message(arbitration_id=0x601, data=[0x40, 0x00, 0x10, 0x00]))
+        self.assertReceived([ExoFrame(0x581, b"\x40\x00\x10\x00\x00\x00\x00\x00")])
+
+    def test_response_delay(self):
+        self.sim.response_delay = 0.05
+        self.sim.responder = lambda frame: [ExoFrame(frame.cob_id - 0x80, frame.data)]
+        start = time.perf_counter()
+        self.bus.send(can.Message(arbitration_id=0x601, data=[0x40]))
+        self.assertReceived([ExoFrame(0x581, b"\x40")])
+        self.assertGreater(time.perf_counter() - start, 0.05)
+
+    def test_baud_pacing(self):
+        self.sim.baudrate = 115200
+        frames = [ExoFrame(0x100, bytes(8))] * 100
+        start = time.perf_counter()
+        self.sim.burst(frames, chunk=10)
+        # 1300 bytes with 10 bits each take about 113 ms at 115200 baud
+        self.assertGreater(time.perf_counter() - start, 0.1)
+        self.assertReceived(frames)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the ExoTerra socket interface against a local TCP server
+that stands in for the bridge.
+"""
+
+import select
+import socket
+import threading
+import time
+import unittest
+
+import can
+from can.interfaces import exocrc
+
+
+def build_frame(cob_id, n):
+    frame = bytearray(exocrc.FRAME_LENGTH)
+    frame[0] = 0xA8 | (cob_id & 0x700) >> 8
+    frame[1] = cob_id & 0xFF
+    frame[2] = 8
+    frame[3:11] = n.to_bytes(8, "little")
+    exocrc.append(frame)
+    return bytes(frame)
+
+
+class BridgeStandIn:
+    """
+    Accepts one connection at a time, replays a byte stream and records
+    everything it receives.
+    """
+
+    def __init__(self, port=0):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(("127.0.0.1", port))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+        self.connection = None
+        self.received = bytearray()
+        self.accepted = threading.Event()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        try:
+            self.connection, _ = self.server.accept()
+        except OSError:
+            return
+        self.accepted.set()
+        while True:
+            try:
+                data = self.connection.recv(4096)
+            except OSError:
+                return
+            if not data:
+                return
+            self.received += data
+
+    def replay(self, data, chunk=1000):
+        self.accepted.wait(2.0)
+        for i in range(0, len(data), chunk):
+            self.connection.sendall(data[i : i + chunk])
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.shutdown(socket.SHUT_RDWR)
+            self.connection.close()
+        self.server.close()
+
+
+class ExoSocketBusTest(unittest.TestCase):
+    def setUp(self):
+        self.bridge = BridgeStandIn()
+        self.bus = can.Bus(
+            interface="exosocket",
+            channel="bridge",
+            port=self.bridge.port,
+            reconnect_delay=0.01,
+            # let TCP push back on the bridge instead of dropping frames
+            rx_overflow="block",
+        )
+
+    def tearDown(self):
+        self.bus.shutdown()
+        self.bridge.close()
+
+    def test_high_rate_replay(self):
+        count = 5000
+        stream = b"".join(build_frame(i & 0x7FF, i) for i in range(count))
+        threading.Thread(target=self.bridge.replay, args=(stream, 997)).start()
+        for i in range(count):
+            msg = self.bus.recv(2.0)
+            self.assertIsNotNone(msg)
+            self.assertEqual(msg.arbitration_id, i & 0x7FF)
+            self.assertEqual(int.from_bytes(msg.data, "little"), i)
+
+    def test_corrupted_frames_are_dropped(self):
+        bad = bytearray(build_frame(0x10, 1))
+        bad[7] ^= 0x55
+        self.bridge.replay(b"\x00\x01" + bytes(bad) + build_frame(0x20, 2))
+        msg = self.bus.recv(2.0)
+        self.assertEqual(msg.arbitration_id, 0x20)
+        self.assertIsNone(self.bus.recv(0.05))
+
+    def test_recv_honors_timeout(self):
+        start = time.time()
+        self.assertIsNone(self.bus.recv(0.1))
+        self.assertLess(time.time() - start, 1.0)
+
+    def test_send(self):
+        self.bus.send(can.Message(arbitration_id=0x123, data=[1, 2, 3]))
+        end = time.time() + 2.0
+        while len(self.bridge.received) < exocrc.FRAME_LENGTH and time.time() < end:
+            time.sleep(0.01)
+        self.assertTrue(exocrc.verify(self.bridge.received))
+        self.assertEqual(self.bridge.received[1], 0x23)
+
+    def test_concurrent_send(self):
+        count = 500
+
+        def send_all(cob_id):
+            for i in range(count):
+                self.bus.send(can.Message(arbitration_id=cob_id, data=[i & 0xFF]))
+
+        threads = [threading.Thread(target=send_all, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        expected = 4 * count * exocrc.FRAME_LENGTH
+        end = time.time() + 2.0
+        while len(self.bridge.received) < expected and time.time() < end:
+            time.sleep(0.01)
+        received = bytes(self.bridge.received)
+        self.assertEqual(len(received), expected)
+        # the frames of the senders did not interleave
+        for offset in range(0, expected, exocrc.FRAME_LENGTH):
+            self.assertTrue(
+                exocrc.verify(received[offset : offset + exocrc.FRAME_LENGTH])
+            )
+
+    def test_reconnect(self):
+        self.bridge.replay(build_frame(0x1, 1))
+        self.assertEqual(self.bus.recv(2.0).arbitration_id, 0x1)
+        port = self.bridge.port
+        self.bridge.close()
+        self.assertIsNone(self.bus.recv(0.1))
+
+        self.bridge = BridgeStandIn(port)
+        threading.Thread(target=self.bridge.replay, args=(build_frame(0x2, 2),)).start()
+        self.assertEqual(self.bus.recv(2.0).arbitration_id, 0x2)
+        self.assertEqual(self.bus.reconnects, 1)
+
+    def test_fileno_survives_reconnect(self):
+        fileno = self.bus.fileno()
+        self.assertGreaterEqual(fileno, 0)
+        self.assertEqual(select.select([fileno], [], [], 0)[0], [])
+        port = self.bridge.port
+        self.bridge.close()
+        self.bridge = BridgeStandIn(port)
+        # nobody calls recv(), the bus reconnects on its own
+        self.assertTrue(self.bridge.accepted.wait(2.0))
+        self.bridge.replay(build_frame(0x3, 3))
+        self.assertEqual(select.select([fileno], [], [], 2.0)[0], [fileno])
+        self.assertEqual(self.bus.fileno(), fileno)
+        self.assertEqual(self.bus.recv(0).arbitration_id, 0x3)
+
+    def test_recv_batch(self):
+        self.bus.message_pool = can.MessagePool(8)
+        self.bridge.replay(b"".join(build_frame(0x10 + i, i) for i in range(5)))
+        msgs = []
+        end = time.time() + 2.0
+        while len(msgs) < 5 and time.time() < end:
+            msgs += self.bus.recv_batch(max_messages=3, timeout=0.1)
+        self.assertEqual(
+            [msg.arbitration_id for msg in msgs], [0x10, 0x11, 0x12, 0x13, 0x14]
+        )
+        self.assertIsInstance(msgs[0], can.PooledMessage)
+        self.assertEqual(self.bus.message_pool.created, 5)
+
+    def test_multibus_reconnect(self):
+        bus = can.MultiBus([self.bus])
+        self.assertEqual(bus.helper_threads, 0)
+        port = self.bridge.port
+        self.bridge.close()
+        self.bridge = BridgeStandIn(port)
+        threading.Thread(target=self.bridge.replay, args=(build_frame(0x4, 4),)).start()
+        self.assertEqual(bus.recv(2.0).arbitration_id, 0x4)
+
+
+class ExoSocketConnectTest(unittest.TestCase):
+    def test_no_bridge(self):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        with self.assertRaises(can.CanError):
+            can.Bus(interface="exosocket", channel="bridge", port=port)
+
+
+if __name__ == "__main__":
+    unittest.main()
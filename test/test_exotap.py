@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the UDP mirror of the ExoTerra interfaces.
+"""
+
+import socket
+import time
+import unittest
+from queue import Queue
+
+from can.interfaces.exotap import ExoTap, TX, RX, RECORD_LENGTH
+
+
+def frame(cob_id, n=0):
+    return bytes([0xA8 | cob_id >> 8, cob_id & 0xFF, 8]) + bytes([n]) * 10
+
+
+class ExoTapTest(unittest.TestCase):
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.settimeout(2.0)
+        self.port = self.server.getsockname()[1]
+
+    def tearDown(self):
+        self.server.close()
+
+    def receive_records(self, count):
+        records = []
+        while len(records) < count:
+            datagram = self.server.recv(65536)
+            self.assertEqual(len(datagram) % RECORD_LENGTH, 0)
+            for i in range(0, len(datagram), RECORD_LENGTH):
+                records.append(datagram[i : i + RECORD_LENGTH])
+        return records
+
+    def test_batches_records(self):
+        tap = ExoTap(port=self.port, max_latency=0.05, max_records=10)
+        for i in range(25):
+            tap.put(TX if i % 2 else RX, frame(0x100, i))
+        records = self.receive_records(25)
+        tap.stop()
+        self.assertEqual(records[0], bytes([RX]) + frame(0x100, 0))
+        self.assertEqual(records[1], bytes([TX]) + frame(0x100, 1))
+        self.assertEqual(tap.records, 25)
+        self.assertEqual(tap.datagrams, 3)
+
+    def test_id_filter_and_sampling(self):
+        tap = ExoTap(port=self.port, sample=2, can_ids=[0x123])
+        for i in range(10):
+            tap.tx(frame(0x123, i))
+            tap.tx(frame(0x456, i))
+        tap.stop()
+        records = self.receive_records(5)
+        self.assertEqual([r[4] for r in records], [1, 3, 5, 7, 9])
+
+    def test_bounded(self):
+        int_q = Queue(4)
+        tap = ExoTap(port=self.port, queue_size=8, max_latency=10.0, int_q=int_q)
+        for i in range(20):
+            tap.rx(frame(0x1, i))
+        self.assertEqual(tap.dropped, 12)
+        tap.flush()
+        tap.stop(0)
+        self.assertEqual(int_q.qsize(), 4)
+        self.assertEqual(int_q.get()[4], 16)
+
+    def test_wakes_up_for_frames(self):
+        tap = ExoTap(port=self.port, max_latency=0.001)
+        for i in range(3):
+            # the thread waits for frames instead of polling the queue
+            time.sleep(0.02)
+            self.assertFalse(tap._pending.is_set())
+            tap.tx(frame(0x100, i))
+            self.assertEqual(self.receive_records(1)[0][4], i)
+        tap.stop()
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ExoTap(sample=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the raw frame tracing of the ExoTerra interfaces.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from can.exomessage import ExoFrame
+from can.interfaces import exotrace
+from can.interfaces.exotap import TX, RX
+
+
+class ExoTraceTest(unittest.TestCase):
+    def setUp(self):
+        self.frame = ExoFrame(0x123, b"\x01\x02").encode()
+        fd, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_nothing_to_trace(self):
+        self.assertIsNone(exotrace.create_trace(level="NOT_A_REGISTERED_LEVEL"))
+
+    def test_journal_round_trip(self):
+        trace = exotrace.create_trace(self.path, level="NOT_A_REGISTERED_LEVEL")
+        trace.tx(self.frame, 1.0)
+        trace.rx(memoryview(self.frame), 2.0)
+        trace.close()
+        with open(self.path, "ab") as journal:
+            journal.write(b"\x00\x01")  # truncated record
+        records = list(exotrace.read_journal(self.path))
+        self.assertEqual(
+            records, [(1.0, TX, bytes(self.frame)), (2.0, RX, bytes(self.frame))]
+        )
+
+    @unittest.skipIf(exotrace.loguru_logger is None, "loguru is not installed")
+    def test_loguru_level(self):
+        loguru_logger = exotrace.loguru_logger
+        loguru_logger.level("EXOTRACE_TEST", no=3)
+        lines = []
+        handler = loguru_logger.add(
+            lines.append, level="EXOTRACE_TEST", format="{message}"
+        )
+        try:
+            trace = exotrace.create_trace(level="EXOTRACE_TEST")
+            trace.rx(self.frame)
+        finally:
+            loguru_logger.remove(handler)
+        self.assertEqual(lines, [" id:0x123: dl:8: d:0102000000000000\n"])
+
+    @unittest.skipIf(exotrace.loguru_logger is None, "loguru is not installed")
+    def test_lazy_formatting(self):
+        exotrace.loguru_logger.level("EXOTRACE_LAZY", no=1)
+        trace = exotrace.create_trace(level="EXOTRACE_LAZY")
+        with patch("can.exomessage.describe") as describe:
+            trace.tx(self.frame)
+        describe.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests the pipelined ExoTerra request/response transactions.
+"""
+
+import asyncio
+import time
+import unittest
+
+import can
+from can.exotransaction import ExoTransactions, TransactionTimeout
+
+
+def upload(node, index, subindex):
+    return can.Message(
+        arbitration_id=0x600 + node,
+        is_extended_id=False,
+        data=[0x40, index & 0xFF, index >> 8, subindex, 0, 0, 0, 0],
+    )
+
+
+class Device(can.Listener):
+    """
+    Answers every request with the index in data bytes 4 and 5.
+    """
+
+    def __init__(self, bus):
+        self.bus = bus
+        self.answer = True
+
+    def on_message_received(self, msg):
+        if self.answer:
+            data = bytearray(msg.data)
+            data[0] = 0x43
+            data[4:6] = data[1:3]
+            self.bus.send(
+                can.Message(
+                    arbitration_id=msg.arbitration_id - 0x80,
+                    is_extended_id=False,
+                    data=data,
+                )
+            )
+
+
+class ExoTransactionsTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = can.Bus(interface="virtual", channel="exotransaction")
+        self.device_bus = can.Bus(interface="virtual", channel="exotransaction")
+        self.device = Device(self.device_bus)
+        self.device_notifier = can.Notifier(self.device_bus, [self.device], 0.01)
+        self.transactions = ExoTransactions(self.bus, max_outstanding=4, timeout=0.2)
+        self.notifier = can.Notifier(self.bus, [self.transactions], 0.01)
+
+    def tearDown(self):
+        self.notifier.stop()
+        self.device_notifier.stop()
+        self.transactions.stop()
+        self.bus.shutdown()
+        self.device_bus.shutdown()
+
+    def test_request(self):
+        response = self.transactions.request(upload(1, 0x1018, 1)).result(1.0)
+        self.assertEqual(response.arbitration_id, 0x581)
+        self.assertEqual(response.data[4:6], bytearray([0x18, 0x10]))
+
+    def test_request_many(self):
+        requests = [upload(1, 0x2000 + i, i % 4) for i in range(50)]
+        responses = self.transactions.request_many(requests)
+        self.assertEqual(
+            [r.data[1:4] for r in responses], [r.data[1:4] for r in requests]
+        )
+        self.assertEqual(self.transactions.outstanding, 0)
+
+    def test_timeout(self):
+        self.device.answer = False
+        future = self.transactions.request(upload(1, 0x1000, 0), timeout=0.05)
+        with self.assertRaises(TransactionTimeout):
+            future.result(1.0)
+        self.assertEqual(self.transactions.timeouts, 1)
+        self.assertEqual(self.transactions.outstanding, 0)
+
+    def test_pending_table_is_bounded(self):
+        self.device.answer = False
+        futures = [
+            self.transactions.request(upload(1, 0x1000 + i, 0)) for i in range(4)
+        ]
+        self.assertEqual(self.transactions.outstanding, 4)
+        self.assertIsNone(self.transactions.request(upload(1, 0x2000, 0), block=False))
+        start = time.time()
+        # blocks until the first requests time out
+        future = self.transactions.request(upload(1, 0x2000, 0))
+        self.assertGreater(time.time() - start, 0.1)
+        for f in futures + [future]:
+            with self.assertRaises(TransactionTimeout):
+                f.result(1.0)
+
+    def test_same_object_waits(self):
+        self.device.answer = False
+        first = self.transactions.request(upload(1, 0x1000, 0), timeout=0.05)
+        second = self.transactions.request(upload(1, 0x1000, 0), timeout=0.05)
+        self.assertTrue(first.done())
+        self.assertIsNot(first, second)
+
+    def test_request_async(self):
+        requests = [upload(2, 0x3000 + i, 0) for i in range(10)]
+
+        async def request_all():
+            return await asyncio.gather(
+                *[self.transactions.request_async(r) for r in requests]
+            )
+
+        loop = asyncio.new_event_loop()
+        try:
+            responses = loop.run_until_complete(request_all())
+        finally:
+            loop.close()
+        self.assertEqual([r.arbitration_id for r in responses], [0x582] * 10)
+        self.assertEqual([r.data[1] for r in responses], list(range(10)))
+
+    def test_stop_fails_pending(self):
+        self.device.answer = False
+        future = self.transactions.request(upload(1, 0x1000, 0), timeout=10)
+        self.transactions.stop()
+        with self.assertRaises(can.CanError):
+            future.result(1.0)
+        with self.assertRaises(can.CanError):
+            self.transactions.request(upload(1, 0x1000, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # coding: utf-8
 
+import io
 import unittest
 import sys
 from math import isinf, isnan
@@ -10,7 +11,7 @@ import pickle
 from hypothesis import given, settings, reproduce_failure
 import hypothesis.strategies as st
 
-from can import Message
+from can import CanutilsLogReader, Message
 
 from .message_helper import ComparingMessagesTestCase
 
@@ -114,5 +115,86 @@ class MessageSerialization(unittest.TestCase, ComparingMessagesTestCase):
         self.assertMessageEqual(message, deserialized)
 
 
+class MessageFromFields(unittest.TestCase):
+    def test_same_as_constructor(self):
+        fields = (1.5, 0x123, False, False, False, "can0", 3, b"\x01\x02\x03")
+        flags = (True, False, True, True)
+        msg = Message._from_fields(*fields, *flags)
+        expected = Message(
+            timestamp=1.5,
+            arbitration_id=0x123,
+            is_extended_id=False,
+            channel="can0",
+            data=[1, 2, 3],
+            is_fd=True,
+            is_rx=False,
+            bitrate_switch=True,
+            error_state_indicator=True,
+        )
+        self.assertTrue(msg.equals(expected))
+        self.assertIsInstance(msg.data, bytearray)
+        expected.is_fd = False
+        expected.bitrate_switch = False
+        expected.error_state_indicator = False
+        expected.is_rx = True
+        self.assertTrue(Message._from_fields(*fields).equals(expected))
+
+    def test_zero_copy(self):
+        data = b"\x01\x02"
+        msg = Message._from_fields(
+            0.0, 1, True, False, False, None, 2, data, zero_copy=True
+        )
+        self.assertIs(msg.data, data)
+        self.assertIsInstance(Message(data=data).data, bytearray)
+
+
+class MessageZeroCopy(unittest.TestCase):
+    def from_fields(self, data):
+        return Message._from_fields(
+            0.0, 1, True, False, False, None, len(data), data, zero_copy=True
+        )
+
+    def test_memoryview(self):
+        buffer = bytearray(range(16))
+        msg = self.from_fields(memoryview(buffer)[3:11])
+        self.assertEqual(msg.dlc, 8)
+        self.assertEqual(msg.data, bytes(range(3, 11)))
+        self.assertIn("03 04 05", str(msg))
+        copied = deepcopy(msg)
+        buffer[3] = 0xFF
+        self.assertEqual(msg.data[0], 0xFF)
+        self.assertEqual(copied.data[0], 3)
+
+    def test_data_is_read_only(self):
+        for data in (b"\x01\x02\x03", memoryview(b"\x01\x02\x03")):
+            msg = self.from_fields(data)
+            with self.assertRaises(TypeError):
+                msg.data[0] = 0xFF
+
+    def test_writable_data(self):
+        data = b"\x01\x02\x03"
+        msg = self.from_fields(data)
+        other = copy(msg)
+        msg.writable_data()[0] = 0xFF
+        self.assertIsInstance(msg.data, bytearray)
+        self.assertEqual(msg.data, b"\xff\x02\x03")
+        self.assertEqual(other.data, data)
+        self.assertIs(msg.writable_data(), msg.data)
+
+    def test_disabled(self):
+        msg = Message._from_fields(0.0, 1, True, False, False, None, 1, b"\x01")
+        self.assertIsInstance(msg.data, bytearray)
+        self.assertIs(msg.writable_data(), msg.data)
+
+    def test_reader(self):
+        lines = ["(0.0) vcan0 123#0102\n"]
+        for zero_copy, data_type in ((False, bytearray), (True, bytes)):
+            with CanutilsLogReader(io.StringIO("".join(lines)), zero_copy) as reader:
+                msg = next(iter(reader))
+            self.assertIsInstance(msg.data, data_type)
+            msg.writable_data()[0] = 0xFF
+            self.assertEqual(msg.data, b"\xff\x02")
+
+
 if __name__ == "__main__":
     unittest.main()
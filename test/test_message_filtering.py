@@ -7,7 +7,10 @@ This module tests :meth:`can.BusABC._matches_filters`.
 
 import unittest
 
-from can import Bus, Message
+from hypothesis import given, settings
+import hypothesis.strategies as st
+
+from can import Bus, FilterMatcher, Message
 
 from .data.example_data import TEST_ALL_MESSAGES
 
@@ -49,5 +52,63 @@ class TestMessageFiltering(unittest.TestCase):
         self.assertTrue(self.bus._matches_filters(HIGHEST_MSG))
 
 
+def reference_match(filters, msg):
+    """The filtering of the list of dicts before it was compiled."""
+    if not filters:
+        return True
+    for _filter in filters:
+        if "extended" in _filter and _filter["extended"] != msg.is_extended_id:
+            continue
+        if (_filter["can_id"] ^ msg.arbitration_id) & _filter["can_mask"] == 0:
+            return True
+    return False
+
+
+def can_filters():
+    masks = st.sampled_from([0, 0x7FF, 0x700, 0x1FFFFFFF, 0xFFFFFFFF, 0x1FFFFF00])
+    can_filter = st.fixed_dictionaries(
+        {
+            "can_id": st.integers(0, 0xFFFFFFFF),
+            "can_mask": masks | st.integers(0, 0xFFFFFFFF),
+        },
+        optional={"extended": st.booleans()},
+    )
+    return st.lists(can_filter, max_size=20)
+
+
+class TestFilterMatcher(unittest.TestCase):
+    @given(
+        filters=can_filters(),
+        ids=st.lists(st.integers(0, 0x1FFFFFFF), max_size=20),
+        extended=st.booleans(),
+    )
+    @settings(max_examples=500, deadline=None)
+    def test_same_as_reference(self, filters, ids, extended):
+        # also try the identifiers the filters are looking for
+        ids += [_filter["can_id"] & 0x1FFFFFFF for _filter in filters]
+        ids += [_filter["can_id"] & 0x7FF for _filter in filters]
+        matcher = FilterMatcher(filters)
+        for arbitration_id in ids:
+            msg = Message(arbitration_id=arbitration_id, is_extended_id=extended)
+            self.assertEqual(matcher(msg), reference_match(filters, msg), msg)
+
+    def test_standard_id_out_of_range(self):
+        matcher = FilterMatcher([{"can_id": 0x800, "can_mask": 0x800}])
+        self.assertTrue(matcher(Message(arbitration_id=0x800, is_extended_id=False)))
+        self.assertFalse(matcher(Message(arbitration_id=0x7FF, is_extended_id=False)))
+
+    def test_filter(self):
+        matcher = FilterMatcher(
+            [{"can_id": 0x100, "can_mask": 0x700, "extended": False}]
+        )
+        msgs = [
+            Message(arbitration_id=arbitration_id, is_extended_id=extended)
+            for arbitration_id in (0x100, 0x1FF, 0x200)
+            for extended in (False, True)
+        ]
+        self.assertEqual(list(matcher.filter(msgs)), [msgs[0], msgs[2]])
+        self.assertEqual(list(FilterMatcher().filter(msgs)), msgs)
+
+
 if __name__ == "__main__":
     unittest.main()
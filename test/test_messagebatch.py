@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests :class:`can.MessageBatch` with and without NumPy.
+"""
+
+import unittest
+from unittest import mock
+
+import can
+from can import messagebatch
+from can.messagebatch import MessageBatch
+
+
+def messages():
+    return [
+        can.Message(timestamp=1.0, arbitration_id=0x100, data=[1, 2, 3], channel="a"),
+        can.Message(
+            timestamp=2.0,
+            arbitration_id=0x7FF,
+            is_extended_id=False,
+            is_remote_frame=True,
+            dlc=8,
+            channel="b",
+        ),
+        can.Message(timestamp=3.0, arbitration_id=0x100, data=range(8), channel="a"),
+        can.Message(
+            timestamp=4.0, arbitration_id=0x18FF0001, is_error_frame=True, is_rx=False
+        ),
+    ]
+
+
+class MessageBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.msgs = messages()
+        self.batch = MessageBatch.from_messages(self.msgs)
+
+    def assertSameMessages(self, batch, msgs):
+        self.assertEqual(len(batch), len(msgs))
+        for converted, msg in zip(batch, msgs):
+            self.assertTrue(converted.equals(msg), "{} != {}".format(converted, msg))
+
+    def test_round_trip(self):
+        self.assertEqual(self.batch.width, 8)
+        self.assertSameMessages(self.batch, self.msgs)
+        self.assertEqual(len(self.batch.to_messages()), 4)
+
+    def test_columns(self):
+        self.assertEqual(list(self.batch.timestamp), [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(list(self.batch.dlc), [3, 8, 8, 0])
+        self.assertEqual(list(self.batch.is_remote_frame), [False, True, False, False])
+        self.assertEqual(list(self.batch.is_rx), [True, True, True, False])
+        self.assertEqual(list(self.batch.channel), ["a", "b", "a", None])
+        self.assertEqual(self.batch.payload(0), b"\x01\x02\x03")
+        self.assertEqual(self.batch.payload(1), b"")
+
+    def test_index(self):
+        self.assertTrue(self.batch[2].equals(self.msgs[2]))
+        self.assertTrue(self.batch[-1].equals(self.msgs[-1]))
+        with self.assertRaises(IndexError):
+            self.batch[4]
+
+    def test_slice(self):
+        self.assertSameMessages(self.batch[1:3], self.msgs[1:3])
+        self.assertSameMessages(self.batch[::2], self.msgs[::2])
+        self.assertSameMessages(self.batch[5:], [])
+
+    def test_mask(self):
+        mask = [msg.arbitration_id == 0x100 for msg in self.msgs]
+        self.assertSameMessages(self.batch[mask], [self.msgs[0], self.msgs[2]])
+        self.assertSameMessages(self.batch[[3, 0]], [self.msgs[3], self.msgs[0]])
+
+    def test_fd_width(self):
+        fd = can.Message(arbitration_id=1, is_fd=True, data=range(64))
+        batch = MessageBatch.from_messages(self.msgs + [fd])
+        self.assertEqual(batch.width, 64)
+        self.assertSameMessages(batch, self.msgs + [fd])
+
+    def test_concatenate(self):
+        fd = MessageBatch.from_messages(
+            [can.Message(arbitration_id=1, is_fd=True, data=range(12), channel="c")]
+        )
+        batch = MessageBatch.concatenate([self.batch, fd, self.batch[:1]])
+        self.assertEqual(batch.width, 64)
+        self.assertSameMessages(batch, self.msgs + fd.to_messages() + self.msgs[:1])
+        self.assertEqual(len(MessageBatch.concatenate([])), 0)
+
+    def test_empty(self):
+        batch = MessageBatch.empty(3)
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch[0].arbitration_id, 0)
+        self.assertEqual(len(MessageBatch.from_messages([])), 0)
+
+
+class ArrayMessageBatchTest(MessageBatchTest):
+    """
+    Runs the same tests with the array fallback.
+    """
+
+    def setUp(self):
+        patcher = mock.patch.object(messagebatch, "numpy", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+    def test_columns_are_arrays(self):
+        self.assertEqual(self.batch.arbitration_id.typecode, "L")
+        self.assertEqual(len(self.batch.data), 4 * 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
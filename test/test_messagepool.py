@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests :class:`can.MessagePool` and pooled receiving.
+"""
+
+import asyncio
+import copy
+import threading
+import time
+import unittest
+
+import can
+from can.exomessage import ExoFrame, decode_message
+from can.messagepool import MessagePool, PooledMessage
+
+from .config import IS_WINDOWS
+
+if not IS_WINDOWS:
+    from can.interfaces.exoserial.simulator import ExoSimulator
+
+
+class MessagePoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = MessagePool(size=2)
+
+    def acquire(self, data=b"\x01\x02"):
+        return self.pool.acquire(1.0, 0x123, False, False, False, "a", len(data), data)
+
+    def test_reuse(self):
+        msg = self.acquire()
+        data = msg.data
+        msg.release()
+        self.assertEqual(len(self.pool), 1)
+        again = self.acquire(b"\x03\x04\x05")
+        self.assertIs(again, msg)
+        self.assertIs(again.data, data)
+        self.assertEqual(again.data, b"\x03\x04\x05")
+        self.assertEqual(again.dlc, 3)
+        self.assertEqual(self.pool.created, 1)
+
+    def test_fields(self):
+        msg = self.pool.acquire(
+            2.0, 0x7FF, False, True, False, None, 4, b"", True, False, True, True
+        )
+        expected = can.Message(
+            timestamp=2.0,
+            arbitration_id=0x7FF,
+            is_extended_id=False,
+            is_remote_frame=True,
+            dlc=4,
+            is_fd=True,
+            is_rx=False,
+            bitrate_switch=True,
+            error_state_indicator=True,
+        )
+        self.assertTrue(msg.equals(expected))
+        self.assertIsInstance(msg, PooledMessage)
+
+    def test_double_release(self):
+        msg = self.acquire()
+        msg.release()
+        msg.release()
+        self.assertEqual(len(self.pool), 1)
+
+    def test_concurrent_release(self):
+        pool = MessagePool(size=1000)
+        msgs = [
+            pool.acquire(0.0, 1, False, False, False, None, 0, b"") for _ in range(500)
+        ]
+        barrier = threading.Barrier(4)
+
+        def release_all():
+            barrier.wait()
+            for msg in msgs:
+                msg.release()
+
+        threads = [threading.Thread(target=release_all) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # every message is in the free list exactly once
+        self.assertEqual(len(pool), 500)
+        self.assertEqual(len(set(map(id, pool._free))), 500)
+
+    def test_size(self):
+        msgs = [self.acquire() for _ in range(3)]
+        for msg in msgs:
+            msg.release()
+        self.assertEqual(len(self.pool), 2)
+
+    def test_copy_is_not_pooled(self):
+        msg = self.acquire()
+        for copied in (copy.copy(msg), copy.deepcopy(msg)):
+            self.assertIs(type(copied), can.Message)
+            self.assertTrue(copied.equals(msg))
+        # plain messages ignore release
+        can.Message().release()
+
+    def test_zero_copy_data_is_replaced(self):
+        msg = self.acquire()
+        msg.data = b"\xff"
+        msg.release()
+        self.assertEqual(self.acquire(b"\x01\x02\x03").data, b"\x01\x02\x03")
+
+    def test_decode_message(self):
+        frame = ExoFrame(0x181, b"\x01\x02\x03").encode()
+        msg = decode_message(frame, pool=self.pool)
+        self.assertIsInstance(msg, PooledMessage)
+        self.assertEqual(msg.arbitration_id, 0x181)
+        self.assertEqual(msg.data, b"\x01\x02\x03".ljust(8, b"\x00"))
+
+
+class Collector(can.Listener):
+    retains_messages = False
+
+    def __init__(self):
+        self.received = []
+
+    def on_message_received(self, msg):
+        self.received.append((msg.arbitration_id, bytes(msg.data)))
+
+
+class FilteredTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = can.Bus(interface="exoserial", channel="loop://")
+        self.bus.message_pool = MessagePool()
+        self.bus.set_filters([{"can_id": 2, "can_mask": 0x7FF, "extended": False}])
+
+    def tearDown(self):
+        self.bus.shutdown()
+
+    def send(self, *arbitration_ids):
+        for arbitration_id in arbitration_ids:
+            self.bus.send(
+                can.Message(arbitration_id=arbitration_id, is_extended_id=False)
+            )
+
+    def test_recv(self):
+        self.send(1, 2)
+        self.assertEqual(self.bus.recv(1.0).arbitration_id, 2)
+        # the second frame reused the message of the filtered one
+        self.assertEqual(self.bus.message_pool.created, 1)
+
+    def test_recv_batch(self):
+        self.send(1, 2, 1)
+        msgs = []
+        deadline = time.time() + 1.0
+        while len(self.bus.message_pool) < 2 and time.time() < deadline:
+            msgs += self.bus.recv_batch(timeout=0.1)
+        self.assertEqual([msg.arbitration_id for msg in msgs], [2])
+        self.assertEqual(len(self.bus.message_pool), 2)
+
+
+def async_collector():
+    async def collect(msg):
+        await asyncio.sleep(0.01)
+        collect.received.append(bytes(msg.data))
+
+    collect.received = []
+    collect.retains_messages = False
+    return collect
+
+
+class AsyncBatchCollector(can.Listener):
+    retains_messages = False
+
+    def __init__(self):
+        self.received = []
+
+    def on_message_received(self, msg):
+        pass
+
+    async def on_messages_received(self, msgs):
+        await asyncio.sleep(0.01)
+        self.received.extend(bytes(msg.data) for msg in msgs)
+
+
+class AsyncNotifierTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.bus = can.Bus(interface="virtual")
+        self.pool = MessagePool()
+
+    def tearDown(self):
+        self.bus.shutdown()
+        self.loop.close()
+
+    def dispatch(self, listener, batch):
+        async def run():
+            notifier = can.Notifier(self.bus, [listener], 0.01, loop=self.loop)
+            msgs = [
+                self.pool.acquire(0.0, 1, False, False, False, None, 1, bytes([i]))
+                for i in range(2)
+            ]
+            if batch:
+                notifier._on_messages_received(msgs)
+            else:
+                for msg in msgs:
+                    notifier._on_message_received(msg)
+            # the coroutines still need the messages
+            self.assertEqual(len(self.pool), 0)
+            await asyncio.sleep(0.1)
+            notifier.stop()
+
+        self.loop.run_until_complete(run())
+        self.assertEqual(listener.received, [b"\x00", b"\x01"])
+        self.assertEqual(len(self.pool), 2)
+
+    def test_message_coroutine(self):
+        self.dispatch(async_collector(), batch=False)
+
+    def test_messages_coroutine(self):
+        self.dispatch(AsyncBatchCollector(), batch=True)
+
+
+@unittest.skipIf(IS_WINDOWS, "the simulator needs a pty")
+class PooledNotifierTest(unittest.TestCase):
+    def setUp(self):
+        self.sim = ExoSimulator()
+        self.bus = can.Bus(interface="exoserial", channel=self.sim.port)
+        self.pool = MessagePool()
+        # the receiver resets the input buffer when its thread starts
+        time.sleep(0.1)
+
+    def tearDown(self):
+        self.bus.shutdown()
+        self.sim.close()
+
+    def receive(self, listeners, count):
+        notifier = can.Notifier(
+            self.bus, listeners, timeout=0.01, message_pool=self.pool
+        )
+        frames = [ExoFrame(i & 0x7FF, i.to_bytes(8, "little")) for i in range(count)]
+        self.sim.burst(frames)
+        deadline = time.time() + 5.0
+        while len(listeners[0].received) < count and time.time() < deadline:
+            time.sleep(0.01)
+        notifier.stop()
+        self.assertIs(self.bus.message_pool, self.pool)
+        self.assertEqual(
+            listeners[0].received, [(frame.cob_id, frame.data) for frame in frames]
+        )
+
+    def test_recycled(self):
+        self.receive([Collector()], 500)
+        self.assertLessEqual(self.pool.created, 2)
+
+    def test_retaining_listener(self):
+        reader = can.BufferedReader()
+        self.receive([Collector(), reader], 50)
+        self.assertEqual(self.pool.created, 50)
+        self.assertEqual(len(self.pool), 0)
+        self.assertIsInstance(reader.get_message(0), PooledMessage)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests :mod:`can.metrics`.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+
+import can
+from can.metrics import BusMetrics, HistogramSnapshot, _Histogram, _bucket_bounds
+
+
+def messages(count):
+    return [can.Message(arbitration_id=i, is_extended_id=False) for i in range(count)]
+
+
+class HistogramTest(unittest.TestCase):
+    def test_buckets(self):
+        for nanoseconds in list(range(100)) + [999, 1000, 123456, 10 ** 12]:
+            histogram = _Histogram()
+            histogram.record(nanoseconds * 1e-9)
+            (index,) = [i for i, count in enumerate(histogram.counts) if count]
+            lower, upper = _bucket_bounds(index)
+            self.assertLessEqual(lower, round(nanoseconds * 1e-9 * 1e9))
+            self.assertLess(round(nanoseconds * 1e-9 * 1e9), upper)
+            self.assertLessEqual(upper - lower, max(1, lower / 16))
+
+    def test_quantiles(self):
+        metrics = BusMetrics({})
+        for microseconds in range(1, 1001):
+            metrics.observe(BusMetrics.SEND_DURATION, microseconds * 1e-6)
+        snapshot = metrics.snapshot()["send_duration_seconds"]
+        self.assertIsInstance(snapshot, HistogramSnapshot)
+        self.assertEqual(snapshot.count, 1000)
+        self.assertAlmostEqual(snapshot.mean, 500.5e-6)
+        self.assertAlmostEqual(snapshot.quantile(0.5), 500e-6, delta=35e-6)
+        self.assertAlmostEqual(snapshot.quantile(0.99), 990e-6, delta=70e-6)
+        self.assertEqual(snapshot.cumulative([2e-6, 1.0]), [1, 1000])
+
+    def test_cumulative_bound_inside_bucket(self):
+        snapshot = HistogramSnapshot(5, 6.0, [(0.0, 1.0, 2), (1.0, 2.0, 3)])
+        # a bucket only counts for a bound it ends at or below
+        self.assertEqual(snapshot.cumulative([0.5, 1.0, 1.5, 2.0]), [0, 2, 2, 5])
+
+    def test_threads(self):
+        metrics = BusMetrics({})
+
+        def count():
+            for _ in range(1000):
+                metrics.add(BusMetrics.FRAMES_RECEIVED)
+
+        threads = [threading.Thread(target=count) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(metrics.snapshot()["frames_received"], 4000)
+
+    def test_timing_interval(self):
+        metrics = BusMetrics({}, timing_interval=4)
+        timed = [metrics.start(BusMetrics.FRAMES_SENT) for _ in range(40)]
+        self.assertEqual(sum(1 for start in timed if start), 10)
+        self.assertEqual(metrics.snapshot()["frames_sent"], 40)
+
+
+class BusMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = can.MetricsRegistry(timing_interval=1)
+        self.sender = can.Bus(interface="virtual", channel="metrics")
+        self.bus = can.Bus(interface="virtual", channel="metrics")
+        self.sender_metrics = self.registry.instrument(self.sender)
+        self.metrics = self.registry.instrument(self.bus, channel="rx")
+
+    def tearDown(self):
+        self.sender.shutdown()
+        self.bus.shutdown()
+
+    def test_recv(self):
+        self.bus.set_filters([{"can_id": 0, "can_mask": 1, "extended": False}])
+        for msg in messages(10):
+            self.sender.send(msg)
+        received = []
+        msg = self.bus.recv(0.01)
+        while msg is not None:
+            received.append(msg)
+            msg = self.bus.recv(0.01)
+        self.assertEqual(len(received), 5)
+        values = self.metrics.snapshot()
+        self.assertEqual(values["frames_received"], 5)
+        self.assertEqual(values["frames_filtered"], 5)
+        self.assertEqual(values["recv_timeouts"], 1)
+
+    def test_recv_batch(self):
+        self.bus.set_filters([{"can_id": 0, "can_mask": 1, "extended": False}])
+        self.sender.send_batch(messages(10))
+        self.assertEqual(len(self.bus.recv_batch(timeout=0.01)), 5)
+        self.assertEqual(self.bus.recv_batch(timeout=0.01), [])
+        values = self.metrics.snapshot()
+        self.assertEqual(values["frames_received"], 5)
+        self.assertEqual(values["frames_filtered"], 5)
+        self.assertEqual(values["recv_timeouts"], 1)
+
+    def test_send(self):
+        self.sender.send(can.Message())
+        self.sender.send_batch(messages(3))
+        values = self.sender_metrics.snapshot()
+        self.assertEqual(values["frames_sent"], 4)
+        self.assertEqual(values["send_duration_seconds"].count, 2)
+        self.assertEqual(values["send_errors"], 0)
+
+    def test_only_instance_is_instrumented(self):
+        other = can.Bus(interface="virtual", channel="metrics")
+        other.send(can.Message())
+        other.shutdown()
+        self.assertIsNone(other.metrics)
+        self.assertEqual(self.sender_metrics.snapshot()["frames_sent"], 0)
+
+    def test_remove(self):
+        self.registry.remove(self.sender)
+        self.sender.send(can.Message())
+        self.assertIsNone(self.sender.metrics)
+        self.assertEqual(self.sender_metrics.snapshot()["frames_sent"], 0)
+        self.assertEqual(
+            [metric_set for metric_set, _ in self.registry.snapshot()], [self.metrics]
+        )
+
+    def test_prometheus_text(self):
+        self.sender.send(can.Message())
+        self.bus.recv(0.1)
+        text = self.registry.prometheus_text()
+        lines = text.splitlines()
+        self.assertEqual(lines.count("# TYPE can_bus_frames_received_total counter"), 1)
+        self.assertIn('can_bus_frames_received_total{channel="rx"} 1', lines)
+        self.assertIn(
+            'can_bus_frames_sent_total{{channel="{}"}} 1'.format(
+                self.sender.channel_info
+            ),
+            lines,
+        )
+        self.assertIn("# TYPE can_bus_send_duration_seconds histogram", lines)
+        self.assertIn(
+            'can_bus_send_duration_seconds_bucket{channel="rx",le="+Inf"} 0', lines
+        )
+        self.assertTrue(text.endswith("\n"))
+
+
+class SendErrorBus(can.BusABC):
+    def __init__(self, **kwargs):
+        super().__init__(channel=None, **kwargs)
+
+    def send(self, msg, timeout=None):
+        raise can.CanError("Failed to transmit")
+
+
+class DataSizeBus(can.BusABC):
+    """Takes one more argument when sending, like the exo buses."""
+
+    def __init__(self, **kwargs):
+        super().__init__(channel=None, **kwargs)
+        self.data_sizes = []
+
+    def send(self, msg, timeout=None, data_size=8):
+        self.data_sizes.append(data_size)
+
+    def send_batch(self, msgs, timeout=None, data_size=8):
+        self.data_sizes.extend([data_size] * len(msgs))
+
+
+class SendErrorTest(unittest.TestCase):
+    def test_send_arguments(self):
+        registry = can.MetricsRegistry(timing_interval=1)
+        bus = DataSizeBus()
+        metrics = registry.instrument(bus)
+        bus.send(can.Message(), data_size=4)
+        bus.send(can.Message(), 0.1, 2)
+        bus.send_batch(messages(2), timeout=0.1, data_size=6)
+        self.assertEqual(bus.data_sizes, [4, 2, 6, 6])
+        self.assertEqual(metrics.snapshot()["frames_sent"], 4)
+
+    def test_send_errors(self):
+        registry = can.MetricsRegistry()
+        bus = SendErrorBus()
+        metrics = registry.instrument(bus, channel="broken")
+        with self.assertRaises(can.CanError):
+            bus.send(can.Message())
+        with self.assertRaises(can.BatchSendError):
+            bus.send_batch(messages(2))
+        values = metrics.snapshot()
+        self.assertEqual(values["send_errors"], 2)
+        self.assertEqual(values["frames_sent"], 0)
+
+
+class NotifierMetricsTest(unittest.TestCase):
+    def test_notifier_and_reader(self):
+        registry = can.MetricsRegistry(timing_interval=1)
+        sender = can.Bus(interface="virtual", channel="metrics")
+        bus = can.Bus(interface="virtual", channel="metrics")
+        reader = can.BufferedReader()
+        notifier = can.Notifier(bus, [reader], timeout=0.01)
+        notifier_metrics = registry.instrument(notifier)
+        reader_metrics = registry.instrument(reader)
+        self.assertEqual(notifier_metrics.labels, {"notifier": "0"})
+        self.assertEqual(reader_metrics.labels, {"reader": "0"})
+        sender.send_batch(messages(5))
+        for _ in range(5):
+            self.assertIsNotNone(reader.get_message(1.0))
+        self.assertIsNone(reader.get_message(0))
+        notifier.stop()
+        sender.shutdown()
+        bus.shutdown()
+
+        values = notifier_metrics.snapshot()
+        self.assertEqual(values["messages_dispatched"], 5)
+        self.assertEqual(values["dispatch_duration_seconds"].count, 5)
+        values = reader_metrics.snapshot()
+        self.assertEqual(values["messages_retrieved"], 5)
+        self.assertEqual(values["get_timeouts"], 1)
+        self.assertEqual(values["queue_size"], 0)
+
+    def test_instrument_unknown(self):
+        with self.assertRaises(TypeError):
+            can.MetricsRegistry().instrument(object())
+
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = can.MetricsRegistry()
+        self.reader = can.BufferedReader()
+        self.registry.instrument(self.reader, reader="test")
+        self.reader.on_message_received(can.Message())
+        self.reader.on_message_received(can.Message())
+        self.reader.get_message()
+
+    def test_textfile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "can.prom")
+            self.registry.write_textfile(path)
+            with open(path) as file:
+                self.assertIn(
+                    'can_reader_messages_retrieved_total{reader="test"} 1',
+                    file.read().splitlines(),
+                )
+            self.assertEqual(os.listdir(directory), ["can.prom"])
+
+    def test_serve(self):
+        server = self.registry.serve(port=0)
+        try:
+            url = "http://127.0.0.1:{}/metrics".format(server.server_address[1])
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertIn('can_reader_queue_size{reader="test"} 1', body.splitlines())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests :class:`can.MultiBus`.
+"""
+
+import select
+import socket
+import time
+import unittest
+from collections import deque
+
+import can
+
+
+class SocketBus(can.BusABC):
+    """Receives the messages given to :meth:`feed` through a socket pair."""
+
+    def __init__(self, **kwargs):
+        super().__init__(channel=None, **kwargs)
+        self._reader, self._writer = socket.socketpair()
+        self._msgs = deque()
+        self.sent = []
+        self.is_shut_down = False
+
+    def feed(self, msg):
+        self._msgs.append(msg)
+        self._writer.send(b"\0")
+
+    def _recv_internal(self, timeout):
+        readable, _, _ = select.select([self._reader], [], [], timeout)
+        if not readable:
+            return None, False
+        self._reader.recv(1)
+        return self._msgs.popleft(), False
+
+    def send(self, msg, timeout=None):
+        self.sent.append(msg)
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def shutdown(self):
+        self.is_shut_down = True
+        self._reader.close()
+        self._writer.close()
+
+
+def receive_all(bus, count, timeout=1.0):
+    msgs = []
+    while len(msgs) < count:
+        msg = bus.recv(timeout)
+        if msg is None:
+            break
+        msgs.append(msg)
+    return msgs
+
+
+class MultiBusTest(unittest.TestCase):
+    def test_selected_buses(self):
+        buses = [SocketBus(), SocketBus()]
+        bus = can.MultiBus(buses, channels=["a", "b"])
+        self.assertEqual(bus.helper_threads, 0)
+        buses[1].feed(can.Message(arbitration_id=2))
+        buses[0].feed(can.Message(arbitration_id=1))
+        buses[0].feed(can.Message(arbitration_id=3))
+        msgs = receive_all(bus, 3)
+        self.assertEqual(
+            sorted((msg.channel, msg.arbitration_id) for msg in msgs),
+            [("a", 1), ("a", 3), ("b", 2)],
+        )
+        self.assertIsNone(bus.recv(0))
+        self.assertIsInstance(bus.fileno(), int)
+        bus.shutdown()
+        self.assertTrue(all(inner.is_shut_down for inner in buses))
+
+    def test_helper_threads(self):
+        senders = [can.Bus(interface="virtual", channel=name) for name in "xy"]
+        receivers = [can.Bus(interface="virtual", channel=name) for name in "xy"]
+        bus = can.MultiBus(receivers + [SocketBus()])
+        self.assertEqual(bus.helper_threads, 2)
+        senders[0].send(can.Message(arbitration_id=1))
+        senders[1].send_batch([can.Message(arbitration_id=2)] * 2)
+        msgs = receive_all(bus, 3)
+        self.assertEqual(
+            sorted((msg.channel, msg.arbitration_id) for msg in msgs),
+            [(0, 1), (1, 2), (1, 2)],
+        )
+        bus.shutdown()
+        for sender in senders:
+            sender.shutdown()
+
+    def test_timeout(self):
+        bus = can.MultiBus([SocketBus(), can.Bus(interface="virtual")])
+        start = time.perf_counter()
+        self.assertIsNone(bus.recv(0.05))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+        self.assertEqual(bus.recv_batch(timeout=0), [])
+        bus.shutdown()
+
+    def test_ordered(self):
+        buses = [SocketBus(), SocketBus()]
+        bus = can.MultiBus(buses, ordered=True, reorder_window=0.05)
+        buses[0].feed(can.Message(timestamp=3.0))
+        buses[0].feed(can.Message(timestamp=4.0))
+        buses[1].feed(can.Message(timestamp=1.0))
+        buses[1].feed(can.Message(timestamp=2.0))
+        start = time.perf_counter()
+        msgs = receive_all(bus, 4)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+        self.assertEqual([msg.timestamp for msg in msgs], [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual([msg.channel for msg in msgs], [1, 1, 0, 0])
+        with self.assertRaises(NotImplementedError):
+            bus.fileno()
+        bus.shutdown()
+
+    def test_send(self):
+        buses = [SocketBus(), SocketBus()]
+        bus = can.MultiBus(buses, channels=["a", "b"])
+        bus.send(can.Message(channel="b"))
+        bus.send_batch([can.Message(channel="a"), can.Message(channel="b")])
+        self.assertEqual([len(inner.sent) for inner in buses], [1, 2])
+        with self.assertRaises(ValueError):
+            bus.send(can.Message(channel="c"))
+        bus.shutdown()
+
+    def test_channels(self):
+        with self.assertRaises(ValueError):
+            can.MultiBus([SocketBus()], channels=["a", "b"])
+        with self.assertRaises(ValueError):
+            can.MultiBus([SocketBus(), SocketBus()], channels=["a", "a"])
+
+    def test_filters(self):
+        buses = [SocketBus(), SocketBus()]
+        bus = can.MultiBus(
+            buses, can_filters=[{"can_id": 1, "can_mask": 0x7FF, "extended": False}]
+        )
+        buses[0].feed(can.Message(arbitration_id=2, is_extended_id=False))
+        buses[1].feed(can.Message(arbitration_id=1, is_extended_id=False))
+        self.assertEqual(bus.recv(1.0).arbitration_id, 1)
+        bus.shutdown()
+
+    def test_notifier(self):
+        buses = [SocketBus(), SocketBus()]
+        bus = can.MultiBus(buses)
+        reader = can.BufferedReader()
+        notifier = can.Notifier(bus, [reader], timeout=0.01)
+        for inner in buses:
+            inner.feed(can.Message())
+        channels = {reader.get_message(1.0).channel for _ in range(2)}
+        self.assertEqual(channels, {0, 1})
+        notifier.stop()
+        bus.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests :meth:`can.BusABC.recv_batch` and batched notification.
+"""
+
+import time
+import unittest
+
+import can
+from can.exomessage import ExoFrame
+
+from .config import IS_WINDOWS
+
+if not IS_WINDOWS:
+    from can.interfaces.exoserial.simulator import ExoSimulator
+
+
+class InternalBus(can.BusABC):
+    """Only implements :meth:`_recv_internal`."""
+
+    def __init__(self, msgs, **kwargs):
+        super().__init__(channel=None, **kwargs)
+        self.msgs = list(msgs)
+
+    def _recv_internal(self, timeout):
+        if self.msgs:
+            return self.msgs.pop(0), False
+        return None, False
+
+    def send(self, msg, timeout=None):
+        pass
+
+
+class LegacyBus(InternalBus):
+    """Overrides :meth:`recv` like old interfaces do."""
+
+    def recv(self, timeout=None):
+        return self.msgs.pop(0) if self.msgs else None
+
+
+def messages(count):
+    return [can.Message(arbitration_id=i, is_extended_id=False) for i in range(count)]
+
+
+class RecvBatchTest(unittest.TestCase):
+    def test_fallback(self):
+        for bus_class in (InternalBus, LegacyBus):
+            bus = bus_class(messages(10))
+            self.assertEqual(len(bus.recv_batch(4, 0)), 4)
+            self.assertEqual(
+                [msg.arbitration_id for msg in bus.recv_batch(timeout=0)],
+                list(range(4, 10)),
+            )
+            self.assertEqual(bus.recv_batch(timeout=0), [])
+
+    def test_fallback_filters(self):
+        bus = InternalBus(
+            messages(10), can_filters=[{"can_id": 1, "can_mask": 1, "extended": False}]
+        )
+        self.assertEqual(
+            [msg.arbitration_id for msg in bus.recv_batch(timeout=0)], [1, 3, 5, 7, 9]
+        )
+
+    def test_timeout(self):
+        bus = InternalBus([])
+        start = time.time()
+        self.assertEqual(bus.recv_batch(timeout=0.05), [])
+        self.assertGreaterEqual(time.time() - start, 0.04)
+
+
+class VirtualRecvBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.sender = can.Bus(interface="virtual", channel="batch")
+        self.bus = can.Bus(interface="virtual", channel="batch", rx_queue_size=100)
+
+    def tearDown(self):
+        self.sender.shutdown()
+        self.bus.shutdown()
+
+    def test_drain(self):
+        for msg in messages(30):
+            self.sender.send(msg)
+        batch = self.bus.recv_batch(20, 0.1)
+        self.assertEqual([msg.arbitration_id for msg in batch], list(range(20)))
+        batch = self.bus.recv_batch(20, 0.1)
+        self.assertEqual([msg.arbitration_id for msg in batch], list(range(20, 30)))
+        self.assertEqual(self.bus.recv_batch(20, 0.01), [])
+
+    def test_filters(self):
+        self.bus.set_filters([{"can_id": 0x10, "can_mask": 0x7F0}])
+        for msg in messages(40):
+            self.sender.send(msg)
+        batch = self.bus.recv_batch(timeout=0.1)
+        self.assertEqual([msg.arbitration_id for msg in batch], list(range(0x10, 0x20)))
+
+    def test_full_queue_is_released(self):
+        for msg in messages(100):
+            self.sender.send(msg)
+        self.assertEqual(len(self.bus.recv_batch(100, 0.1)), 100)
+        # there is room again
+        self.sender.send(can.Message(), timeout=0.1)
+
+    def test_thread_safe_bus(self):
+        bus = can.ThreadSafeBus(interface="virtual", channel="batch")
+        self.sender.send(can.Message(arbitration_id=5))
+        self.assertEqual(bus.recv_batch(timeout=0.1)[0].arbitration_id, 5)
+        bus.shutdown()
+
+
+class BatchCollector(can.Listener):
+    def __init__(self):
+        self.batches = []
+
+    def on_message_received(self, msg):
+        self.batches.append([msg])
+
+    def on_messages_received(self, msgs):
+        self.batches.append(list(msgs))
+
+
+class BatchNotifierTest(unittest.TestCase):
+    def test_batches(self):
+        sender = can.Bus(interface="virtual", channel="batch")
+        bus = can.Bus(interface="virtual", channel="batch")
+        for msg in messages(50):
+            sender.send(msg)
+        collector = BatchCollector()
+        received = []
+        notifier = can.Notifier(
+            bus, [collector, received.append], timeout=0.01, batch_size=16
+        )
+        deadline = time.time() + 2.0
+        while len(received) < 50 and time.time() < deadline:
+            time.sleep(0.01)
+        notifier.stop()
+        sender.shutdown()
+        bus.shutdown()
+        self.assertEqual([msg.arbitration_id for msg in received], list(range(50)))
+        self.assertEqual(
+            [msg for batch in collector.batches for msg in batch], received
+        )
+        self.assertTrue(all(len(batch) <= 16 for batch in collector.batches))
+        self.assertLess(len(collector.batches), 50)
+
+
+@unittest.skipIf(IS_WINDOWS, "the simulator needs a pty")
+class ExoRecvBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.sim = ExoSimulator()
+        self.bus = can.Bus(interface="exoserial", channel=self.sim.port)
+        # the receiver resets the input buffer when its thread starts
+        time.sleep(0.1)
+
+    def tearDown(self):
+        self.bus.shutdown()
+        self.sim.close()
+
+    def test_drain(self):
+        frames = [ExoFrame(i, i.to_bytes(8, "little")) for i in range(200)]
+        self.sim.burst(frames)
+        received = []
+        deadline = time.time() + 5.0
+        while len(received) < 200 and time.time() < deadline:
+            batch = self.bus.recv_batch(64, 0.5)
+            self.assertLessEqual(len(batch), 64)
+            received += batch
+        self.assertEqual([msg.arbitration_id for msg in received], list(range(200)))
+        self.assertEqual(bytes(received[-1].data), (199).to_bytes(8, "little"))
+
+
+if __name__ == "__main__":
+    unittest.main()
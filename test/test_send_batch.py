@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests :meth:`can.BusABC.send_batch` and its users.
+"""
+
+import errno
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import can
+from can.interfaces.socketcan.socketcan import (
+    SocketcanBus,
+    build_can_frame,
+    pack_can_frame_into,
+)
+
+
+def messages(count):
+    return [
+        can.Message(arbitration_id=i, is_extended_id=False, data=[i & 0xFF])
+        for i in range(count)
+    ]
+
+
+class SendingBus(can.BusABC):
+    """Only implements :meth:`send`, which fails after `limit` messages."""
+
+    def __init__(self, limit=None, **kwargs):
+        super().__init__(channel=None, **kwargs)
+        self.limit = limit
+        self.sent = []
+
+    def send(self, msg, timeout=None):
+        if self.limit is not None and len(self.sent) >= self.limit:
+            raise can.CanError("Transmit buffer full")
+        self.sent.append(msg)
+
+
+class SendBatchTest(unittest.TestCase):
+    def test_fallback(self):
+        bus = SendingBus()
+        msgs = messages(10)
+        bus.send_batch(msgs)
+        self.assertEqual(bus.sent, msgs)
+
+    def test_partial_failure(self):
+        bus = SendingBus(limit=4)
+        with self.assertRaises(can.BatchSendError) as context:
+            bus.send_batch(messages(10), timeout=0.1)
+        self.assertEqual(context.exception.sent, 4)
+        self.assertIsInstance(context.exception, can.CanError)
+
+    def test_redirect_reader(self):
+        bus = SendingBus()
+        msgs = messages(5)
+        can.RedirectReader(bus).on_messages_received(msgs)
+        self.assertEqual(bus.sent, msgs)
+
+
+class VirtualSendBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = can.Bus(interface="virtual", channel="batch")
+        self.receiver = can.Bus(interface="virtual", channel="batch", rx_queue_size=20)
+
+    def tearDown(self):
+        self.bus.shutdown()
+        self.receiver.shutdown()
+
+    def test_send_batch(self):
+        msgs = messages(10)
+        self.bus.send_batch(msgs)
+        received = self.receiver.recv_batch(timeout=0.1)
+        self.assertEqual([msg.arbitration_id for msg in received], list(range(10)))
+        self.assertEqual([bytes(msg.data) for msg in received][3], b"\x03")
+        self.assertTrue(all(msg.is_rx for msg in received))
+        self.assertTrue(all(msg.channel == "batch" for msg in received))
+        # the sent messages are copied
+        self.assertIsNot(received[0], msgs[0])
+        self.assertIsNot(received[0].data, msgs[0].data)
+
+    def test_full_queue(self):
+        with self.assertRaises(can.BatchSendError) as context:
+            self.bus.send_batch(messages(30), timeout=0.05)
+        self.assertEqual(context.exception.sent, 20)
+        self.assertEqual(len(self.receiver.recv_batch(timeout=0.1)), 20)
+
+    def test_waits_for_room(self):
+        self.bus.send_batch(messages(15))
+        notifier = can.Notifier(self.receiver, [], timeout=0.01)
+        self.bus.send_batch(messages(15), timeout=1.0)
+        notifier.stop()
+
+    def test_thread_safe_bus(self):
+        bus = can.ThreadSafeBus(interface="virtual", channel="batch")
+        bus.send_batch(messages(3))
+        self.assertEqual(len(self.receiver.recv_batch(timeout=0.1)), 3)
+        bus.shutdown()
+
+
+class SocketcanSendBatchTest(unittest.TestCase):
+    def test_pack_can_frame_into(self):
+        msgs = [
+            can.Message(arbitration_id=0x123, data=[1, 2, 3], is_extended_id=False),
+            can.Message(arbitration_id=0x1ABCDE, data=range(8)),
+            can.Message(arbitration_id=0x7, is_remote_frame=True, dlc=4),
+            can.Message(
+                arbitration_id=0x12, data=range(64), is_fd=True, bitrate_switch=True
+            ),
+            can.Message(arbitration_id=0x13, data=range(12), is_fd=True),
+        ]
+        buffer = bytearray(b"\xff" * 512)
+        offset = 0
+        for msg in msgs:
+            frame = build_can_frame(msg)
+            self.assertEqual(pack_can_frame_into(buffer, offset, msg), len(frame))
+            self.assertEqual(buffer[offset : offset + len(frame)], frame)
+            offset += len(frame)
+
+    def _bus(self, sock):
+        with patch(
+            "can.interfaces.socketcan.socketcan.create_socket", return_value=sock
+        ), patch("can.interfaces.socketcan.socketcan.bind_socket"):
+            return SocketcanBus(channel="vcan0")
+
+    def test_send_batch(self):
+        frames = []
+        sock = Mock()
+        sock.send.side_effect = lambda frame, flags: frames.append(bytes(frame))
+        bus = self._bus(sock)
+        msgs = messages(100)
+        bus.send_batch(msgs)
+        self.assertEqual(frames, [build_can_frame(msg) for msg in msgs])
+
+    def test_partial_failure(self):
+        def send(frame, flags):
+            if sock.send.call_count > 3:
+                raise OSError(errno.ENOBUFS, "No buffer space available")
+            return len(frame)
+
+        sock = Mock()
+        sock.send.side_effect = send
+        bus = self._bus(sock)
+        with patch("select.select", return_value=([], [], [])):
+            start = time.time()
+            with self.assertRaises(can.BatchSendError) as context:
+                bus.send_batch(messages(10), timeout=0.02)
+        self.assertGreaterEqual(time.time() - start, 0.02)
+        self.assertEqual(context.exception.sent, 3)
+
+    def test_error(self):
+        sock = Mock()
+        sock.send.side_effect = [16, OSError(errno.ENETDOWN, "Network is down")]
+        bus = self._bus(sock)
+        with self.assertRaises(can.BatchSendError) as context:
+            bus.send_batch(messages(10))
+        self.assertEqual(context.exception.sent, 1)
+
+
+class SerialSendBatchTest(unittest.TestCase):
+    def test_serial(self):
+        bus = can.Bus("loop://", bustype="serial")
+        msgs = messages(5)
+        bus.send_batch(msgs)
+        for msg in msgs:
+            self.assertEqual(bus.recv(0).arbitration_id, msg.arbitration_id)
+        bus.shutdown()
+
+    def test_slcan(self):
+        bus = can.Bus("loop://", bustype="slcan", sleep_after_open=0)
+        serial = bus.serialPortOrig
+        serial.read(serial.in_waiting)
+        bus.send_batch(messages(3))
+        self.assertEqual(serial.read(serial.in_waiting), b"t000100\rt001101\rt002102\r")
+        bus.shutdown()
+
+
+class MessageSyncBatchesTest(unittest.TestCase):
+    def test_batches(self):
+        msgs = [
+            can.Message(timestamp=10.0),
+            can.Message(timestamp=10.0),
+            can.Message(timestamp=10.05),
+            can.Message(timestamp=10.05),
+            can.Message(timestamp=10.05),
+            can.Message(timestamp=10.1),
+        ]
+        start = time.time()
+        batches = list(can.MessageSync(msgs, gap=0.0).batches())
+        self.assertGreaterEqual(time.time() - start, 0.09)
+        self.assertEqual([len(batch) for batch in batches], [2, 3, 1])
+        self.assertEqual([msg for batch in batches for msg in batch], msgs)
+
+    def test_max_messages(self):
+        msgs = [can.Message(timestamp=1.0) for _ in range(10)]
+        batches = can.MessageSync(msgs, gap=0.0).batches(max_messages=4)
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+
+    def test_without_timestamps(self):
+        msgs = [can.Message(timestamp=1.0) for _ in range(3)]
+        batches = can.MessageSync(msgs, timestamps=False, gap=0.0).batches()
+        self.assertEqual([len(batch) for batch in batches], [1, 1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
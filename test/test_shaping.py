@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+This module tests :mod:`can.shaping`.
+"""
+
+import time
+import unittest
+
+import can
+from can.shaping import frame_bits
+
+
+def messages(count, arbitration_id=0x10):
+    return [can.Message(arbitration_id=arbitration_id) for _ in range(count)]
+
+
+class RecordingBus(can.BusABC):
+    def __init__(self, **kwargs):
+        super().__init__(channel=None, **kwargs)
+        self.sent = []
+        self.batches = 0
+
+    def send(self, msg, timeout=None):
+        self.sent.append(msg)
+
+    def send_batch(self, msgs, timeout=None):
+        self.batches += 1
+        super().send_batch(msgs, timeout)
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_frame_bits(self):
+        data = range(8)
+        self.assertEqual(frame_bits(can.Message(is_extended_id=False, data=data)), 135)
+        self.assertEqual(frame_bits(can.Message(is_extended_id=True, data=data)), 160)
+        self.assertEqual(
+            frame_bits(can.Message(is_extended_id=False, is_remote_frame=True, dlc=8)),
+            55,
+        )
+
+    def test_delay(self):
+        bucket = can.TokenBucket(10, burst=2)
+        now = time.perf_counter()
+        for _ in range(2):
+            self.assertEqual(bucket.delay(1, now), 0.0)
+            bucket.take(1)
+        self.assertAlmostEqual(bucket.delay(1, now), 0.1, places=3)
+        self.assertEqual(bucket.delay(1, now + 0.1), 0.0)
+        # the bucket does not fill up beyond the burst
+        self.assertAlmostEqual(bucket.delay(3, now + 10), 0.1, places=3)
+
+    def test_bus_load(self):
+        bucket = can.TokenBucket.from_bus_load(50, bitrate=500000)
+        self.assertEqual(bucket.rate, 250000)
+        self.assertEqual(bucket.cost(can.Message(data=range(8))), 160)
+        with self.assertRaises(ValueError):
+            can.TokenBucket.from_bus_load(0, bitrate=500000)
+        with self.assertRaises(ValueError):
+            can.TokenBucket(0)
+
+
+class TransmitShaperTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = RecordingBus()
+
+    def test_block(self):
+        shaper = can.TransmitShaper(self.bus, can.TokenBucket(100, burst=1))
+        start = time.perf_counter()
+        for msg in messages(5):
+            self.assertTrue(shaper.send(msg))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.039)
+        self.assertEqual(len(self.bus.sent), 5)
+        stats = shaper.stats[None]
+        self.assertEqual((stats.count, stats.delayed, stats.dropped), (5, 4, 0))
+        self.assertGreater(stats.max, 0.0)
+
+    def test_block_timeout(self):
+        shaper = can.TransmitShaper(self.bus, can.TokenBucket(1, burst=1))
+        shaper.send(can.Message())
+        with self.assertRaises(can.CanError):
+            shaper.send(can.Message(), timeout=0.01)
+        self.assertEqual(len(self.bus.sent), 1)
+
+    def test_drop(self):
+        shaper = can.TransmitShaper(self.bus, can.TokenBucket(1, burst=2), mode="drop")
+        self.assertEqual(
+            [shaper.send(msg) for msg in messages(5)], [True, True, False, False, False]
+        )
+        self.assertEqual(shaper.stats[None].dropped, 3)
+
+    def test_id_limits(self):
+        shaper = can.TransmitShaper(
+            self.bus, id_limits={1: can.TokenBucket(1, burst=1)}, mode="drop"
+        )
+        for msg in messages(2, 1) + messages(3, 2):
+            shaper.send(msg)
+        self.assertEqual([msg.arbitration_id for msg in self.bus.sent], [1, 2, 2, 2])
+        self.assertEqual(shaper.stats[1].dropped, 1)
+        self.assertEqual(shaper.stats[None].count, 4)
+        self.assertNotIn(2, shaper.stats)
+
+    def test_queue(self):
+        shaper = can.TransmitShaper(
+            self.bus, id_limits={1: can.TokenBucket(20, burst=1)}, mode="queue"
+        )
+        shaper.send_batch(messages(3, 1))
+        shaper.send(messages(1, 2)[0])
+        shaper.stop(timeout=5.0)
+        # the frame of the other id does not wait behind the limited ones
+        self.assertEqual([msg.arbitration_id for msg in self.bus.sent], [1, 2, 1, 1])
+        self.assertEqual(len(shaper), 0)
+        self.assertEqual(shaper.stats[1].count, 3)
+        self.assertGreater(shaper.stats[1].max, 0.05)
+        with self.assertRaises(can.CanError):
+            shaper.send(can.Message())
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            can.TransmitShaper(self.bus, mode="burst")
+
+
+class ShapedBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = RecordingBus()
+
+    def test_send_batch(self):
+        shaper = can.TransmitShaper(self.bus, can.TokenBucket(1000, burst=5))
+        self.assertEqual(shaper.send_batch(messages(10)), 10)
+        self.assertEqual(len(self.bus.sent), 10)
+        # the first five go out together, then every frame waits
+        self.assertGreater(self.bus.batches, 1)
+        self.assertLess(self.bus.batches, 10)
+
+    def test_timeout(self):
+        shaper = can.TransmitShaper(self.bus, can.TokenBucket(1, burst=3))
+        with self.assertRaises(can.BatchSendError) as context:
+            shaper.send_batch(messages(5), timeout=0.01)
+        self.assertEqual(context.exception.sent, 3)
+        self.assertEqual(len(self.bus.sent), 3)
+
+    def test_redirect_reader(self):
+        shaper = can.TransmitShaper(self.bus, can.TokenBucket(1, burst=2), mode="drop")
+        reader = can.RedirectReader(shaper)
+        reader.on_messages_received(messages(3))
+        reader.on_message_received(can.Message())
+        self.assertEqual(len(self.bus.sent), 2)
+
+    def test_send_periodic(self):
+        shaper = can.TransmitShaper(self.bus, can.TokenBucket(10, burst=1), mode="drop")
+        task = shaper.send_periodic(can.Message(arbitration_id=0x7), 0.01)
+        time.sleep(0.2)
+        task.stop()
+        self.assertGreater(shaper.stats[None].dropped, 0)
+        self.assertLessEqual(len(self.bus.sent), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()